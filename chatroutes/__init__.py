@@ -1,4 +1,27 @@
 from .client import ChatRoutes
+from .async_client import AsyncChatRoutes
+from .pool import ConnectionPool
+from .rate_limit import RateLimiter
+from .retry import RetryPolicy, RetryBudget
+from .deadline import Deadline, deadline
+from .codec import JSONCodec, StdlibJSONCodec, OrjsonCodec
+from .circuit_breaker import CircuitBreaker, CircuitBreakerRegistry
+from .hedging import HedgingPolicy
+from .sse import SSEParser, ServerSentEvent
+from .metrics import StreamStats, get_metrics_hook, set_metrics_hook
+from .streaming import MessageStream
+from .fanout import StreamFanOut, first_complete
+from .buffering import BufferedStream, ChunkBuffer
+from .pagination import PageIterator, ParallelPageIterator
+from .archive import ConversationExporter, ConversationImporter, read_records
+from .batch import BatchResult
+from .transport import (
+    Transport,
+    TransportResponse,
+    TransportError,
+    RequestsTransport,
+    HTTP2Transport
+)
 from .exceptions import (
     ChatRoutesError,
     AuthenticationError,
@@ -6,7 +29,10 @@ from .exceptions import (
     ValidationError,
     NotFoundError,
     ServerError,
-    NetworkError
+    NetworkError,
+    DeadlineExceededError,
+    CircuitOpenError,
+    StreamStalledError
 )
 from .types import (
     Conversation,
@@ -25,6 +51,8 @@ from .types import (
     ListConversationsParams,
     PaginatedResponse,
     StreamChunk,
+    StreamToResult,
+    BranchFanOutResult,
     BranchPoint,
     BranchSuggestion,
     SuggestionMetadata,
@@ -37,6 +65,40 @@ __version__ = '0.2.6'
 
 __all__ = [
     'ChatRoutes',
+    'AsyncChatRoutes',
+    'ConnectionPool',
+    'RateLimiter',
+    'RetryPolicy',
+    'RetryBudget',
+    'Deadline',
+    'deadline',
+    'JSONCodec',
+    'StdlibJSONCodec',
+    'OrjsonCodec',
+    'CircuitBreaker',
+    'CircuitBreakerRegistry',
+    'HedgingPolicy',
+    'MessageStream',
+    'StreamFanOut',
+    'BufferedStream',
+    'ChunkBuffer',
+    'PageIterator',
+    'ParallelPageIterator',
+    'ConversationExporter',
+    'ConversationImporter',
+    'read_records',
+    'BatchResult',
+    'first_complete',
+    'StreamStats',
+    'set_metrics_hook',
+    'get_metrics_hook',
+    'SSEParser',
+    'ServerSentEvent',
+    'Transport',
+    'TransportResponse',
+    'TransportError',
+    'RequestsTransport',
+    'HTTP2Transport',
     'ChatRoutesError',
     'AuthenticationError',
     'RateLimitError',
@@ -44,6 +106,9 @@ __all__ = [
     'NotFoundError',
     'ServerError',
     'NetworkError',
+    'DeadlineExceededError',
+    'CircuitOpenError',
+    'StreamStalledError',
     'Conversation',
     'Message',
     'Branch',
@@ -60,6 +125,8 @@ __all__ = [
     'ListConversationsParams',
     'PaginatedResponse',
     'StreamChunk',
+    'StreamToResult',
+    'BranchFanOutResult',
     'BranchPoint',
     'BranchSuggestion',
     'SuggestionMetadata',
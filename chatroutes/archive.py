@@ -0,0 +1,490 @@
+import contextvars
+import gzip
+import json
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import ExitStack
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    Union
+)
+from .exceptions import NotFoundError
+from .types import (
+    Branch,
+    Conversation,
+    CreateBranchRequest,
+    ForkConversationRequest,
+    Message,
+    SendMessageRequest
+)
+
+if TYPE_CHECKING:
+    from .client import ChatRoutes
+
+Record = Dict[str, Any]
+
+CONVERSATION = 'conversation'
+BRANCH = 'branch'
+MESSAGE = 'message'
+CHECKPOINT = 'checkpoint'
+
+
+def read_cursor(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            cursor: Dict[str, Any] = json.load(f)
+    except FileNotFoundError:
+        return None
+    return cursor
+
+
+def write_cursor(path: str, cursor: Dict[str, Any]) -> None:
+    """Replace the cursor file atomically, so a crash never leaves it half written."""
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(cursor, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def read_records(path: str) -> Iterator[Record]:
+    """Yield the records of an export file, compressed (``.gz``) or not."""
+    opener: Callable[..., IO] = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+class ConversationExporter:
+    """Streams every conversation of an account to a JSONL file.
+
+    Each line is one record with a ``type`` of ``conversation``, ``branch``,
+    ``message`` or ``checkpoint``; a conversation's record comes first, followed by
+    each branch with its messages in order, then its checkpoints. Up to
+    ``concurrency`` conversations are fetched at once (their branches, messages and
+    checkpoints in parallel) over the client's pool, and only those are held in
+    memory; records are written in listing order.
+
+    Output ending in ``.gz`` (or ``compress=True``) is gzipped, one gzip member per
+    conversation. With ``cursor_path`` the position after each fully written
+    conversation is saved there; running the export again with the same cursor
+    truncates anything written after it and continues with the next conversation.
+    """
+
+    def __init__(
+        self,
+        client: 'ChatRoutes',
+        concurrency: int = 4,
+        page_size: int = 50,
+        filter: Optional[Literal['all', 'owned', 'shared']] = None,
+        include_checkpoints: bool = True
+    ):
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        self._client = client
+        self.concurrency = concurrency
+        self.page_size = page_size
+        self.filter = filter
+        self.include_checkpoints = include_checkpoints
+
+    def export(
+        self,
+        path: str,
+        cursor_path: Optional[str] = None,
+        compress: Optional[bool] = None
+    ) -> Dict[str, Any]:
+        if compress is None:
+            compress = path.endswith('.gz')
+
+        cursor = read_cursor(cursor_path) if cursor_path is not None else None
+        summary: Dict[str, Any] = {'conversations': 0, 'records': 0, 'resumedAfter': None}
+        if cursor is not None:
+            summary['resumedAfter'] = cursor['conversationId']
+
+        if cursor is not None and not os.path.exists(path):
+            raise ValueError(f"Export cursor {cursor_path} exists but {path} does not")
+
+        with open(path, 'r+b' if cursor is not None else 'wb') as f, ThreadPoolExecutor(
+            max_workers=self.concurrency * 2,
+            thread_name_prefix='chatroutes-export'
+        ) as executor:
+            if cursor is not None:
+                f.truncate(cursor['offset'])
+                f.seek(cursor['offset'])
+
+            for conversation, records in self._fetch_in_order(executor, cursor):
+                self._write(f, records, compress)
+                summary['conversations'] += 1
+                summary['records'] += len(records)
+
+                if cursor_path is not None:
+                    done_before = (cursor or {}).get('conversations', 0)
+                    write_cursor(cursor_path, {
+                        'conversationId': conversation['id'],
+                        'offset': f.tell(),
+                        'conversations': done_before + summary['conversations']
+                    })
+
+        return summary
+
+    def _conversations(self, cursor: Optional[Dict[str, Any]]) -> Iterator[Conversation]:
+        conversations = self._client.conversations.iter_all(self.filter, self.page_size)
+        if cursor is None:
+            yield from conversations
+            return
+
+        for conversation in conversations:
+            if conversation['id'] == cursor['conversationId']:
+                break
+        else:
+            raise ValueError(
+                f"Export cursor points at conversation {cursor['conversationId']}, "
+                "which is no longer listed"
+            )
+        yield from conversations
+
+    def _fetch_in_order(
+        self,
+        executor: ThreadPoolExecutor,
+        cursor: Optional[Dict[str, Any]]
+    ) -> Iterator[Tuple[Conversation, List[Record]]]:
+        pending: Deque[Tuple[Conversation, Future]] = deque()
+        conversations = self._conversations(cursor)
+
+        def submit(fn: Callable[..., Any], *args: Any) -> Future:
+            return executor.submit(contextvars.copy_context().run, fn, *args)
+
+        try:
+            for conversation in conversations:
+                pending.append((conversation, self._fetch(submit, conversation)))
+                if len(pending) >= self.concurrency:
+                    conversation, future = pending.popleft()
+                    yield conversation, future.result()
+            while pending:
+                conversation, future = pending.popleft()
+                yield conversation, future.result()
+        finally:
+            for _, future in pending:
+                future.cancel()
+            close = getattr(conversations, 'close', None)
+            if close is not None:
+                close()
+
+    def _fetch(self, submit: Callable[..., Future], conversation: Conversation) -> Future:
+        """Start fetching one conversation's sub-resources; resolves to its records."""
+        conversation_id = conversation['id']
+        branches = submit(self._client.branches.list, conversation_id)
+        checkpoints = None
+        if self.include_checkpoints:
+            checkpoints = submit(self._client.checkpoints.list, conversation_id)
+        result: Future = Future()
+
+        def collect_messages(done: Future) -> None:
+            try:
+                branch_list = done.result()
+                if branch_list:
+                    messages = [
+                        submit(self._client.branches.get_messages, conversation_id, branch['id'])
+                        for branch in branch_list
+                    ]
+                else:
+                    messages = [submit(self._client.messages.list, conversation_id)]
+
+                records: List[Record] = [{'type': CONVERSATION, 'conversation': conversation}]
+                for index, future in enumerate(messages):
+                    branch_id = branch_list[index]['id'] if branch_list else None
+                    if branch_list:
+                        records.append({
+                            'type': BRANCH,
+                            'conversationId': conversation_id,
+                            'branch': branch_list[index]
+                        })
+                    for message in future.result():
+                        records.append({
+                            'type': MESSAGE,
+                            'conversationId': conversation_id,
+                            'branchId': branch_id or message.get('branchId'),
+                            'message': message
+                        })
+                for checkpoint in checkpoints.result() if checkpoints is not None else []:
+                    records.append({
+                        'type': CHECKPOINT,
+                        'conversationId': conversation_id,
+                        'checkpoint': checkpoint
+                    })
+                result.set_result(records)
+            except BaseException as e:
+                result.set_exception(e)
+
+        branches.add_done_callback(lambda done: submit(collect_messages, done))
+        return result
+
+    def _write(self, f: IO[bytes], records: List[Record], compress: bool) -> None:
+        dumps = self._client._http.codec.dumps
+        out: Union[gzip.GzipFile, IO[bytes]] = gzip.GzipFile(fileobj=f, mode='wb', mtime=0) if compress else f
+        try:
+            for record in records:
+                out.write(dumps(record) + b'\n')
+        finally:
+            if compress:
+                out.close()
+        f.flush()
+
+
+def group_conversations(records: Iterator[Record]) -> Iterator[List[Record]]:
+    """Group the records of an export by conversation, one conversation at a time."""
+    group: List[Record] = []
+    for record in records:
+        if record['type'] == CONVERSATION and group:
+            yield group
+            group = []
+        group.append(record)
+    if group:
+        yield group
+
+
+def read_journal(path: str) -> Tuple[Dict[str, str], Dict[str, Dict[str, str]]]:
+    """Return the started conversations (old id to new id) and the id maps of finished ones.
+
+    Lines that do not parse, such as one torn by a crash mid-write, are skipped.
+    """
+    started: Dict[str, str] = {}
+    finished: Dict[str, Dict[str, str]] = {}
+    if not os.path.exists(path):
+        return started, finished
+
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if 'ids' in entry:
+                finished[entry['conversationId']] = entry['ids']
+            else:
+                started[entry['conversationId']] = entry['newConversationId']
+    return started, finished
+
+
+def open_journal(path: str) -> IO[str]:
+    """Open a journal for appending, first ending a torn last line so new entries parse."""
+    torn = False
+    if os.path.exists(path) and os.path.getsize(path) > 0:
+        with open(path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            torn = f.read(1) != b'\n'
+
+    journal = open(path, 'a', encoding='utf-8')
+    if torn:
+        journal.write('\n')
+    return journal
+
+
+class ConversationImporter:
+    """Replays an export file into the account, creating new conversations.
+
+    Up to ``concurrency`` conversations are replayed at once; within one conversation
+    the main branch is replayed first, then each fork once its fork point exists, with
+    user messages sent in their original order (assistant replies are regenerated).
+    Old conversation, branch and message ids are mapped to the new ones in ``ids``.
+
+    With ``journal_path`` each conversation is logged when started and when finished.
+    Importing again with the same journal skips finished conversations and deletes
+    and replays any that were interrupted halfway.
+    """
+
+    def __init__(self, client: 'ChatRoutes', concurrency: int = 4):
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        self._client = client
+        self.concurrency = concurrency
+        self._journal: Optional[IO[str]] = None
+        self._lock = threading.Lock()
+
+    def import_file(self, path: str, journal_path: Optional[str] = None) -> Dict[str, Any]:
+        started, finished = read_journal(journal_path) if journal_path is not None else ({}, {})
+        summary: Dict[str, Any] = {'conversations': 0, 'skipped': 0, 'failed': {}, 'ids': {}}
+        for ids in finished.values():
+            summary['ids'].update(ids)
+
+        pending: Deque[Tuple[str, Future]] = deque()
+
+        def settle(old_id: str, future: Future) -> None:
+            try:
+                summary['ids'].update(future.result())
+                summary['conversations'] += 1
+            except Exception as e:
+                summary['failed'][old_id] = e
+
+        with ExitStack() as stack:
+            if journal_path is not None:
+                self._journal = stack.enter_context(open_journal(journal_path))
+            executor = stack.enter_context(ThreadPoolExecutor(
+                max_workers=self.concurrency,
+                thread_name_prefix='chatroutes-import'
+            ))
+
+            for group in group_conversations(read_records(path)):
+                old_id = group[0]['conversation']['id']
+                if old_id in finished:
+                    summary['skipped'] += 1
+                    continue
+
+                context = contextvars.copy_context()
+                replay = executor.submit(context.run, self._replay, group, started.get(old_id))
+                pending.append((old_id, replay))
+                if len(pending) >= self.concurrency * 2:
+                    settle(*pending.popleft())
+
+            while pending:
+                settle(*pending.popleft())
+
+        self._journal = None
+        return summary
+
+    def _log(self, entry: Dict[str, Any]) -> None:
+        if self._journal is None:
+            return
+        with self._lock:
+            self._journal.write(json.dumps(entry) + '\n')
+            self._journal.flush()
+
+    def _replay(self, group: List[Record], interrupted_id: Optional[str]) -> Dict[str, str]:
+        client = self._client
+        conversation = group[0]['conversation']
+        if interrupted_id is not None:
+            try:
+                client.conversations.delete(interrupted_id)
+            except NotFoundError:
+                pass
+
+        new_conversation = client.conversations.create({'title': conversation.get('title', '')})
+        new_id = new_conversation['id']
+        self._log({'conversationId': conversation['id'], 'newConversationId': new_id})
+        ids = {conversation['id']: new_id}
+
+        branches: List[Branch] = []
+        messages: Dict[Optional[str], List[Message]] = {}
+        for record in group[1:]:
+            if record['type'] == BRANCH:
+                branches.append(record['branch'])
+            elif record['type'] == MESSAGE:
+                messages.setdefault(record['branchId'], []).append(record['message'])
+
+        main = next(
+            (branch for branch in branches if branch.get('isMain')),
+            branches[0] if branches else None
+        )
+        new_branches = client.branches.list(new_id)
+        new_main = next((branch for branch in new_branches if branch.get('isMain')), None)
+        new_main_id = new_main['id'] if new_main else None
+
+        if main is None:
+            everything = [
+                message for branch_messages in messages.values() for message in branch_messages
+            ]
+            self._replay_messages(new_id, None, everything, ids)
+        else:
+            if new_main_id is not None:
+                ids[main['id']] = new_main_id
+            self._replay_messages(new_id, new_main_id, messages.get(main['id'], []), ids)
+
+        forks = [branch for branch in branches if branch is not main]
+        while forks:
+            ready = next(
+                (
+                    branch for branch in forks
+                    if not branch.get('forkPointMessageId') or branch['forkPointMessageId'] in ids
+                ),
+                None
+            )
+            if ready is None:
+                raise ValueError(
+                    f"Cannot replay branch {forks[0]['id']}: fork point "
+                    f"{forks[0].get('forkPointMessageId')} was not imported"
+                )
+            forks.remove(ready)
+
+            title = ready.get('title', '')
+            context_mode = ready.get('contextMode')
+            fork_point = ready.get('forkPointMessageId')
+            if fork_point:
+                fork: ForkConversationRequest = {
+                    'title': title,
+                    'forkPointMessageId': ids[fork_point]
+                }
+                if context_mode:
+                    fork['contextMode'] = context_mode
+                new_branch = client.branches.fork(new_id, fork)
+            else:
+                create: CreateBranchRequest = {'title': title}
+                if context_mode:
+                    create['contextMode'] = context_mode
+                new_branch = client.branches.create(new_id, create)
+            ids[ready['id']] = new_branch['id']
+            self._replay_messages(new_id, new_branch['id'], messages.get(ready['id'], []), ids)
+
+        self._log({'conversationId': conversation['id'], 'ids': ids})
+        return ids
+
+    def _replay_messages(
+        self,
+        conversation_id: str,
+        branch_id: Optional[str],
+        messages: List[Message],
+        ids: Dict[str, str]
+    ) -> None:
+        """Send the branch's user messages in order, then map old message ids to new ones.
+
+        Messages already mapped (inherited from the parent of a fork) are skipped. The
+        send response only carries the assistant reply, so ids are matched afterwards
+        against the branch's new messages, in order and by role.
+        """
+        replayed = [message for message in messages if message['id'] not in ids]
+        sent = False
+        for index, message in enumerate(replayed):
+            if message.get('role') != 'user':
+                continue
+            data: SendMessageRequest = {'content': message.get('content', '')}
+            if branch_id is not None:
+                data['branchId'] = branch_id
+            reply = replayed[index + 1] if index + 1 < len(replayed) else None
+            model = ((reply or {}).get('metadata') or {}).get('model')
+            if model:
+                data['model'] = model
+            self._client.messages.send(conversation_id, data)
+            sent = True
+
+        if not sent:
+            return
+
+        if branch_id is not None:
+            current = self._client.branches.get_messages(conversation_id, branch_id)
+        else:
+            current = self._client.messages.list(conversation_id)
+        known = set(ids.values())
+        created = iter([message for message in current if message['id'] not in known])
+        for old in replayed:
+            if old.get('role') == 'system':
+                continue
+            new = next(created, None)
+            if new is None:
+                break
+            if new.get('role', old.get('role')) == old.get('role'):
+                ids[old['id']] = new['id']
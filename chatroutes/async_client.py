@@ -0,0 +1,85 @@
+from types import TracebackType
+from typing import ContextManager, Optional, Type, Union
+from .async_http_client import AsyncHttpClient
+from .retry import RetryPolicy
+from .deadline import Deadline, deadline
+from .codec import JSONCodec
+from .streaming import ParseErrorHook
+from .resources import (
+    AsyncConversationsResource,
+    AsyncMessagesResource,
+    AsyncBranchesResource,
+    AsyncCheckpointsResource,
+    AsyncAutoBranchResource
+)
+
+
+class AsyncChatRoutes:
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = "https://api.chatroutes.com/api/v1",
+        timeout: int = 30,
+        retry_attempts: int = 3,
+        retry_delay: float = 1.0,
+        autobranch_base_url: Optional[str] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        total_timeout: Optional[float] = None,
+        json_codec: Union[str, JSONCodec, None] = None,
+        compress_requests: bool = False,
+        compression_threshold: int = 1024,
+        accept_compressed: bool = True,
+        on_parse_error: Optional[ParseErrorHook] = None
+    ):
+        self._http = AsyncHttpClient(
+            api_key=api_key,
+            base_url=base_url,
+            timeout=timeout,
+            retry_attempts=retry_attempts,
+            retry_delay=retry_delay,
+            retry_policy=retry_policy,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+            total_timeout=total_timeout,
+            json_codec=json_codec,
+            compress_requests=compress_requests,
+            compression_threshold=compression_threshold,
+            accept_compressed=accept_compressed,
+            on_parse_error=on_parse_error
+        )
+
+        self.conversations = AsyncConversationsResource(self)
+        self.messages = AsyncMessagesResource(self)
+        self.branches = AsyncBranchesResource(self)
+        self.checkpoints = AsyncCheckpointsResource(self)
+        self.autobranch = AsyncAutoBranchResource(self, autobranch_base_url)
+
+    @property
+    def api_key(self) -> str:
+        return self._http.api_key
+
+    @property
+    def base_url(self) -> str:
+        return self._http.base_url
+
+    def deadline(self, seconds: float) -> ContextManager[Deadline]:
+        return deadline(seconds)
+
+    def _get_headers(self) -> dict:
+        return self._http.headers.copy()
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+    async def __aenter__(self) -> 'AsyncChatRoutes':
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType]
+    ) -> None:
+        await self.aclose()
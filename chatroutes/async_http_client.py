@@ -0,0 +1,214 @@
+import asyncio
+import inspect
+import time
+from typing import Any, Callable, Dict, Mapping, Optional, Union
+from .http_client import BaseHttpClient
+from .exceptions import ChatRoutesError, NetworkError
+from .retry import RetryPolicy
+from .deadline import Deadline, resolve_deadline
+from .codec import JSONCodec
+from .sse import SSEParser
+from .streaming import DONE, ParseErrorHook, decode_event
+from .types import StreamChunk
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - exercised only without the extra installed
+    httpx = None  # type: ignore[assignment]
+
+
+class AsyncHttpClient(BaseHttpClient):
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = "https://api.chatroutes.com/api/v1",
+        timeout: int = 30,
+        retry_attempts: int = 3,
+        retry_delay: float = 1.0,
+        client: Optional['httpx.AsyncClient'] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        total_timeout: Optional[float] = None,
+        json_codec: Union[str, JSONCodec, None] = None,
+        compress_requests: bool = False,
+        compression_threshold: int = 1024,
+        accept_compressed: bool = True,
+        on_parse_error: Optional[ParseErrorHook] = None
+    ):
+        if httpx is None:
+            raise ImportError(
+                "AsyncChatRoutes requires httpx. Install it with: pip install chatroutes[async]"
+            )
+
+        super().__init__(
+            api_key=api_key,
+            base_url=base_url,
+            timeout=timeout,
+            retry_attempts=retry_attempts,
+            retry_delay=retry_delay,
+            retry_policy=retry_policy,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+            total_timeout=total_timeout,
+            json_codec=json_codec,
+            compress_requests=compress_requests,
+            compression_threshold=compression_threshold,
+            accept_compressed=accept_compressed,
+            on_parse_error=on_parse_error
+        )
+        self._owns_client = client is None
+        self.client = client or httpx.AsyncClient(timeout=timeout)
+        self.headers = self._default_headers()
+
+    async def aclose(self) -> None:
+        if self._owns_client:
+            await self.client.aclose()
+
+    def _httpx_timeout(self, call_deadline: Optional[Deadline]) -> 'httpx.Timeout':
+        connect, read = self._attempt_timeout(call_deadline)
+        return httpx.Timeout(read, connect=connect)
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        data: Optional[Mapping[str, Any]] = None,
+        params: Optional[Mapping[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        skip_auth: bool = False
+    ) -> Dict[str, Any]:
+        url = f"{self.base_url}{path}"
+        request_headers = self.headers.copy()
+
+        if headers:
+            request_headers.update(headers)
+
+        if skip_auth:
+            request_headers.pop('Authorization', None)
+
+        content = self._encode_body(data or None, request_headers)
+        has_idempotency_key = self._apply_idempotency_key(method, request_headers)
+        call_deadline = resolve_deadline(self.total_timeout)
+        policy = self.retry_policy
+        policy.budget.record_request()
+        attempt = 0
+        last_error: Optional[ChatRoutesError] = None
+
+        while True:
+            if call_deadline is not None and call_deadline.expired:
+                raise self._deadline_error(call_deadline, last_error)
+
+            started = time.monotonic()
+
+            try:
+                response = await self.client.request(
+                    method,
+                    url,
+                    content=content,
+                    params=params,
+                    headers=request_headers,
+                    timeout=self._httpx_timeout(call_deadline)
+                )
+            except httpx.HTTPError as e:
+                last_error = NetworkError(f"Request failed: {str(e)}", {'error': str(e)})
+                if call_deadline is not None and call_deadline.expired:
+                    raise self._deadline_error(call_deadline, last_error)
+
+                delay = policy.backoff(attempt)
+                if (
+                    self._retry_fits(call_deadline, delay, time.monotonic() - started)
+                    and policy.should_retry(method, attempt, has_idempotency_key)
+                ):
+                    await asyncio.sleep(delay)
+                    attempt += 1
+                    continue
+
+                raise last_error
+
+            response_data = self._decode_body(response.content)
+
+            if response.is_success:
+                return response_data
+
+            last_error = self._handle_error_response(response.status_code, response_data)
+
+            delay = policy.backoff(attempt)
+            if (
+                self._retry_fits(call_deadline, delay, time.monotonic() - started)
+                and policy.should_retry(method, attempt, has_idempotency_key, response.status_code)
+            ):
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+
+            raise last_error
+
+    async def get(self, path: str, params: Optional[Mapping[str, Any]] = None) -> Dict[str, Any]:
+        return await self.request('GET', path, params=params)
+
+    async def post(
+        self,
+        path: str,
+        data: Optional[Mapping[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        skip_auth: bool = False
+    ) -> Dict[str, Any]:
+        return await self.request('POST', path, data=data, headers=headers, skip_auth=skip_auth)
+
+    async def patch(self, path: str, data: Optional[Mapping[str, Any]] = None) -> Dict[str, Any]:
+        return await self.request('PATCH', path, data=data)
+
+    async def delete(self, path: str) -> Dict[str, Any]:
+        return await self.request('DELETE', path)
+
+    async def stream(
+        self,
+        path: str,
+        data: Mapping[str, Any],
+        on_chunk: Callable[[StreamChunk], Any]
+    ) -> Optional[Dict[str, Any]]:
+        url = f"{self.base_url}{path}"
+        headers = self.headers.copy()
+        headers['Accept'] = 'text/event-stream'
+
+        try:
+            async with self.client.stream(
+                'POST',
+                url,
+                content=self._encode_body(data, headers),
+                headers=headers,
+                timeout=self._httpx_timeout(resolve_deadline(self.total_timeout))
+            ) as response:
+                if not response.is_success:
+                    raise self._handle_error_response(
+                        response.status_code,
+                        self._decode_body(await response.aread())
+                    )
+
+                complete_message = None
+                parser = SSEParser()
+
+                async for raw in response.aiter_bytes():
+                    for event in parser.feed(raw):
+                        if event.data == DONE:
+                            return complete_message
+
+                        try:
+                            chunk_data = decode_event(event, self.codec)
+                        except ValueError as e:
+                            if self.on_parse_error is not None:
+                                self.on_parse_error(e, event)
+                            continue
+
+                        if chunk_data.get('type') == 'complete':
+                            complete_message = chunk_data.get('message')
+
+                        result = on_chunk(chunk_data)
+                        if inspect.isawaitable(result):
+                            await result
+
+                return complete_message
+
+        except httpx.HTTPError as e:
+            raise NetworkError(f"Stream request failed: {str(e)}", {'error': str(e)})
@@ -0,0 +1,109 @@
+import contextvars
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set
+from .exceptions import NotFoundError
+from .pagination import ProgressCallback
+
+
+class BatchResult:
+    """Outcome of one item of a batch: ``value`` when it succeeded, ``error`` when it raised."""
+
+    __slots__ = ('index', 'item', 'value', 'error')
+
+    def __init__(self, index: int, item: Any, value: Any = None, error: Optional[Exception] = None):
+        self.index = index
+        self.item = item
+        self.value = value
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def result(self) -> Any:
+        """Return ``value``, or raise the item's exception."""
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+    def __repr__(self) -> str:
+        outcome = f'error={self.error!r}' if self.error is not None else f'value={self.value!r}'
+        return f'BatchResult(index={self.index}, {outcome})'
+
+
+def run_batch(
+    fn: Callable[[Any], Any],
+    items: Iterable[Any],
+    concurrency: int = 4
+) -> Iterator[BatchResult]:
+    """Call ``fn`` on every item with up to ``concurrency`` threads, yielding results as they complete.
+
+    Items are consumed lazily, at most ``2 * concurrency`` ahead of the results, so
+    ``items`` may be a generator over a large source. An exception raised by ``fn`` is
+    captured in that item's ``BatchResult`` and never stops the batch. Each call runs
+    in a copy of the caller's context, so an active ``deadline()`` applies to it.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
+    def call(index: int, item: Any) -> BatchResult:
+        try:
+            return BatchResult(index, item, fn(item))
+        except Exception as e:
+            return BatchResult(index, item, error=e)
+
+    pending: Set[Future] = set()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='chatroutes-batch') as executor:
+        try:
+            for index, item in enumerate(items):
+                pending.add(executor.submit(contextvars.copy_context().run, call, index, item))
+                if len(pending) >= concurrency * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def run_batch_ordered(
+    fn: Callable[[Any], Any],
+    items: Iterable[Any],
+    concurrency: int = 4
+) -> List[BatchResult]:
+    """Like ``run_batch`` but returns every result, in input order."""
+    return sorted(run_batch(fn, items, concurrency), key=lambda result: result.index)
+
+
+def delete_all(
+    delete: Callable[[str], Any],
+    ids: Iterable[str],
+    concurrency: int = 4,
+    on_progress: Optional[ProgressCallback] = None
+) -> Dict[str, Any]:
+    """Delete every id with bounded concurrency and summarise the outcome.
+
+    An id that is already gone (``NotFoundError``) counts as deleted and is tallied in
+    ``notFound``; any other exception is collected in ``failed`` by id.
+    ``on_progress(done, total)`` is called from the calling thread after each id.
+    """
+    ids = list(ids)
+    summary: Dict[str, Any] = {'deleted': 0, 'notFound': 0, 'failed': {}}
+
+    for done, result in enumerate(run_batch(delete, ids, concurrency), start=1):
+        if result.ok:
+            summary['deleted'] += 1
+        elif isinstance(result.error, NotFoundError):
+            summary['deleted'] += 1
+            summary['notFound'] += 1
+        else:
+            summary['failed'][result.item] = result.error
+        if on_progress is not None:
+            on_progress(done, len(ids))
+
+    return summary
@@ -0,0 +1,198 @@
+import contextvars
+import threading
+from collections import deque
+from types import TracebackType
+from typing import Any, Deque, Dict, Mapping, Optional, Type, Union
+from .metrics import StreamStats
+from .streaming import MessageStream
+from .types import StreamChunk
+
+BLOCK = 'block'
+COALESCE = 'coalesce'
+DROP = 'drop'
+
+OVERFLOW_MODES = (BLOCK, COALESCE, DROP)
+
+_END = object()
+
+
+def _is_content(chunk: Mapping[str, Any]) -> bool:
+    return chunk.get('type') == 'content' and isinstance(chunk.get('content'), str)
+
+
+class ChunkBuffer:
+    """Bounded, thread-safe chunk queue between a stream reader and its consumer.
+
+    When full, ``block`` makes the reader wait, ``coalesce`` appends content chunks to
+    the newest buffered content chunk, and ``drop`` discards content chunks (counted
+    in ``dropped``). Non-content chunks such as ``complete`` are never merged or
+    dropped; the reader waits for room instead.
+    """
+
+    def __init__(self, maxsize: int, overflow: str = BLOCK):
+        if maxsize < 1:
+            raise ValueError("Buffer size must be at least 1")
+        if overflow not in OVERFLOW_MODES:
+            raise ValueError(f"Unknown overflow mode: {overflow!r}. Use one of {', '.join(OVERFLOW_MODES)}")
+
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.dropped = 0
+        self.coalesced = 0
+        self.high_water = 0
+
+        self._items: Deque[Any] = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def put(self, chunk: StreamChunk) -> None:
+        with self._cond:
+            if len(self._items) >= self.maxsize and _is_content(chunk):
+                if self.overflow == DROP:
+                    self.dropped += 1
+                    return
+                if self.overflow == COALESCE and self._coalesce(chunk):
+                    return
+
+            while len(self._items) >= self.maxsize and not self._closed:
+                self._cond.wait()
+            if self._closed:
+                return
+
+            self._items.append(chunk)
+            self.high_water = max(self.high_water, len(self._items))
+            self._cond.notify_all()
+
+    def _coalesce(self, chunk: StreamChunk) -> bool:
+        last = self._items[-1]
+        if not isinstance(last, dict) or not _is_content(last):
+            return False
+        merged: Dict[str, Any] = dict(last)
+        merged['content'] = last['content'] + chunk['content']
+        self._items[-1] = merged
+        self.coalesced += 1
+        return True
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        with self._cond:
+            self._items.append(error if error is not None else _END)
+            self._cond.notify_all()
+
+    def get(self) -> Any:
+        with self._cond:
+            while not self._items:
+                self._cond.wait()
+            item = self._items.popleft()
+            self._cond.notify_all()
+            return item
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._items.clear()
+            self._items.append(_END)
+            self._cond.notify_all()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class BufferedStream:
+    """Reads a ``MessageStream`` on a background thread into a ``ChunkBuffer``.
+
+    The socket is drained at network speed however slowly the consumer iterates;
+    what happens when the consumer falls ``buffer.maxsize`` chunks behind is set by
+    the buffer's ``overflow`` mode. Closing it cancels the underlying stream.
+    """
+
+    def __init__(self, stream: MessageStream, buffer: ChunkBuffer):
+        self.stream = stream
+        self.buffer = buffer
+        self._done = False
+
+        context = contextvars.copy_context()
+        self._reader = threading.Thread(
+            target=context.run,
+            args=(self._read,),
+            name='chatroutes-stream-reader',
+            daemon=True
+        )
+        self._reader.start()
+
+    def _read(self) -> None:
+        try:
+            with self.stream:
+                for chunk in self.stream:
+                    self.buffer.put(chunk)
+        except Exception as e:
+            self.buffer.finish(e)
+        else:
+            self.buffer.finish()
+
+    @property
+    def complete_message(self) -> Optional[Dict[str, Any]]:
+        return self.stream.complete_message
+
+    @property
+    def cancelled(self) -> bool:
+        return self.stream.cancelled
+
+    @property
+    def stats(self) -> Optional[StreamStats]:
+        return self.stream.stats
+
+    @property
+    def dropped(self) -> int:
+        return self.buffer.dropped
+
+    @property
+    def coalesced(self) -> int:
+        return self.buffer.coalesced
+
+    def __iter__(self) -> 'BufferedStream':
+        return self
+
+    def __next__(self) -> StreamChunk:
+        if self._done:
+            raise StopIteration
+
+        item = self.buffer.get()
+        if item is _END:
+            self._done = True
+            self._reader.join()
+            raise StopIteration
+        if isinstance(item, BaseException):
+            self._done = True
+            raise item
+        chunk: StreamChunk = item
+        return chunk
+
+    def until_done(self) -> Optional[Dict[str, Any]]:
+        for _ in self:
+            pass
+        return self.complete_message
+
+    def cancel(self) -> None:
+        """Abort the underlying stream from any thread; the consumer sees the end of the buffer."""
+        self.stream.cancel()
+
+    def close(self) -> None:
+        if self._done:
+            return
+        self._done = True
+        self.stream.cancel()
+        self.buffer.close()
+
+    def __enter__(self) -> 'BufferedStream':
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType]
+    ) -> None:
+        self.close()
+
+
+ChunkStream = Union[MessageStream, BufferedStream]
@@ -0,0 +1,174 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Tuple
+from .exceptions import CircuitOpenError
+
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+ENDPOINT_GROUPS = ('conversations', 'messages', 'branches', 'checkpoints', 'autobranch')
+
+
+def endpoint_group(path: str) -> str:
+    parts = [part for part in path.split('?', 1)[0].split('/') if part]
+    if not parts:
+        return 'conversations'
+    if parts[0] != 'conversations':
+        return parts[0] if parts[0] in ENDPOINT_GROUPS else 'conversations'
+    if len(parts) >= 3:
+        sub_resource = parts[2]
+        if sub_resource in ('branches', 'fork'):
+            return 'branches'
+        if sub_resource in ('messages', 'checkpoints'):
+            return sub_resource
+    return 'conversations'
+
+
+class CircuitBreaker:
+    """Error-rate circuit breaker for one endpoint group.
+
+    Opens when at least ``minimum_requests`` outcomes in the last ``window`` seconds
+    have a failure ratio of ``failure_threshold`` or more. After ``recovery_timeout``
+    it lets ``half_open_max_calls`` probe requests through; if they all succeed the
+    circuit closes, and any failure opens it again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: float = 0.5,
+        minimum_requests: int = 10,
+        window: float = 30.0,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 3
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.minimum_requests = minimum_requests
+        self.window = window
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._outcomes: Deque[Tuple[float, bool]] = deque()
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self.times_opened = 0
+        self.rejected = 0
+
+    def _prune(self, now: float) -> None:
+        cutoff = now - self.window
+        while self._outcomes and self._outcomes[0][0] < cutoff:
+            _, ok = self._outcomes.popleft()
+            if not ok:
+                self._failures -= 1
+
+    def _refresh_state(self, now: float) -> None:
+        if self._state == OPEN and now - self._opened_at >= self.recovery_timeout:
+            self._state = HALF_OPEN
+            self._probes_in_flight = 0
+            self._probe_successes = 0
+
+    def _open(self, now: float) -> None:
+        self._state = OPEN
+        self._opened_at = now
+        self._outcomes.clear()
+        self._failures = 0
+        self.times_opened += 1
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._refresh_state(time.monotonic())
+            return self._state
+
+    def before_call(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._refresh_state(now)
+
+            if self._state == CLOSED:
+                return
+            if self._state == HALF_OPEN and self._probes_in_flight < self.half_open_max_calls:
+                self._probes_in_flight += 1
+                return
+
+            self.rejected += 1
+            retry_after = max(0.0, self.recovery_timeout - (now - self._opened_at))
+            raise CircuitOpenError(self.name, retry_after)
+
+    def record_success(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if self._state == HALF_OPEN:
+                self._probe_successes += 1
+                if self._probe_successes >= self.half_open_max_calls:
+                    self._state = CLOSED
+                return
+            self._prune(now)
+            self._outcomes.append((now, True))
+
+    def record_failure(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if self._state == HALF_OPEN:
+                self._open(now)
+                return
+            if self._state == OPEN:
+                return
+
+            self._prune(now)
+            self._outcomes.append((now, False))
+            self._failures += 1
+
+            total = len(self._outcomes)
+            if total >= self.minimum_requests and self._failures / total >= self.failure_threshold:
+                self._open(now)
+
+    def record_ignored(self) -> None:
+        with self._lock:
+            if self._state == HALF_OPEN and self._probes_in_flight > 0:
+                self._probes_in_flight -= 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            now = time.monotonic()
+            self._refresh_state(now)
+            self._prune(now)
+            return {
+                'state': self._state,
+                'requests': len(self._outcomes),
+                'failures': self._failures,
+                'timesOpened': self.times_opened,
+                'rejected': self.rejected
+            }
+
+
+class CircuitBreakerRegistry:
+    def __init__(self, **breaker_options: Any):
+        self._options = breaker_options
+        self._lock = threading.Lock()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, group: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(group)
+            if breaker is None:
+                breaker = CircuitBreaker(group, **self._options)
+                self._breakers[group] = breaker
+            return breaker
+
+    def for_path(self, path: str) -> CircuitBreaker:
+        return self.get(endpoint_group(path))
+
+    def states(self) -> Dict[str, str]:
+        return {group: self.get(group).state for group in ENDPOINT_GROUPS}
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {group: self.get(group).snapshot() for group in ENDPOINT_GROUPS}
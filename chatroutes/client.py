@@ -1,5 +1,15 @@
-from typing import Optional
+from types import TracebackType
+from typing import ContextManager, Optional, Type, Union
 from .http_client import HttpClient
+from .pool import ConnectionPool
+from .transport import Transport
+from .rate_limit import RateLimiter
+from .retry import RetryPolicy
+from .deadline import Deadline, deadline
+from .codec import JSONCodec
+from .circuit_breaker import CircuitBreakerRegistry
+from .hedging import HedgingPolicy
+from .streaming import ParseErrorHook
 from .resources import (
     ConversationsResource,
     MessagesResource,
@@ -17,14 +27,62 @@ class ChatRoutes:
         timeout: int = 30,
         retry_attempts: int = 3,
         retry_delay: float = 1.0,
-        autobranch_base_url: Optional[str] = None
+        autobranch_base_url: Optional[str] = None,
+        pool: Optional[ConnectionPool] = None,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        idle_timeout: Optional[float] = None,
+        transport: Union[str, Transport, None] = None,
+        rate_limit: Union[float, RateLimiter, None] = None,
+        wait_on_rate_limit: bool = False,
+        retry_policy: Optional[RetryPolicy] = None,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        total_timeout: Optional[float] = None,
+        json_codec: Union[str, JSONCodec, None] = None,
+        compress_requests: bool = False,
+        compression_threshold: int = 1024,
+        accept_compressed: bool = True,
+        circuit_breaker: Union[bool, CircuitBreakerRegistry, None] = None,
+        hedging: Optional[HedgingPolicy] = None,
+        on_parse_error: Optional[ParseErrorHook] = None,
+        stream_resumes: int = 3,
+        stream_stats: bool = False,
+        stream_idle_timeout: Optional[float] = None,
+        stream_timeout: Optional[float] = None
     ):
         self._http = HttpClient(
             api_key=api_key,
             base_url=base_url,
             timeout=timeout,
             retry_attempts=retry_attempts,
-            retry_delay=retry_delay
+            retry_delay=retry_delay,
+            pool=pool,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            keep_alive=keep_alive,
+            idle_timeout=idle_timeout,
+            transport=transport,
+            rate_limit=rate_limit,
+            wait_on_rate_limit=wait_on_rate_limit,
+            retry_policy=retry_policy,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+            total_timeout=total_timeout,
+            json_codec=json_codec,
+            compress_requests=compress_requests,
+            compression_threshold=compression_threshold,
+            accept_compressed=accept_compressed,
+            circuit_breaker=circuit_breaker,
+            hedging=hedging,
+            on_parse_error=on_parse_error,
+            stream_resumes=stream_resumes,
+            stream_stats=stream_stats,
+            stream_idle_timeout=stream_idle_timeout,
+            stream_timeout=stream_timeout
         )
 
         self.conversations = ConversationsResource(self)
@@ -41,5 +99,38 @@ class ChatRoutes:
     def base_url(self) -> str:
         return self._http.base_url
 
+    @property
+    def pool(self) -> Optional[ConnectionPool]:
+        return self._http.pool
+
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        return self._http.rate_limiter
+
+    @property
+    def circuit_breakers(self) -> Optional[CircuitBreakerRegistry]:
+        return self._http.circuit_breakers
+
+    @property
+    def hedging(self) -> Optional[HedgingPolicy]:
+        return self._http.hedging
+
+    def deadline(self, seconds: float) -> ContextManager[Deadline]:
+        return deadline(seconds)
+
     def _get_headers(self) -> dict:
-        return self._http.session.headers.copy()
+        return self._http.headers.copy()
+
+    def close(self) -> None:
+        self._http.close()
+
+    def __enter__(self) -> 'ChatRoutes':
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType]
+    ) -> None:
+        self.close()
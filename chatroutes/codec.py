@@ -0,0 +1,64 @@
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+
+class JSONCodec(ABC):
+    name = 'base'
+
+    @abstractmethod
+    def dumps(self, obj: Any) -> bytes:
+        ...
+
+    @abstractmethod
+    def loads(self, data: Union[bytes, bytearray, memoryview, str]) -> Any:
+        ...
+
+
+class StdlibJSONCodec(JSONCodec):
+    name = 'json'
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+    def loads(self, data: Union[bytes, bytearray, memoryview, str]) -> Any:
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    name = 'orjson'
+
+    def __init__(self) -> None:
+        if orjson is None:
+            raise ImportError("OrjsonCodec requires orjson. Install it with: pip install chatroutes[speedups]")
+
+    def dumps(self, obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    def loads(self, data: Union[bytes, bytearray, memoryview, str]) -> Any:
+        return orjson.loads(data)
+
+
+def default_codec() -> JSONCodec:
+    if orjson is not None:
+        return OrjsonCodec()
+    return StdlibJSONCodec()
+
+
+def resolve_codec(codec: Union[str, JSONCodec, None] = None) -> JSONCodec:
+    if isinstance(codec, JSONCodec):
+        return codec
+    if codec is None:
+        return default_codec()
+    if codec == 'orjson':
+        return OrjsonCodec()
+    if codec == 'json':
+        return StdlibJSONCodec()
+    raise ValueError(f"Unknown JSON codec: {codec!r}. Use 'orjson', 'json' or a JSONCodec instance")
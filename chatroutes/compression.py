@@ -0,0 +1,45 @@
+import gzip
+import importlib
+from typing import Dict, Optional, Tuple
+
+DEFAULT_ENCODINGS = 'gzip, deflate'
+
+
+def requests_encodings() -> str:
+    """Encodings the installed urllib3 can decode, as it advertises them itself."""
+    try:
+        from urllib3.util.request import ACCEPT_ENCODING
+    except ImportError:  # pragma: no cover - urllib3 always ships with requests
+        return DEFAULT_ENCODINGS
+    return ', '.join(encoding.strip() for encoding in ACCEPT_ENCODING.split(','))
+
+
+def httpx_encodings() -> str:
+    """Encodings httpx can decode: gzip and deflate, plus br and zstd when their decoders import."""
+    encodings = [DEFAULT_ENCODINGS]
+    if _importable('brotli') or _importable('brotlicffi'):
+        encodings.append('br')
+    if _importable('zstandard'):
+        encodings.append('zstd')
+    return ', '.join(encodings)
+
+
+def _importable(module: str) -> bool:
+    try:
+        importlib.import_module(module)
+    except ImportError:
+        return False
+    return True
+
+
+class RequestCompressor:
+    """Gzips request bodies at or above ``threshold`` bytes."""
+
+    def __init__(self, threshold: int = 1024, level: int = 6):
+        self.threshold = threshold
+        self.level = level
+
+    def compress(self, content: Optional[bytes]) -> Tuple[Optional[bytes], Dict[str, str]]:
+        if content is None or len(content) < self.threshold:
+            return content, {}
+        return gzip.compress(content, compresslevel=self.level), {'Content-Encoding': 'gzip'}
@@ -0,0 +1,58 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+
+class Deadline:
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self.expires_at = time.monotonic() + timeout
+
+    def remaining(self) -> float:
+        return self.expires_at - time.monotonic()
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def clamp(self, seconds: Optional[float]) -> float:
+        remaining = max(0.0, self.remaining())
+        return remaining if seconds is None else min(seconds, remaining)
+
+
+_current_deadline: ContextVar[Optional[Deadline]] = ContextVar('chatroutes_deadline', default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    return _current_deadline.get()
+
+
+def resolve_deadline(default_timeout: Optional[float] = None) -> Optional[Deadline]:
+    active = _current_deadline.get()
+    if default_timeout is None:
+        return active
+
+    fallback = Deadline(default_timeout)
+    if active is None or fallback.expires_at < active.expires_at:
+        return fallback
+    return active
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[Deadline]:
+    """Bound the total time of every ChatRoutes call made inside the block.
+
+    Covers all attempts, backoff sleeps and rate-limit waits. Nested blocks can only
+    tighten an enclosing deadline, never extend it.
+    """
+    new = Deadline(seconds)
+    active = _current_deadline.get()
+    if active is not None and active.expires_at < new.expires_at:
+        new = active
+
+    token = _current_deadline.set(new)
+    try:
+        yield new
+    finally:
+        _current_deadline.reset(token)
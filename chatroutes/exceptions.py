@@ -50,3 +50,42 @@ class ServerError(ChatRoutesError):
 class NetworkError(ChatRoutesError):
     def __init__(self, message: str = "Network request failed", details: Optional[Any] = None):
         super().__init__(message, 0, "NETWORK_ERROR", details)
+
+
+class DeadlineExceededError(NetworkError):
+    def __init__(self, message: str = "Request deadline exceeded", details: Optional[Any] = None):
+        super().__init__(message, details)
+        self.code = "DEADLINE_EXCEEDED"
+
+
+class StreamStalledError(NetworkError):
+    def __init__(
+        self,
+        reason: str,
+        timeout: float,
+        partial_content: str = '',
+        chunks: int = 0,
+        details: Optional[Any] = None
+    ):
+        if reason == 'idle':
+            message = f"Stream stalled: no chunk received for {timeout}s"
+        else:
+            message = f"Stream deadline of {timeout}s exceeded"
+        super().__init__(message, details)
+        self.code = "STREAM_STALLED"
+        self.reason = reason
+        self.timeout = timeout
+        self.partial_content = partial_content
+        self.chunks = chunks
+
+
+class CircuitOpenError(ChatRoutesError):
+    def __init__(self, endpoint: str, retry_after: Optional[float] = None, details: Optional[Any] = None):
+        super().__init__(
+            f"Circuit breaker for '{endpoint}' is open; failing fast",
+            503,
+            "CIRCUIT_OPEN",
+            details
+        )
+        self.endpoint = endpoint
+        self.retry_after = retry_after
@@ -0,0 +1,124 @@
+import contextvars
+import queue
+import threading
+from types import TracebackType
+from typing import Any, Callable, Dict, Optional, Set, Tuple, Type
+from .buffering import ChunkStream
+from .types import StreamChunk
+
+WinnerCheck = Callable[[str, StreamChunk], bool]
+
+_FINISHED = object()
+
+
+def first_complete(source: str, chunk: StreamChunk) -> bool:
+    """Winner check picking the first stream to deliver its complete message."""
+    return chunk.get('type') == 'complete'
+
+
+class StreamFanOut:
+    """Runs several message streams at once and interleaves their chunks.
+
+    Each source (a model name or branch id) is opened and read on its own thread over
+    the client's shared pool; iterating yields ``(source, chunk)`` pairs in arrival
+    order. When ``pick_winner`` returns True for a chunk, its source becomes ``winner``
+    and every other stream is cancelled. ``complete_messages`` and ``errors`` are keyed
+    by source; a failing stream never interrupts the others. Leaving the ``with`` block
+    cancels whatever is still running.
+    """
+
+    def __init__(
+        self,
+        openers: Dict[str, Callable[[], ChunkStream]],
+        pick_winner: Optional[WinnerCheck] = None
+    ):
+        self.sources = tuple(openers)
+        self.pick_winner = pick_winner
+        self.winner: Optional[str] = None
+        self.complete_messages: Dict[str, Optional[dict]] = {}
+        self.errors: Dict[str, Exception] = {}
+
+        self._queue: 'queue.Queue[Tuple[str, Any]]' = queue.Queue()
+        self._lock = threading.Lock()
+        self._streams: Dict[str, ChunkStream] = {}
+        self._cancelled: Set[str] = set()
+        self._pending = len(openers)
+
+        for source, opener in openers.items():
+            context = contextvars.copy_context()
+            thread = threading.Thread(
+                target=context.run,
+                args=(self._pump, source, opener),
+                name=f'chatroutes-fanout-{source}',
+                daemon=True
+            )
+            thread.start()
+
+    def _pump(self, source: str, opener: Callable[[], ChunkStream]) -> None:
+        try:
+            if source in self._cancelled:
+                return
+            stream = opener()
+            with self._lock:
+                self._streams[source] = stream
+                cancelled = source in self._cancelled
+            if cancelled:
+                stream.cancel()
+
+            with stream:
+                for chunk in stream:
+                    self._queue.put((source, chunk))
+            if not stream.cancelled:
+                self.complete_messages[source] = stream.complete_message
+        except Exception as e:
+            if source not in self._cancelled:
+                self.errors[source] = e
+        finally:
+            self._queue.put((source, _FINISHED))
+
+    def __iter__(self) -> 'StreamFanOut':
+        return self
+
+    def __next__(self) -> Tuple[str, StreamChunk]:
+        while self._pending:
+            source, chunk = self._queue.get()
+            if chunk is _FINISHED:
+                self._pending -= 1
+                continue
+            if source in self._cancelled:
+                continue
+
+            if self.winner is None and self.pick_winner is not None and self.pick_winner(source, chunk):
+                self.winner = source
+                self.cancel_others(source)
+            return source, chunk
+
+        raise StopIteration
+
+    def cancel(self, source: Optional[str] = None) -> None:
+        """Cancel one source, or every source when ``source`` is None."""
+        with self._lock:
+            targets = [source] if source is not None else list(self.sources)
+            self._cancelled.update(targets)
+            streams = [self._streams[name] for name in targets if name in self._streams]
+        for stream in streams:
+            stream.cancel()
+
+    def cancel_others(self, source: str) -> None:
+        for other in self.sources:
+            if other != source:
+                self.cancel(other)
+
+    def close(self) -> None:
+        self.cancel()
+
+    def __enter__(self) -> 'StreamFanOut':
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType]
+    ) -> None:
+        self.close()
@@ -0,0 +1,128 @@
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+from .transport import TransportResponse
+
+
+class HedgingPolicy:
+    """Hedged reads for idempotent GET requests.
+
+    If a GET has not answered after ``delay`` seconds (or, when ``delay`` is None, the
+    ``percentile`` of recently observed GET latencies), an identical request is sent and
+    whichever answers first wins. ``max_extra_load`` caps hedges to that fraction of
+    requests, so hedging can never more than double traffic during a slowdown. The first
+    request runs on the caller's thread; only hedges use the pool of ``max_workers`` threads.
+    """
+
+    def __init__(
+        self,
+        delay: Optional[float] = None,
+        percentile: float = 0.95,
+        min_samples: int = 20,
+        sample_size: int = 512,
+        max_extra_load: float = 0.1,
+        max_workers: int = 32
+    ):
+        self.delay = delay
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.max_extra_load = max_extra_load
+        self.max_workers = max_workers
+
+        self._lock = threading.Lock()
+        self._latencies: Deque[float] = deque(maxlen=sample_size)
+        self._hedge_tokens = 1.0
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    def record_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+            self._hedge_tokens = min(10.0, self._hedge_tokens + self.max_extra_load)
+
+    def record_latency(self, seconds: float) -> None:
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def hedge_delay(self) -> Optional[float]:
+        if self.delay is not None:
+            return self.delay
+
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            ordered = sorted(self._latencies)
+
+        index = min(len(ordered) - 1, int(self.percentile * len(ordered)))
+        return ordered[index]
+
+    def try_acquire_hedge(self) -> bool:
+        with self._lock:
+            if self._hedge_tokens < 1:
+                return False
+            self._hedge_tokens -= 1
+            self.hedged += 1
+            return True
+
+    def record_hedge_win(self) -> None:
+        with self._lock:
+            self.hedge_wins += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'hedged': self.hedged,
+                'hedgeWins': self.hedge_wins,
+                'hedgeRate': self.hedged / self.requests if self.requests else 0.0
+            }
+
+
+class HedgeAttempt:
+    """One request of a hedged GET; ``cancel()`` stops its retries and closes its response."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self._response: Optional[TransportResponse] = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def track(self, response: TransportResponse) -> bool:
+        """Remember the in-flight ``response``; False if the attempt was already cancelled."""
+        with self._lock:
+            if self._cancelled:
+                return False
+            self._response = response
+            return True
+
+    def cancel(self) -> None:
+        with self._lock:
+            self._cancelled = True
+            response, self._response = self._response, None
+        if response is not None:
+            response.close()
+
+
+class HedgeRace:
+    """The primary request and its hedge; the first to ``claim`` a win cancels the other."""
+
+    def __init__(self) -> None:
+        self.primary = HedgeAttempt()
+        self.hedge = HedgeAttempt()
+        self.hedge_sent = False
+        self.settled = threading.Event()
+        self._lock = threading.Lock()
+        self._winner: Optional[HedgeAttempt] = None
+
+    def claim(self, attempt: HedgeAttempt) -> bool:
+        with self._lock:
+            if self._winner is not None:
+                return False
+            self._winner = attempt
+        self.settled.set()
+        (self.hedge if attempt is self.primary else self.primary).cancel()
+        return True
@@ -1,6 +1,23 @@
+import contextvars
+import functools
+import threading
 import time
-from typing import Any, Dict, Optional
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple, Union
 import requests
+from .pool import ConnectionPool
+from .transport import Transport, TransportError, TransportResponse, RequestsTransport, create_transport
+from .rate_limit import RateLimiter, parse_retry_after
+from .retry import IDEMPOTENCY_HEADER, RetryPolicy, new_idempotency_key
+from .deadline import Deadline, resolve_deadline
+from .codec import JSONCodec, resolve_codec
+from .compression import RequestCompressor, httpx_encodings
+from .circuit_breaker import CircuitBreaker, CircuitBreakerRegistry
+from .hedging import HedgeAttempt, HedgeRace, HedgingPolicy
+from .metrics import StreamStats, get_metrics_hook
+from .streaming import MessageStream, ParseErrorHook
+from .buffering import BLOCK, BufferedStream, ChunkBuffer, ChunkStream
+from .types import StreamChunk
 from .exceptions import (
     ChatRoutesError,
     AuthenticationError,
@@ -8,32 +25,105 @@ from .exceptions import (
     ValidationError,
     NotFoundError,
     ServerError,
-    NetworkError
+    NetworkError,
+    DeadlineExceededError
 )
 
+HedgedSend = Callable[[Optional[HedgeAttempt]], Dict[str, Any]]
 
-class HttpClient:
+
+class BaseHttpClient:
     def __init__(
         self,
         api_key: str,
         base_url: str = "https://api.chatroutes.com/api/v1",
         timeout: int = 30,
         retry_attempts: int = 3,
-        retry_delay: float = 1.0
+        retry_delay: float = 1.0,
+        retry_policy: Optional[RetryPolicy] = None,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        total_timeout: Optional[float] = None,
+        json_codec: Union[str, JSONCodec, None] = None,
+        compress_requests: bool = False,
+        compression_threshold: int = 1024,
+        accept_compressed: bool = True,
+        on_parse_error: Optional[ParseErrorHook] = None
     ):
         self.api_key = api_key
         self.base_url = base_url.rstrip('/')
         self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.total_timeout = total_timeout
         self.retry_attempts = retry_attempts
         self.retry_delay = retry_delay
-        self.session = requests.Session()
-        self._set_default_headers()
-
-    def _set_default_headers(self):
-        self.session.headers.update({
+        self.retry_policy = retry_policy or RetryPolicy(
+            max_retries=retry_attempts,
+            backoff_base=retry_delay
+        )
+        self.codec = resolve_codec(json_codec)
+        self.compressor = RequestCompressor(compression_threshold) if compress_requests else None
+        self.accept_compressed = accept_compressed
+        self.on_parse_error = on_parse_error
+
+    def _default_headers(self) -> Dict[str, str]:
+        headers = {
             'Content-Type': 'application/json',
             'Authorization': f'ApiKey {self.api_key}'
-        })
+        }
+        if self.accept_compressed:
+            headers['Accept-Encoding'] = self._accepted_encodings()
+        return headers
+
+    def _accepted_encodings(self) -> str:
+        return httpx_encodings()
+
+    def _encode_body(
+        self,
+        data: Optional[Mapping[str, Any]],
+        headers: Dict[str, str]
+    ) -> Optional[bytes]:
+        content = self.codec.dumps(data) if data is not None else None
+        if self.compressor is not None:
+            content, extra_headers = self.compressor.compress(content)
+            headers.update(extra_headers)
+        return content
+
+    def _decode_body(self, body: bytes) -> Dict[str, Any]:
+        try:
+            decoded: Dict[str, Any] = self.codec.loads(body)
+        except ValueError:
+            return {'error': 'Invalid JSON response'}
+        return decoded
+
+    def _attempt_timeout(self, call_deadline: Optional[Deadline]) -> Tuple[float, float]:
+        connect = self.connect_timeout if self.connect_timeout is not None else self.timeout
+        read = self.read_timeout if self.read_timeout is not None else self.timeout
+        if call_deadline is not None:
+            connect = call_deadline.clamp(connect)
+            read = call_deadline.clamp(read)
+        return connect, read
+
+    def _retry_fits(self, call_deadline: Optional[Deadline], delay: float, attempt_duration: float) -> bool:
+        if call_deadline is None:
+            return True
+        read = self.read_timeout if self.read_timeout is not None else self.timeout
+        return delay + min(attempt_duration, read) < call_deadline.remaining()
+
+    def _deadline_error(self, call_deadline: Deadline, last_error: Optional[Exception]) -> DeadlineExceededError:
+        return DeadlineExceededError(
+            f"Request deadline of {call_deadline.timeout}s exceeded",
+            {'error': str(last_error)} if last_error else None
+        )
+
+    def _apply_idempotency_key(self, method: str, headers: Dict[str, str]) -> bool:
+        if any(name.lower() == IDEMPOTENCY_HEADER.lower() for name in headers):
+            return True
+        if self.retry_policy.needs_idempotency_key(method):
+            headers[IDEMPOTENCY_HEADER] = new_idempotency_key()
+            return True
+        return False
 
     def _handle_error_response(self, status_code: int, response_data: Dict[str, Any]) -> ChatRoutesError:
         message = response_data.get('message') or response_data.get('error', 'An error occurred')
@@ -53,17 +143,239 @@ class HttpClient:
         else:
             return ChatRoutesError(message, status_code, response_data.get('error'), details)
 
+
+class HttpClient(BaseHttpClient):
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = "https://api.chatroutes.com/api/v1",
+        timeout: int = 30,
+        retry_attempts: int = 3,
+        retry_delay: float = 1.0,
+        pool: Optional[ConnectionPool] = None,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        idle_timeout: Optional[float] = None,
+        transport: Union[str, Transport, None] = None,
+        rate_limit: Union[float, RateLimiter, None] = None,
+        wait_on_rate_limit: bool = False,
+        retry_policy: Optional[RetryPolicy] = None,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        total_timeout: Optional[float] = None,
+        json_codec: Union[str, JSONCodec, None] = None,
+        compress_requests: bool = False,
+        compression_threshold: int = 1024,
+        accept_compressed: bool = True,
+        circuit_breaker: Union[bool, CircuitBreakerRegistry, None] = None,
+        hedging: Optional[HedgingPolicy] = None,
+        on_parse_error: Optional[ParseErrorHook] = None,
+        stream_resumes: int = 3,
+        stream_stats: bool = False,
+        stream_idle_timeout: Optional[float] = None,
+        stream_timeout: Optional[float] = None
+    ):
+        super().__init__(
+            api_key=api_key,
+            base_url=base_url,
+            timeout=timeout,
+            retry_attempts=retry_attempts,
+            retry_delay=retry_delay,
+            retry_policy=retry_policy,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+            total_timeout=total_timeout,
+            json_codec=json_codec,
+            compress_requests=compress_requests,
+            compression_threshold=compression_threshold,
+            accept_compressed=accept_compressed,
+            on_parse_error=on_parse_error
+        )
+        if isinstance(rate_limit, RateLimiter):
+            self.rate_limiter = rate_limit
+        else:
+            self.rate_limiter = RateLimiter(rate=rate_limit)
+        self.wait_on_rate_limit = wait_on_rate_limit
+        self.stream_resumes = stream_resumes
+        self.stream_stats = stream_stats
+        self.stream_idle_timeout = stream_idle_timeout
+        self.stream_timeout = stream_timeout
+        if isinstance(circuit_breaker, CircuitBreakerRegistry):
+            self.circuit_breakers: Optional[CircuitBreakerRegistry] = circuit_breaker
+        else:
+            self.circuit_breakers = CircuitBreakerRegistry() if circuit_breaker else None
+        self.hedging = hedging
+        self._hedge_executor: Optional[ThreadPoolExecutor] = None
+        self._hedge_executor_lock = threading.Lock()
+        self._owns_transport = not isinstance(transport, Transport)
+        self.transport = create_transport(
+            transport,
+            pool=pool,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            keep_alive=keep_alive,
+            idle_timeout=idle_timeout
+        )
+        self.headers = self._default_headers()
+
+    def _accepted_encodings(self) -> str:
+        return self.transport.accepted_encodings()
+
+    @property
+    def pool(self) -> Optional[ConnectionPool]:
+        if isinstance(self.transport, RequestsTransport):
+            return self.transport.pool
+        return None
+
+    @property
+    def session(self) -> Optional[requests.Session]:
+        pool = self.pool
+        return pool.session if pool else None
+
+    def close(self) -> None:
+        if self._hedge_executor is not None:
+            self._hedge_executor.shutdown(wait=False)
+        if self._owns_transport:
+            self.transport.close()
+
+    def _decode_response(self, response: TransportResponse) -> Dict[str, Any]:
+        return self._decode_body(response.read())
+
+    def _breaker_for(self, path: str) -> Optional[CircuitBreaker]:
+        if self.circuit_breakers is None:
+            return None
+        breaker = self.circuit_breakers.for_path(path)
+        breaker.before_call()
+        return breaker
+
+    def _record_outcome(self, breaker: Optional[CircuitBreaker], status_code: Optional[int]) -> None:
+        if breaker is None:
+            return
+        if status_code is None or status_code >= 500:
+            breaker.record_failure()
+        elif status_code < 400:
+            breaker.record_success()
+        else:
+            breaker.record_ignored()
+
+    def _release_breaker(self, breaker: Optional[CircuitBreaker]) -> None:
+        """Give back a probe slot taken by ``before_call`` when the attempt has no outcome."""
+        if breaker is not None:
+            breaker.record_ignored()
+
+    def _record_rate_limit(self, response: TransportResponse, error: RateLimitError) -> float:
+        if error.retry_after is None:
+            header_value = parse_retry_after(response.headers.get('Retry-After'))
+            if header_value is not None:
+                error.retry_after = int(header_value + 0.999)
+
+        retry_after = float(error.retry_after) if error.retry_after is not None else 1.0
+        self.rate_limiter.on_rate_limited(retry_after)
+        return retry_after
+
     def request(
         self,
         method: str,
         path: str,
-        data: Optional[Dict[str, Any]] = None,
-        params: Optional[Dict[str, Any]] = None,
+        data: Optional[Mapping[str, Any]] = None,
+        params: Optional[Mapping[str, Any]] = None,
         headers: Optional[Dict[str, str]] = None,
         skip_auth: bool = False
+    ) -> Dict[str, Any]:
+        if self.hedging is not None and method.upper() == 'GET':
+            return self._hedged_request(self.hedging, path, params, headers, skip_auth)
+        return self._request(method, path, data, params, headers, skip_auth)
+
+    def _submit_hedge(
+        self,
+        policy: HedgingPolicy,
+        race: HedgeRace,
+        send_at: float,
+        started: float,
+        send: HedgedSend
+    ) -> 'Future[Optional[Dict[str, Any]]]':
+        with self._hedge_executor_lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = ThreadPoolExecutor(
+                    max_workers=policy.max_workers,
+                    thread_name_prefix='chatroutes-hedge'
+                )
+            executor = self._hedge_executor
+        return executor.submit(
+            contextvars.copy_context().run, self._run_hedge, policy, race, send_at, started, send
+        )
+
+    def _run_hedge(
+        self,
+        policy: HedgingPolicy,
+        race: HedgeRace,
+        send_at: float,
+        started: float,
+        send: HedgedSend
+    ) -> Optional[Dict[str, Any]]:
+        if race.settled.wait(max(0.0, send_at - time.monotonic())) or not policy.try_acquire_hedge():
+            return None
+
+        race.hedge_sent = True
+        result = send(race.hedge)
+        if race.claim(race.hedge):
+            policy.record_hedge_win()
+            policy.record_latency(time.monotonic() - started)
+        return result
+
+    def _hedged_request(
+        self,
+        policy: HedgingPolicy,
+        path: str,
+        params: Optional[Mapping[str, Any]],
+        headers: Optional[Dict[str, str]],
+        skip_auth: bool
+    ) -> Dict[str, Any]:
+        policy.record_request()
+        started = time.monotonic()
+        send: HedgedSend = functools.partial(
+            self._request, 'GET', path, None, params, headers, skip_auth
+        )
+
+        delay = policy.hedge_delay()
+        if delay is None:
+            result = send(None)
+            policy.record_latency(time.monotonic() - started)
+            return result
+
+        race = HedgeRace()
+        hedge = self._submit_hedge(policy, race, started + delay, started, send)
+        try:
+            result = send(race.primary)
+        except Exception:
+            race.settled.set()
+            wait([hedge])
+            hedged = hedge.result() if race.hedge_sent and hedge.exception() is None else None
+            if hedged is None:
+                raise
+            return hedged
+
+        if race.claim(race.primary):
+            policy.record_latency(time.monotonic() - started)
+            return result
+        hedged = hedge.result()
+        return hedged if hedged is not None else result
+
+    def _request(
+        self,
+        method: str,
+        path: str,
+        data: Optional[Mapping[str, Any]] = None,
+        params: Optional[Mapping[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        skip_auth: bool = False,
+        hedge: Optional[HedgeAttempt] = None
     ) -> Dict[str, Any]:
         url = f"{self.base_url}{path}"
-        request_headers = self.session.headers.copy()
+        request_headers = self.headers.copy()
 
         if headers:
             request_headers.update(headers)
@@ -71,115 +383,230 @@ class HttpClient:
         if skip_auth:
             request_headers.pop('Authorization', None)
 
-        last_error = None
+        content = self._encode_body(data or None, request_headers)
+        has_idempotency_key = self._apply_idempotency_key(method, request_headers)
+        call_deadline = resolve_deadline(self.total_timeout)
+        policy = self.retry_policy
+        policy.budget.record_request()
+        attempt = 0
+        last_error: Optional[ChatRoutesError] = None
+
+        while True:
+            if call_deadline is not None and call_deadline.expired:
+                raise self._deadline_error(call_deadline, last_error)
+            if hedge is not None and hedge.cancelled:
+                raise last_error or NetworkError("Hedged request superseded")
+
+            max_wait = call_deadline.clamp(self.rate_limiter.max_wait) if call_deadline else None
+            self.rate_limiter.acquire(max_wait)
+            breaker = self._breaker_for(path)
+            started = time.monotonic()
 
-        for attempt in range(self.retry_attempts + 1):
             try:
-                response = self.session.request(
-                    method=method,
-                    url=url,
-                    json=data if data else None,
-                    params=params,
+                response = self.transport.request(
+                    method,
+                    url,
                     headers=request_headers,
-                    timeout=self.timeout
+                    content=content,
+                    params=params,
+                    timeout=self._attempt_timeout(call_deadline),
+                    stream=hedge is not None
                 )
+                superseded = hedge is not None and not hedge.track(response)
+                if not superseded:
+                    with response:
+                        self.rate_limiter.update_from_headers(response.headers)
+                        response_data = self._decode_response(response)
+            except TransportError as e:
+                if hedge is not None and hedge.cancelled:
+                    self._release_breaker(breaker)
+                    raise NetworkError("Hedged request superseded")
+                self._record_outcome(breaker, None)
+                last_error = NetworkError(f"Request failed: {str(e)}", {'error': str(e)})
+                if call_deadline is not None and call_deadline.expired:
+                    raise self._deadline_error(call_deadline, last_error)
+
+                delay = policy.backoff(attempt)
+                if (
+                    self._retry_fits(call_deadline, delay, time.monotonic() - started)
+                    and policy.should_retry(method, attempt, has_idempotency_key)
+                ):
+                    time.sleep(delay)
+                    attempt += 1
+                    continue
 
-                try:
-                    response_data = response.json()
-                except requests.exceptions.JSONDecodeError:
-                    response_data = {'error': 'Invalid JSON response'}
-
-                if not response.ok:
-                    error = self._handle_error_response(response.status_code, response_data)
+                raise last_error
+            except BaseException:
+                self._release_breaker(breaker)
+                raise
 
-                    if response.status_code < 500:
-                        raise error
+            if superseded:
+                response.close()
+                self._release_breaker(breaker)
+                raise NetworkError("Hedged request superseded")
 
-                    last_error = error
-                    if attempt < self.retry_attempts:
-                        delay = self.retry_delay * (2 ** attempt)
-                        time.sleep(delay)
-                        continue
-                    raise error
+            self._record_outcome(breaker, response.status_code)
 
+            if response.ok:
+                self.rate_limiter.record_success()
                 return response_data
 
-            except requests.exceptions.RequestException as e:
-                last_error = NetworkError(f"Request failed: {str(e)}", {'error': str(e)})
-
-                if attempt < self.retry_attempts:
-                    delay = self.retry_delay * (2 ** attempt)
-                    time.sleep(delay)
+            last_error = self._handle_error_response(response.status_code, response_data)
+
+            if isinstance(last_error, RateLimitError):
+                retry_after = self._record_rate_limit(response, last_error)
+                if (
+                    self.wait_on_rate_limit
+                    and attempt < policy.max_retries
+                    and retry_after <= self.rate_limiter.max_wait
+                    and self._retry_fits(call_deadline, retry_after, time.monotonic() - started)
+                ):
+                    attempt += 1
                     continue
-
                 raise last_error
 
-        if last_error:
-            raise last_error
+            delay = policy.backoff(attempt)
+            if (
+                self._retry_fits(call_deadline, delay, time.monotonic() - started)
+                and policy.should_retry(method, attempt, has_idempotency_key, response.status_code)
+            ):
+                time.sleep(delay)
+                attempt += 1
+                continue
 
-        raise NetworkError("Request failed after retries")
+            raise last_error
 
-    def get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    def get(self, path: str, params: Optional[Mapping[str, Any]] = None) -> Dict[str, Any]:
         return self.request('GET', path, params=params)
 
     def post(
         self,
         path: str,
-        data: Optional[Dict[str, Any]] = None,
+        data: Optional[Mapping[str, Any]] = None,
         headers: Optional[Dict[str, str]] = None,
         skip_auth: bool = False
     ) -> Dict[str, Any]:
         return self.request('POST', path, data=data, headers=headers, skip_auth=skip_auth)
 
-    def patch(self, path: str, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    def patch(self, path: str, data: Optional[Mapping[str, Any]] = None) -> Dict[str, Any]:
         return self.request('PATCH', path, data=data)
 
     def delete(self, path: str) -> Dict[str, Any]:
         return self.request('DELETE', path)
 
-    def stream(self, path: str, data: Dict[str, Any], on_chunk):
+    def open_stream(
+        self,
+        path: str,
+        data: Mapping[str, Any],
+        buffer_size: Optional[int] = None,
+        overflow: str = BLOCK,
+        keep_content: bool = True
+    ) -> ChunkStream:
+        buffer = ChunkBuffer(buffer_size, overflow) if buffer_size is not None else None
         url = f"{self.base_url}{path}"
-        headers = self.session.headers.copy()
+        headers = self.headers.copy()
         headers['Accept'] = 'text/event-stream'
+        self._apply_idempotency_key('POST', headers)
+        content = self._encode_body(data, headers)
+        call_deadline = resolve_deadline(self.total_timeout)
+        stream_deadline = Deadline(self.stream_timeout) if self.stream_timeout is not None else None
+        stats = None
+        if self.stream_stats or get_metrics_hook() is not None:
+            stats = StreamStats(model=data.get('model'))
+
+        def reconnect(last_event_id: str, attempt: int, retry_ms: Optional[int]) -> TransportResponse:
+            delay = retry_ms / 1000 if retry_ms is not None else self.retry_policy.backoff(attempt - 1)
+            if call_deadline is not None and delay >= call_deadline.remaining():
+                raise self._deadline_error(call_deadline, None)
+            time.sleep(delay)
+
+            resume_headers = headers.copy()
+            resume_headers['Last-Event-ID'] = last_event_id
+            return self._connect_stream(path, url, resume_headers, content, call_deadline, stream_deadline)
 
         try:
-            response = self.session.post(
+            response = self._connect_stream(path, url, headers, content, call_deadline, stream_deadline)
+        except TransportError as e:
+            raise NetworkError(f"Stream request failed: {str(e)}", {'error': str(e)})
+
+        if stats is not None:
+            stats.record_connect()
+
+        stream = MessageStream(
+            response,
+            self.codec,
+            self.on_parse_error,
+            reconnect=reconnect,
+            max_resumes=self.stream_resumes,
+            stats=stats,
+            idle_timeout=self.stream_idle_timeout,
+            stream_deadline=stream_deadline,
+            keep_content=keep_content
+        )
+        return BufferedStream(stream, buffer) if buffer is not None else stream
+
+    def _connect_stream(
+        self,
+        path: str,
+        url: str,
+        headers: Dict[str, str],
+        content: Optional[bytes],
+        call_deadline: Optional[Deadline],
+        stream_deadline: Optional[Deadline] = None
+    ) -> TransportResponse:
+        if call_deadline is not None and call_deadline.expired:
+            raise self._deadline_error(call_deadline, None)
+
+        connect_timeout, read_timeout = self._attempt_timeout(call_deadline)
+        if self.stream_idle_timeout is not None:
+            read_timeout = min(read_timeout, self.stream_idle_timeout)
+        if stream_deadline is not None:
+            read_timeout = stream_deadline.clamp(read_timeout)
+
+        max_wait = call_deadline.clamp(self.rate_limiter.max_wait) if call_deadline else None
+        self.rate_limiter.acquire(max_wait)
+        breaker = self._breaker_for(path)
+
+        try:
+            response = self.transport.request(
+                'POST',
                 url,
-                json=data,
                 headers=headers,
-                stream=True,
-                timeout=self.timeout
+                content=content,
+                timeout=(connect_timeout, read_timeout),
+                stream=True
             )
+        except TransportError:
+            self._record_outcome(breaker, None)
+            raise
+        except BaseException:
+            self._release_breaker(breaker)
+            raise
+
+        self._record_outcome(breaker, response.status_code)
+        self.rate_limiter.update_from_headers(response.headers)
+
+        if not response.ok:
+            with response:
+                error = self._handle_error_response(
+                    response.status_code,
+                    self._decode_response(response)
+                )
+            if isinstance(error, RateLimitError):
+                self._record_rate_limit(response, error)
+            raise error
 
-            if not response.ok:
-                try:
-                    error_data = response.json()
-                except requests.exceptions.JSONDecodeError:
-                    error_data = {'error': 'Invalid JSON response'}
-                raise self._handle_error_response(response.status_code, error_data)
-
-            complete_message = None
-
-            for line in response.iter_lines():
-                if line:
-                    decoded_line = line.decode('utf-8')
-                    if decoded_line.startswith('data: '):
-                        data_str = decoded_line[6:]
-                        if data_str == '[DONE]':
-                            return complete_message
-
-                        try:
-                            import json
-                            chunk_data = json.loads(data_str)
-
-                            if chunk_data.get('type') == 'complete':
-                                complete_message = chunk_data.get('message')
-
-                            on_chunk(chunk_data)
-                        except json.JSONDecodeError:
-                            pass
-
-            return complete_message
+        return response
 
-        except requests.exceptions.RequestException as e:
-            raise NetworkError(f"Stream request failed: {str(e)}", {'error': str(e)})
+    def stream(
+        self,
+        path: str,
+        data: Mapping[str, Any],
+        on_chunk: Callable[[StreamChunk], Any],
+        buffer_size: Optional[int] = None,
+        overflow: str = BLOCK
+    ) -> Optional[Dict[str, Any]]:
+        with self.open_stream(path, data, buffer_size, overflow) as stream:
+            for chunk in stream:
+                on_chunk(chunk)
+            return stream.complete_message
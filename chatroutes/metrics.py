@@ -0,0 +1,126 @@
+import bisect
+import time
+from typing import Any, Callable, Dict, List, Optional
+from .types import StreamChunk
+
+GAP_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+MetricsHook = Callable[['StreamStats'], Any]
+
+_metrics_hook: Optional[MetricsHook] = None
+
+
+def set_metrics_hook(hook: Optional[MetricsHook]) -> None:
+    """Install a process-wide hook called with the ``StreamStats`` of every finished stream."""
+    global _metrics_hook
+    _metrics_hook = hook
+
+
+def get_metrics_hook() -> Optional[MetricsHook]:
+    return _metrics_hook
+
+
+class StreamStats:
+    """Timing and volume of one streamed response.
+
+    All times are seconds since the request was started: ``connect_time`` when the
+    response headers arrived, ``time_to_first_byte`` for the first body bytes and
+    ``time_to_first_token`` for the first non-empty ``content`` chunk. Gaps between
+    consecutive chunks are counted in ``gap_histogram``, keyed by upper bound in
+    milliseconds (``'inf'`` for the overflow bucket).
+    """
+
+    def __init__(self, model: Optional[str] = None):
+        self.model = model
+        self.started_at = time.monotonic()
+        self.finished_at: Optional[float] = None
+        self.connect_time: Optional[float] = None
+        self.time_to_first_byte: Optional[float] = None
+        self.time_to_first_token: Optional[float] = None
+        self.chunks = 0
+        self.characters = 0
+        self.bytes_received = 0
+        self.max_gap: float = 0.0
+        self.gap_counts: List[int] = [0] * (len(GAP_BUCKETS_MS) + 1)
+        self.resumes = 0
+        self.parse_errors = 0
+        self.keep_alives = 0
+        self.completed = False
+        self._last_chunk_at: Optional[float] = None
+
+    def record_connect(self) -> None:
+        if self.connect_time is None:
+            self.connect_time = time.monotonic() - self.started_at
+
+    def record_bytes(self, size: int) -> None:
+        if self.time_to_first_byte is None:
+            self.time_to_first_byte = time.monotonic() - self.started_at
+        self.bytes_received += size
+
+    def record_chunk(self, chunk: StreamChunk) -> None:
+        now = time.monotonic()
+        self.chunks += 1
+
+        if self._last_chunk_at is not None:
+            gap = now - self._last_chunk_at
+            if gap > self.max_gap:
+                self.max_gap = gap
+            self.gap_counts[bisect.bisect_left(GAP_BUCKETS_MS, gap * 1000)] += 1
+        self._last_chunk_at = now
+
+        content = chunk.get('content')
+        if content:
+            if self.time_to_first_token is None:
+                self.time_to_first_token = now - self.started_at
+            self.characters += len(content)
+        if chunk.get('type') == 'complete':
+            self.completed = True
+        if self.model is None and chunk.get('model'):
+            self.model = chunk['model']
+
+    def finish(self) -> None:
+        if self.finished_at is None:
+            self.finished_at = time.monotonic()
+
+    @property
+    def duration(self) -> float:
+        end = self.finished_at if self.finished_at is not None else time.monotonic()
+        return end - self.started_at
+
+    @property
+    def chunks_per_second(self) -> float:
+        duration = self.duration
+        return self.chunks / duration if duration > 0 else 0.0
+
+    @property
+    def characters_per_second(self) -> float:
+        """Generation throughput, measured from the first token to the end of the stream."""
+        if self.time_to_first_token is None:
+            return 0.0
+        generating = self.duration - self.time_to_first_token
+        return self.characters / generating if generating > 0 else 0.0
+
+    @property
+    def gap_histogram(self) -> Dict[str, int]:
+        labels = [str(bound) for bound in GAP_BUCKETS_MS] + ['inf']
+        return dict(zip(labels, self.gap_counts))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'model': self.model,
+            'connectTime': self.connect_time,
+            'timeToFirstByte': self.time_to_first_byte,
+            'timeToFirstToken': self.time_to_first_token,
+            'duration': self.duration,
+            'chunks': self.chunks,
+            'characters': self.characters,
+            'bytesReceived': self.bytes_received,
+            'chunksPerSecond': self.chunks_per_second,
+            'charactersPerSecond': self.characters_per_second,
+            'maxGap': self.max_gap,
+            'gapHistogram': self.gap_histogram,
+            'resumes': self.resumes,
+            'parseErrors': self.parse_errors,
+            'keepAlives': self.keep_alives,
+            'completed': self.completed
+        }
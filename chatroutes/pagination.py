@@ -0,0 +1,264 @@
+import contextvars
+import math
+import queue
+import threading
+import time
+import weakref
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from types import TracebackType
+from typing import Any, Callable, Deque, Generator, Iterator, Optional, Tuple, Type
+from .exceptions import DeadlineExceededError, NetworkError, RateLimitError, ServerError
+from .types import PaginatedResponse
+
+FetchPage = Callable[[int], PaginatedResponse]
+ProgressCallback = Callable[[int, int], Any]
+
+RETRYABLE_PAGE_ERRORS = (NetworkError, ServerError, RateLimitError)
+
+_END = object()
+
+
+def has_more(page: PaginatedResponse) -> bool:
+    """Whether another page follows ``page``, from ``hasNext`` or ``total``/``limit``."""
+    if not page.get('data'):
+        return False
+    if page.get('hasNext'):
+        return True
+    return page.get('page', 1) * page.get('limit', 0) < page.get('total', 0)
+
+
+def _put(pages: 'queue.Queue[Any]', stopped: threading.Event, item: Any) -> bool:
+    while not stopped.is_set():
+        try:
+            pages.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _prefetch(
+    fetch_page: FetchPage,
+    page_number: int,
+    pages: 'queue.Queue[Any]',
+    stopped: threading.Event
+) -> None:
+    while not stopped.is_set():
+        try:
+            page = fetch_page(page_number)
+        except Exception as e:
+            _put(pages, stopped, e)
+            return
+        if not _put(pages, stopped, page) or not has_more(page):
+            break
+        page_number += 1
+    _put(pages, stopped, _END)
+
+
+class PageIterator:
+    """Iterates over every item of a paginated listing.
+
+    ``fetch_page`` is called with page numbers starting at ``start_page`` until a page
+    reports no successor (see ``has_more``). With ``prefetch`` > 0 pages are fetched on a
+    background thread up to ``prefetch`` pages ahead of the consumer, so the next request
+    overlaps with processing the current page; ``prefetch=0`` fetches inline. A failed
+    fetch is raised from iteration once the pages before it have been consumed. The
+    reader stops on ``close()`` or once the iterator is garbage collected, so breaking
+    out of a plain ``for`` loop does not leave it running.
+    """
+
+    def __init__(self, fetch_page: FetchPage, start_page: int = 1, prefetch: int = 1):
+        if prefetch < 0:
+            raise ValueError("prefetch must be 0 or more")
+
+        self.prefetch = prefetch
+        self.pages_fetched = 0
+        self.total: Optional[int] = None
+        self._fetch_page = fetch_page
+        self._page = start_page
+        self._current: Iterator[Any] = iter(())
+        self._done = False
+        self._stopped = threading.Event()
+        self._queue: 'queue.Queue[Any]' = queue.Queue(maxsize=prefetch or 1)
+        self._reader: Optional[threading.Thread] = None
+
+        if prefetch:
+            context = contextvars.copy_context()
+            self._reader = threading.Thread(
+                target=context.run,
+                args=(_prefetch, fetch_page, start_page, self._queue, self._stopped),
+                name='chatroutes-page-prefetch',
+                daemon=True
+            )
+            weakref.finalize(self, self._stopped.set)
+            self._reader.start()
+
+    def _next_page(self) -> Any:
+        if self._reader is not None:
+            return self._queue.get()
+
+        page = self._fetch_page(self._page)
+        self._page += 1
+        if not has_more(page):
+            self._done = True
+        return page
+
+    def __iter__(self) -> 'PageIterator':
+        return self
+
+    def __next__(self) -> Any:
+        while True:
+            for item in self._current:
+                return item
+            if self._done:
+                raise StopIteration
+
+            page = self._next_page()
+            if page is _END:
+                self._done = True
+                raise StopIteration
+            if isinstance(page, BaseException):
+                self.close()
+                raise page
+
+            self.pages_fetched += 1
+            self.total = page.get('total', self.total)
+            self._current = iter(page.get('data', []))
+
+    def close(self) -> None:
+        """Stop prefetching; safe to call before iteration has finished."""
+        self._done = True
+        self._current = iter(())
+        self._stopped.set()
+
+    def __enter__(self) -> 'PageIterator':
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType]
+    ) -> None:
+        self.close()
+
+
+class ParallelPageIterator:
+    """Iterates over every item of a paginated listing, fetching pages concurrently.
+
+    The first page is fetched inline; its ``total`` and ``limit`` give the number of
+    remaining pages, which are fetched by up to ``concurrency`` workers while items are
+    still yielded in page order. At most ``2 * concurrency`` pages are held ahead of the
+    consumer. A page failing with one of ``retry_on`` (by default network, server and
+    rate-limit errors) is retried up to ``page_retries`` times, waiting the error's
+    ``retry_after`` when it has one and ``backoff(attempt)`` seconds otherwise.
+    ``on_progress(pages_done, pages_total)`` is called from the consuming thread after
+    each page; ``pages_total`` grows if the listing grows while it is being read.
+    """
+
+    def __init__(
+        self,
+        fetch_page: FetchPage,
+        concurrency: int = 4,
+        page_retries: int = 2,
+        backoff: Optional[Callable[[int], float]] = None,
+        on_progress: Optional[ProgressCallback] = None,
+        retry_on: Tuple[Type[Exception], ...] = RETRYABLE_PAGE_ERRORS
+    ):
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        self.concurrency = concurrency
+        self.page_retries = page_retries
+        self.retry_on = retry_on
+        self.pages_fetched = 0
+        self.pages_total = 0
+        self.total: Optional[int] = None
+        self._fetch_page = fetch_page
+        self._backoff = backoff or (lambda attempt: 0.0)
+        self._on_progress = on_progress
+        self._items = self._iter_items()
+        self._stopped = threading.Event()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _fetch(self, page_number: int) -> PaginatedResponse:
+        attempt = 0
+        while True:
+            try:
+                return self._fetch_page(page_number)
+            except DeadlineExceededError:
+                raise
+            except self.retry_on as e:
+                if attempt >= self.page_retries or self._stopped.is_set():
+                    raise
+                retry_after = getattr(e, 'retry_after', None)
+                time.sleep(retry_after if retry_after is not None else self._backoff(attempt))
+                attempt += 1
+
+    def _page_count(self, page: PaginatedResponse) -> int:
+        limit = page.get('limit') or len(page.get('data', [])) or 1
+        return max(page.get('page', 1), math.ceil(page.get('total', 0) / limit))
+
+    def _iter_items(self) -> Generator[Any, None, None]:
+        first = self._fetch(1)
+        pending: Deque[Tuple[int, Future]] = deque()
+        next_page = 2
+        last_page = self._page_count(first) if has_more(first) else 1
+        page = first
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.concurrency,
+            thread_name_prefix='chatroutes-page'
+        )
+        try:
+            while True:
+                self.pages_fetched += 1
+                self.total = page.get('total', self.total)
+                self.pages_total = max(last_page, self.pages_fetched)
+                if self._on_progress is not None:
+                    self._on_progress(self.pages_fetched, self.pages_total)
+                yield from page.get('data', [])
+
+                if not has_more(page):
+                    return
+                if not pending and next_page > last_page:
+                    last_page = next_page
+
+                while next_page <= last_page and len(pending) < 2 * self.concurrency:
+                    context = contextvars.copy_context()
+                    pending.append((next_page, self._executor.submit(context.run, self._fetch, next_page)))
+                    next_page += 1
+
+                _, future = pending.popleft()
+                page = future.result()
+                if not page.get('data'):
+                    return
+                if has_more(page):
+                    last_page = max(last_page, self._page_count(page))
+        finally:
+            for _, future in pending:
+                future.cancel()
+            self._executor.shutdown(wait=False)
+
+    def __iter__(self) -> 'ParallelPageIterator':
+        return self
+
+    def __next__(self) -> Any:
+        return next(self._items)
+
+    def close(self) -> None:
+        """Stop fetching; pages already requested are discarded."""
+        self._stopped.set()
+        self._items.close()
+
+    def __enter__(self) -> 'ParallelPageIterator':
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType]
+    ) -> None:
+        self.close()
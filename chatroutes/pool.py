@@ -0,0 +1,91 @@
+import socket
+import threading
+import time
+from http.cookiejar import DefaultCookiePolicy
+from types import TracebackType
+from typing import Any, Optional, Type
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+
+
+class _PoolAdapter(HTTPAdapter):
+    def __init__(self, tcp_keepalive: bool = True, **kwargs: Any) -> None:
+        self._tcp_keepalive = tcp_keepalive
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        if self._tcp_keepalive:
+            kwargs['socket_options'] = HTTPConnection.default_socket_options + [
+                (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            ]
+        super().init_poolmanager(*args, **kwargs)
+
+
+class ConnectionPool:
+    """Thread-safe pool of keep-alive HTTP connections.
+
+    One pool can be passed to several ``ChatRoutes`` clients (``pool=...``) so they
+    share sockets. Per-client state such as the API key is never stored on the pool,
+    and cookies are refused so nothing set for one client is replayed for another.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        idle_timeout: Optional[float] = None
+    ):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self.idle_timeout = idle_timeout
+
+        self.session = requests.Session()
+        self.session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        self._adapter = _PoolAdapter(
+            tcp_keepalive=keep_alive,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            max_retries=0
+        )
+        self.session.mount('https://', self._adapter)
+        self.session.mount('http://', self._adapter)
+        if not keep_alive:
+            self.session.headers['Connection'] = 'close'
+
+        self._lock = threading.Lock()
+        self._last_used = time.monotonic()
+        self._closed = False
+
+    def acquire(self) -> requests.Session:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("ConnectionPool is closed")
+
+            now = time.monotonic()
+            if self.idle_timeout is not None and now - self._last_used > self.idle_timeout:
+                self._adapter.poolmanager.clear()
+            self._last_used = now
+
+        return self.session
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            self.session.close()
+
+    def __enter__(self) -> 'ConnectionPool':
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType]
+    ) -> None:
+        self.close()
@@ -0,0 +1,147 @@
+import email.utils
+import threading
+import time
+from typing import Mapping, Optional
+from .exceptions import RateLimitError
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def _header(headers: Mapping[str, str], *names: str) -> Optional[str]:
+    for name in names:
+        value = headers.get(name)
+        if value is not None:
+            return value
+    return None
+
+
+class RateLimiter:
+    """Token-bucket limiter shared by every request a client makes.
+
+    ``rate`` is the number of requests per second (``None`` means no fixed pace).
+    All callers are paused when the server reports an exhausted quota
+    (``X-RateLimit-Remaining: 0``) or answers 429, until ``retry_after`` elapses.
+    With ``learn_from_headers`` (on by default when ``rate`` is set) the pace also
+    follows ``remaining / reset`` from the ``X-RateLimit-*``/``RateLimit-*`` headers;
+    without a fixed ``rate`` the bucket then holds up to ``remaining`` requests.
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: Optional[int] = None,
+        max_wait: float = 60.0,
+        learn_from_headers: Optional[bool] = None
+    ):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate or 1))
+        self.max_wait = max_wait
+        self.learn_from_headers = learn_from_headers if learn_from_headers is not None else rate is not None
+
+        self._lock = threading.Lock()
+        self._current_rate = rate
+        self._capacity = float(self.burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+
+    @property
+    def current_rate(self) -> Optional[float]:
+        return self._current_rate
+
+    def _refill(self, now: float) -> None:
+        if self._current_rate is not None:
+            elapsed = now - self._updated
+            self._tokens = min(self._capacity, self._tokens + elapsed * self._current_rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            delay = max(0.0, self._paused_until - now)
+
+            if self._current_rate is not None:
+                self._tokens -= 1
+                if self._tokens < 0:
+                    delay = max(delay, -self._tokens / self._current_rate)
+
+            return delay
+
+    def _release(self) -> None:
+        with self._lock:
+            if self._current_rate is not None:
+                self._tokens += 1
+
+    def acquire(self, max_wait: Optional[float] = None) -> float:
+        delay = self.reserve()
+        limit = self.max_wait if max_wait is None else max_wait
+
+        if delay > limit:
+            self._release()
+            raise RateLimitError(
+                f"Client-side rate limit would delay this request by {delay:.1f}s",
+                retry_after=int(delay + 0.999)
+            )
+
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        remaining = _header(headers, 'X-RateLimit-Remaining', 'RateLimit-Remaining')
+        reset = _header(headers, 'X-RateLimit-Reset', 'RateLimit-Reset')
+        if remaining is None:
+            return
+
+        try:
+            remaining_count = max(0, int(float(remaining)))
+            reset_in = float(reset) if reset is not None else None
+        except ValueError:
+            return
+
+        if reset_in is not None and reset_in > 1e9:
+            reset_in = max(0.0, reset_in - time.time())
+
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if reset_in is None:
+                return
+            if remaining_count == 0:
+                self._paused_until = max(self._paused_until, now + reset_in)
+            elif reset_in > 0 and self.learn_from_headers:
+                learned = remaining_count / reset_in
+                if self.rate is not None:
+                    learned = min(learned, self.rate)
+                    self._tokens = min(self._tokens, float(remaining_count))
+                else:
+                    self._capacity = float(remaining_count)
+                    self._tokens = float(remaining_count)
+                self._current_rate = learned
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.rate is not None and self._current_rate is not None and self._current_rate < self.rate:
+                self._current_rate = min(self.rate, self._current_rate + self.rate * 0.05)
+
+    def on_rate_limited(self, retry_after: Optional[float]) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._paused_until = max(self._paused_until, now + (retry_after or 1.0))
+            self._tokens = min(self._tokens, 0.0)
+            if self._current_rate is not None:
+                self._current_rate = max(self._current_rate / 2, 0.01)
@@ -1,13 +1,18 @@
-from .conversations import ConversationsResource
-from .messages import MessagesResource
-from .branches import BranchesResource
-from .checkpoints import CheckpointsResource
-from .autobranch import AutoBranchResource
+from .conversations import ConversationsResource, AsyncConversationsResource
+from .messages import MessagesResource, AsyncMessagesResource
+from .branches import BranchesResource, AsyncBranchesResource
+from .checkpoints import CheckpointsResource, AsyncCheckpointsResource
+from .autobranch import AutoBranchResource, AsyncAutoBranchResource
 
 __all__ = [
     'ConversationsResource',
     'MessagesResource',
     'BranchesResource',
     'CheckpointsResource',
-    'AutoBranchResource'
+    'AutoBranchResource',
+    'AsyncConversationsResource',
+    'AsyncMessagesResource',
+    'AsyncBranchesResource',
+    'AsyncCheckpointsResource',
+    'AsyncAutoBranchResource'
 ]
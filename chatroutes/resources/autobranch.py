@@ -7,6 +7,7 @@ from ..types.autobranch import (
 
 if TYPE_CHECKING:
     from ..client import ChatRoutes
+    from ..async_client import AsyncChatRoutes
 
 
 class AutoBranchResource:
@@ -38,7 +39,8 @@ class AutoBranchResource:
             data['llmApiKey'] = llm_api_key
 
         response = self._client._http.post('/autobranch/suggest-branches', data)
-        return response.get('data', response)
+        result: SuggestBranchesResponse = response.get('data', response)
+        return result
 
     def analyze_text(
         self,
@@ -58,4 +60,59 @@ class AutoBranchResource:
 
     def health(self) -> HealthResponse:
         response = self._client._http.get('/autobranch/health')
-        return response.get('data', response)
+        health: HealthResponse = response.get('data', response)
+        return health
+
+
+class AsyncAutoBranchResource:
+    def __init__(self, client: 'AsyncChatRoutes', autobranch_base_url: Optional[str] = None):
+        self._client = client
+
+    async def suggest_branches(
+        self,
+        text: str,
+        suggestions_count: int = 3,
+        hybrid_detection: bool = False,
+        threshold: float = 0.7,
+        llm_model: Optional[str] = None,
+        llm_provider: Optional[str] = None,
+        llm_api_key: Optional[str] = None
+    ) -> SuggestBranchesResponse:
+        data: SuggestBranchesRequest = {
+            'text': text,
+            'suggestionsCount': suggestions_count,
+            'hybridDetection': hybrid_detection,
+            'threshold': threshold
+        }
+
+        if llm_model:
+            data['llmModel'] = llm_model
+        if llm_provider:
+            data['llmProvider'] = llm_provider
+        if llm_api_key:
+            data['llmApiKey'] = llm_api_key
+
+        response = await self._client._http.post('/autobranch/suggest-branches', data)
+        result: SuggestBranchesResponse = response.get('data', response)
+        return result
+
+    async def analyze_text(
+        self,
+        text: str,
+        suggestions_count: int = 3,
+        hybrid_detection: bool = False,
+        threshold: float = 0.7,
+        llm_model: Optional[str] = None
+    ) -> SuggestBranchesResponse:
+        return await self.suggest_branches(
+            text=text,
+            suggestions_count=suggestions_count,
+            hybrid_detection=hybrid_detection,
+            threshold=threshold,
+            llm_model=llm_model
+        )
+
+    async def health(self) -> HealthResponse:
+        response = await self._client._http.get('/autobranch/health')
+        health: HealthResponse = response.get('data', response)
+        return health
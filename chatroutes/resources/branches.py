@@ -1,13 +1,22 @@
-from typing import TYPE_CHECKING, List, Dict, Any
+import functools
+import time
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Literal, Optional, Sequence
 from ..types import (
     Branch,
+    BranchFanOutResult,
     CreateBranchRequest,
     ForkConversationRequest,
-    Message
+    Message,
+    SendMessageRequest
 )
+from ..fanout import StreamFanOut, WinnerCheck
+from ..buffering import BLOCK, ChunkStream
+from ..batch import delete_all, run_batch
+from ..pagination import ProgressCallback
 
 if TYPE_CHECKING:
     from ..client import ChatRoutes
+    from ..async_client import AsyncChatRoutes
 
 
 class BranchesResource:
@@ -16,42 +25,214 @@ class BranchesResource:
 
     def list(self, conversation_id: str) -> List[Branch]:
         response = self._client._http.get(f'/conversations/{conversation_id}/branches')
-        return response.get('data', {}).get('branches', response.get('branches', []))
+        branches: List[Branch] = response.get('data', {}).get(
+            'branches',
+            response.get('branches', [])
+        )
+        return branches
 
     def create(self, conversation_id: str, data: CreateBranchRequest) -> Branch:
         response = self._client._http.post(f'/conversations/{conversation_id}/branches', data)
-        return response.get('data', {}).get('branch', response)
+        branch: Branch = response.get('data', {}).get('branch', response)
+        return branch
 
     def fork(self, conversation_id: str, data: ForkConversationRequest) -> Branch:
         response = self._client._http.post(f'/conversations/{conversation_id}/fork', data)
-        return response.get('data', {}).get('branch', response)
+        branch: Branch = response.get('data', {}).get('branch', response)
+        return branch
 
     def update(self, conversation_id: str, branch_id: str, data: Dict[str, Any]) -> Branch:
         response = self._client._http.patch(
             f'/conversations/{conversation_id}/branches/{branch_id}',
             data
         )
-        return response.get('data', {}).get('branch', response)
+        branch: Branch = response.get('data', {}).get('branch', response)
+        return branch
 
     def delete(self, conversation_id: str, branch_id: str) -> None:
         self._client._http.delete(f'/conversations/{conversation_id}/branches/{branch_id}')
 
+    def delete_many(
+        self,
+        conversation_id: str,
+        branch_ids: Iterable[str],
+        concurrency: int = 4,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> Dict[str, Any]:
+        return delete_all(
+            functools.partial(self.delete, conversation_id),
+            branch_ids,
+            concurrency,
+            on_progress
+        )
+
     def get_messages(self, conversation_id: str, branch_id: str) -> List[Message]:
         response = self._client._http.get(
             f'/conversations/{conversation_id}/branches/{branch_id}/messages'
         )
-        return response.get('data', {}).get('messages', response.get('messages', []))
+        messages: List[Message] = response.get('data', {}).get(
+            'messages',
+            response.get('messages', [])
+        )
+        return messages
 
     def send_message(self, conversation_id: str, branch_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
         response = self._client._http.post(
             f'/conversations/{conversation_id}/branches/{branch_id}/messages',
             data
         )
-        return response.get('data', response)
+        result: Dict[str, Any] = response.get('data', response)
+        return result
+
+    def send_message_iter(
+        self,
+        conversation_id: str,
+        branch_id: str,
+        data: SendMessageRequest,
+        buffer_size: Optional[int] = None,
+        overflow: str = BLOCK
+    ) -> ChunkStream:
+        return self._client._http.open_stream(
+            f'/conversations/{conversation_id}/messages/stream',
+            {**data, 'branchId': branch_id},
+            buffer_size,
+            overflow
+        )
+
+    def stream_branches(
+        self,
+        conversation_id: str,
+        branch_ids: Iterable[str],
+        data: SendMessageRequest,
+        pick_winner: Optional[WinnerCheck] = None
+    ) -> StreamFanOut:
+        return StreamFanOut(
+            {
+                branch_id: functools.partial(self.send_message_iter, conversation_id, branch_id, data)
+                for branch_id in branch_ids
+            },
+            pick_winner
+        )
+
+    def fan_out(
+        self,
+        conversation_id: str,
+        base_node_id: str,
+        prompts: Sequence[str],
+        context_mode: Literal['FULL', 'PARTIAL', 'MINIMAL'] = 'FULL',
+        titles: Optional[Sequence[str]] = None,
+        concurrency: int = 4
+    ) -> List[BranchFanOutResult]:
+        results = self.fan_out_iter(
+            conversation_id, base_node_id, prompts, context_mode, titles, concurrency
+        )
+        return sorted(results, key=lambda result: result['index'])
+
+    def fan_out_iter(
+        self,
+        conversation_id: str,
+        base_node_id: str,
+        prompts: Sequence[str],
+        context_mode: Literal['FULL', 'PARTIAL', 'MINIMAL'] = 'FULL',
+        titles: Optional[Sequence[str]] = None,
+        concurrency: int = 4
+    ) -> Iterator[BranchFanOutResult]:
+        def explore(item: Any) -> BranchFanOutResult:
+            index, prompt = item
+            result: BranchFanOutResult = {
+                'index': index,
+                'prompt': prompt,
+                'branch': None,
+                'response': None,
+                'error': None,
+                'latency': 0.0
+            }
+            started = time.monotonic()
+            try:
+                branch = self.create(conversation_id, {
+                    'title': titles[index] if titles is not None else f'Alternative {index + 1}',
+                    'baseNodeId': base_node_id,
+                    'contextMode': context_mode
+                })
+                result['branch'] = branch
+                result['response'] = self.send_message(conversation_id, branch['id'], {'content': prompt})
+            except Exception as e:
+                result['error'] = e
+            result['latency'] = time.monotonic() - started
+            return result
+
+        for batch_result in run_batch(explore, enumerate(prompts), concurrency):
+            yield batch_result.value
 
     def merge(self, conversation_id: str, branch_id: str) -> Branch:
         response = self._client._http.post(
             f'/conversations/{conversation_id}/branches/{branch_id}/merge',
             {}
         )
-        return response.get('data', {}).get('branch', response)
+        branch: Branch = response.get('data', {}).get('branch', response)
+        return branch
+
+
+class AsyncBranchesResource:
+    def __init__(self, client: 'AsyncChatRoutes'):
+        self._client = client
+
+    async def list(self, conversation_id: str) -> List[Branch]:
+        response = await self._client._http.get(f'/conversations/{conversation_id}/branches')
+        branches: List[Branch] = response.get('data', {}).get(
+            'branches',
+            response.get('branches', [])
+        )
+        return branches
+
+    async def create(self, conversation_id: str, data: CreateBranchRequest) -> Branch:
+        response = await self._client._http.post(f'/conversations/{conversation_id}/branches', data)
+        branch: Branch = response.get('data', {}).get('branch', response)
+        return branch
+
+    async def fork(self, conversation_id: str, data: ForkConversationRequest) -> Branch:
+        response = await self._client._http.post(f'/conversations/{conversation_id}/fork', data)
+        branch: Branch = response.get('data', {}).get('branch', response)
+        return branch
+
+    async def update(self, conversation_id: str, branch_id: str, data: Dict[str, Any]) -> Branch:
+        response = await self._client._http.patch(
+            f'/conversations/{conversation_id}/branches/{branch_id}',
+            data
+        )
+        branch: Branch = response.get('data', {}).get('branch', response)
+        return branch
+
+    async def delete(self, conversation_id: str, branch_id: str) -> None:
+        await self._client._http.delete(f'/conversations/{conversation_id}/branches/{branch_id}')
+
+    async def get_messages(self, conversation_id: str, branch_id: str) -> List[Message]:
+        response = await self._client._http.get(
+            f'/conversations/{conversation_id}/branches/{branch_id}/messages'
+        )
+        messages: List[Message] = response.get('data', {}).get(
+            'messages',
+            response.get('messages', [])
+        )
+        return messages
+
+    async def send_message(
+        self,
+        conversation_id: str,
+        branch_id: str,
+        data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        response = await self._client._http.post(
+            f'/conversations/{conversation_id}/branches/{branch_id}/messages',
+            data
+        )
+        result: Dict[str, Any] = response.get('data', response)
+        return result
+
+    async def merge(self, conversation_id: str, branch_id: str) -> Branch:
+        response = await self._client._http.post(
+            f'/conversations/{conversation_id}/branches/{branch_id}/merge',
+            {}
+        )
+        branch: Branch = response.get('data', {}).get('branch', response)
+        return branch
@@ -1,8 +1,11 @@
-from typing import TYPE_CHECKING, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional
 from ..types import Checkpoint, CheckpointCreateRequest
+from ..batch import delete_all
+from ..pagination import ProgressCallback
 
 if TYPE_CHECKING:
     from ..client import ChatRoutes
+    from ..async_client import AsyncChatRoutes
 
 
 class CheckpointsResource:
@@ -18,7 +21,11 @@ class CheckpointsResource:
             f'/conversations/{conversation_id}/checkpoints',
             params=params
         )
-        return response.get('data', {}).get('checkpoints', response.get('checkpoints', []))
+        checkpoints: List[Checkpoint] = response.get('data', {}).get(
+            'checkpoints',
+            response.get('checkpoints', [])
+        )
+        return checkpoints
 
     def create(self, conversation_id: str, branch_id: str, anchor_message_id: str) -> Checkpoint:
         data: CheckpointCreateRequest = {
@@ -30,11 +37,62 @@ class CheckpointsResource:
             f'/conversations/{conversation_id}/checkpoints',
             data
         )
-        return response.get('data', {}).get('checkpoint', response)
+        checkpoint: Checkpoint = response.get('data', {}).get('checkpoint', response)
+        return checkpoint
 
     def delete(self, checkpoint_id: str) -> None:
         self._client._http.delete(f'/checkpoints/{checkpoint_id}')
 
+    def delete_many(
+        self,
+        checkpoint_ids: Iterable[str],
+        concurrency: int = 4,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> Dict[str, Any]:
+        return delete_all(self.delete, checkpoint_ids, concurrency, on_progress)
+
     def recreate(self, checkpoint_id: str) -> Checkpoint:
         response = self._client._http.post(f'/checkpoints/{checkpoint_id}/recreate', {})
-        return response.get('data', {}).get('checkpoint', response)
+        checkpoint: Checkpoint = response.get('data', {}).get('checkpoint', response)
+        return checkpoint
+
+
+class AsyncCheckpointsResource:
+    def __init__(self, client: 'AsyncChatRoutes'):
+        self._client = client
+
+    async def list(self, conversation_id: str, branch_id: Optional[str] = None) -> List[Checkpoint]:
+        params = {}
+        if branch_id:
+            params['branchId'] = branch_id
+
+        response = await self._client._http.get(
+            f'/conversations/{conversation_id}/checkpoints',
+            params=params
+        )
+        checkpoints: List[Checkpoint] = response.get('data', {}).get(
+            'checkpoints',
+            response.get('checkpoints', [])
+        )
+        return checkpoints
+
+    async def create(self, conversation_id: str, branch_id: str, anchor_message_id: str) -> Checkpoint:
+        data: CheckpointCreateRequest = {
+            'branchId': branch_id,
+            'anchorMessageId': anchor_message_id
+        }
+
+        response = await self._client._http.post(
+            f'/conversations/{conversation_id}/checkpoints',
+            data
+        )
+        checkpoint: Checkpoint = response.get('data', {}).get('checkpoint', response)
+        return checkpoint
+
+    async def delete(self, checkpoint_id: str) -> None:
+        await self._client._http.delete(f'/checkpoints/{checkpoint_id}')
+
+    async def recreate(self, checkpoint_id: str) -> Checkpoint:
+        response = await self._client._http.post(f'/checkpoints/{checkpoint_id}/recreate', {})
+        checkpoint: Checkpoint = response.get('data', {}).get('checkpoint', response)
+        return checkpoint
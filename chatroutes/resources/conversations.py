@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING, Optional, Dict, Any
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Literal, Optional
 from ..types import (
     Conversation,
     CreateConversationRequest,
@@ -6,9 +6,19 @@ from ..types import (
     PaginatedResponse,
     ConversationTree
 )
+from ..exceptions import RateLimitError
+from ..pagination import (
+    RETRYABLE_PAGE_ERRORS,
+    PageIterator,
+    ParallelPageIterator,
+    ProgressCallback
+)
+from ..archive import ConversationExporter, ConversationImporter
+from ..batch import delete_all
 
 if TYPE_CHECKING:
     from ..client import ChatRoutes
+    from ..async_client import AsyncChatRoutes
 
 
 class ConversationsResource:
@@ -17,7 +27,8 @@ class ConversationsResource:
 
     def create(self, data: CreateConversationRequest) -> Conversation:
         response = self._client._http.post('/conversations', data)
-        return response.get('data', {}).get('conversation', response)
+        conversation: Conversation = response.get('data', {}).get('conversation', response)
+        return conversation
 
     def list(self, params: Optional[ListConversationsParams] = None) -> PaginatedResponse:
         response = self._client._http.get('/conversations', params=params or {})
@@ -29,17 +40,130 @@ class ConversationsResource:
             'hasNext': response.get('hasNext', False)
         }
 
+    def iter_all(
+        self,
+        filter: Optional[Literal['all', 'owned', 'shared']] = None,
+        page_size: int = 50,
+        prefetch: int = 1
+    ) -> PageIterator:
+        params: ListConversationsParams = {'limit': page_size}
+        if filter is not None:
+            params['filter'] = filter
+        return PageIterator(lambda page: self.list({**params, 'page': page}), prefetch=prefetch)
+
+    def iter_all_parallel(
+        self,
+        filter: Optional[Literal['all', 'owned', 'shared']] = None,
+        page_size: int = 50,
+        concurrency: int = 4,
+        page_retries: int = 2,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> ParallelPageIterator:
+        params: ListConversationsParams = {'limit': page_size}
+        if filter is not None:
+            params['filter'] = filter
+        retry_policy = self._client._http.retry_policy
+        return ParallelPageIterator(
+            lambda page: self.list({**params, 'page': page}),
+            concurrency=concurrency,
+            page_retries=page_retries,
+            backoff=retry_policy.backoff,
+            on_progress=on_progress,
+            retry_on=(RateLimitError,) if retry_policy.max_retries else RETRYABLE_PAGE_ERRORS
+        )
+
+    def export(
+        self,
+        path: str,
+        cursor_path: Optional[str] = None,
+        compress: Optional[bool] = None,
+        concurrency: int = 4,
+        filter: Optional[Literal['all', 'owned', 'shared']] = None,
+        include_checkpoints: bool = True
+    ) -> Dict[str, Any]:
+        exporter = ConversationExporter(
+            self._client,
+            concurrency=concurrency,
+            filter=filter,
+            include_checkpoints=include_checkpoints
+        )
+        return exporter.export(path, cursor_path, compress)
+
+    def import_file(
+        self,
+        path: str,
+        journal_path: Optional[str] = None,
+        concurrency: int = 4
+    ) -> Dict[str, Any]:
+        return ConversationImporter(self._client, concurrency).import_file(path, journal_path)
+
     def get(self, conversation_id: str) -> Conversation:
         response = self._client._http.get(f'/conversations/{conversation_id}')
-        return response.get('data', {}).get('conversation', response)
+        conversation: Conversation = response.get('data', {}).get('conversation', response)
+        return conversation
 
     def update(self, conversation_id: str, data: Dict[str, Any]) -> Conversation:
         response = self._client._http.patch(f'/conversations/{conversation_id}', data)
-        return response.get('data', {}).get('conversation', response)
+        conversation: Conversation = response.get('data', {}).get('conversation', response)
+        return conversation
 
     def delete(self, conversation_id: str) -> None:
         self._client._http.delete(f'/conversations/{conversation_id}')
 
+    def delete_many(
+        self,
+        conversation_ids: Optional[Iterable[str]] = None,
+        where: Optional[Callable[[Conversation], bool]] = None,
+        filter: Optional[Literal['all', 'owned', 'shared']] = None,
+        concurrency: int = 4,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> Dict[str, Any]:
+        if conversation_ids is None:
+            if where is None:
+                raise ValueError("Pass conversation_ids or a where predicate")
+            with self.iter_all(filter) as conversations:
+                conversation_ids = [c['id'] for c in conversations if where(c)]
+        return delete_all(self.delete, conversation_ids, concurrency, on_progress)
+
     def get_tree(self, conversation_id: str) -> ConversationTree:
         response = self._client._http.get(f'/conversations/{conversation_id}/tree')
-        return response.get('data', response)
+        tree: ConversationTree = response.get('data', response)
+        return tree
+
+
+class AsyncConversationsResource:
+    def __init__(self, client: 'AsyncChatRoutes'):
+        self._client = client
+
+    async def create(self, data: CreateConversationRequest) -> Conversation:
+        response = await self._client._http.post('/conversations', data)
+        conversation: Conversation = response.get('data', {}).get('conversation', response)
+        return conversation
+
+    async def list(self, params: Optional[ListConversationsParams] = None) -> PaginatedResponse:
+        response = await self._client._http.get('/conversations', params=params or {})
+        return {
+            'data': response.get('conversations', []),
+            'total': response.get('total', 0),
+            'page': response.get('page', 1),
+            'limit': response.get('limit', 10),
+            'hasNext': response.get('hasNext', False)
+        }
+
+    async def get(self, conversation_id: str) -> Conversation:
+        response = await self._client._http.get(f'/conversations/{conversation_id}')
+        conversation: Conversation = response.get('data', {}).get('conversation', response)
+        return conversation
+
+    async def update(self, conversation_id: str, data: Dict[str, Any]) -> Conversation:
+        response = await self._client._http.patch(f'/conversations/{conversation_id}', data)
+        conversation: Conversation = response.get('data', {}).get('conversation', response)
+        return conversation
+
+    async def delete(self, conversation_id: str) -> None:
+        await self._client._http.delete(f'/conversations/{conversation_id}')
+
+    async def get_tree(self, conversation_id: str) -> ConversationTree:
+        response = await self._client._http.get(f'/conversations/{conversation_id}/tree')
+        tree: ConversationTree = response.get('data', response)
+        return tree
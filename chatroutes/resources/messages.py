@@ -1,13 +1,23 @@
-from typing import TYPE_CHECKING, List, Optional, Callable
+import functools
+import inspect
+from typing import IO, TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Callable, Tuple
 from ..types import (
     Message,
     SendMessageRequest,
     SendMessageResponse,
-    StreamChunk
+    StreamChunk,
+    StreamToResult
 )
+from ..metrics import StreamStats
+from ..fanout import StreamFanOut, WinnerCheck
+from ..buffering import BLOCK, ChunkStream
+from ..streaming import write_stream
+from ..batch import BatchResult, delete_all, run_batch, run_batch_ordered
+from ..pagination import ProgressCallback
 
 if TYPE_CHECKING:
     from ..client import ChatRoutes
+    from ..async_client import AsyncChatRoutes
 
 
 class MessagesResource:
@@ -16,26 +26,88 @@ class MessagesResource:
 
     def send(self, conversation_id: str, data: SendMessageRequest) -> SendMessageResponse:
         response = self._client._http.post(f'/conversations/{conversation_id}/messages', data)
-        return response.get('data', response)
+        result: SendMessageResponse = response.get('data', response)
+        return result
+
+    def send_many(
+        self,
+        items: Iterable[Tuple[str, SendMessageRequest]],
+        concurrency: int = 4
+    ) -> List[BatchResult]:
+        return run_batch_ordered(self._send_item, items, concurrency)
+
+    def send_many_iter(
+        self,
+        items: Iterable[Tuple[str, SendMessageRequest]],
+        concurrency: int = 4
+    ) -> Iterator[BatchResult]:
+        return run_batch(self._send_item, items, concurrency)
+
+    def _send_item(self, item: Tuple[str, SendMessageRequest]) -> SendMessageResponse:
+        conversation_id, data = item
+        return self.send(conversation_id, data)
 
     def stream(
         self,
         conversation_id: str,
         data: SendMessageRequest,
         on_chunk: Callable[[StreamChunk], None],
-        on_complete: Optional[Callable[[dict], None]] = None
-    ) -> None:
-        def handle_chunk(chunk: StreamChunk):
-            on_chunk(chunk)
+        on_complete: Optional[Callable[[dict], None]] = None,
+        buffer_size: Optional[int] = None,
+        overflow: str = BLOCK
+    ) -> Optional[StreamStats]:
+        with self.stream_iter(conversation_id, data, buffer_size, overflow) as stream:
+            for chunk in stream:
+                on_chunk(chunk)
 
-        complete_message = self._client._http.stream(
+        if on_complete and stream.complete_message:
+            on_complete(stream.complete_message)
+        return stream.stats
+
+    def stream_iter(
+        self,
+        conversation_id: str,
+        data: SendMessageRequest,
+        buffer_size: Optional[int] = None,
+        overflow: str = BLOCK
+    ) -> ChunkStream:
+        return self._client._http.open_stream(
             f'/conversations/{conversation_id}/messages/stream',
             data,
-            handle_chunk
+            buffer_size,
+            overflow
         )
 
-        if on_complete and complete_message:
-            on_complete(complete_message)
+    def stream_to(
+        self,
+        conversation_id: str,
+        data: SendMessageRequest,
+        sink: IO,
+        buffer_size: int = 8192,
+        encoding: str = 'utf-8'
+    ) -> StreamToResult:
+        stream = self._client._http.open_stream(
+            f'/conversations/{conversation_id}/messages/stream',
+            data,
+            keep_content=False
+        )
+        with stream:
+            return write_stream(stream, sink, buffer_size, encoding)
+
+    def stream_models(
+        self,
+        conversation_id: str,
+        data: SendMessageRequest,
+        models: Iterable[str],
+        pick_winner: Optional[WinnerCheck] = None
+    ) -> StreamFanOut:
+        return StreamFanOut(
+            {
+                model: functools.partial(self.stream_iter, conversation_id, {**data, 'model': model})
+                for model in models
+            },
+            pick_winner
+        )
 
     def list(self, conversation_id: str, branch_id: Optional[str] = None) -> List[Message]:
         params = {}
@@ -43,11 +115,75 @@ class MessagesResource:
             params['branchId'] = branch_id
 
         response = self._client._http.get(f'/conversations/{conversation_id}/messages', params=params)
-        return response.get('data', {}).get('messages', response.get('messages', []))
+        messages: List[Message] = response.get('data', {}).get(
+            'messages',
+            response.get('messages', [])
+        )
+        return messages
 
     def update(self, message_id: str, content: str) -> Message:
         response = self._client._http.patch(f'/messages/{message_id}', {'content': content})
-        return response.get('data', {}).get('message', response)
+        message: Message = response.get('data', {}).get('message', response)
+        return message
 
     def delete(self, message_id: str) -> None:
         self._client._http.delete(f'/messages/{message_id}')
+
+    def delete_many(
+        self,
+        message_ids: Iterable[str],
+        concurrency: int = 4,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> Dict[str, Any]:
+        return delete_all(self.delete, message_ids, concurrency, on_progress)
+
+
+class AsyncMessagesResource:
+    def __init__(self, client: 'AsyncChatRoutes'):
+        self._client = client
+
+    async def send(self, conversation_id: str, data: SendMessageRequest) -> SendMessageResponse:
+        response = await self._client._http.post(f'/conversations/{conversation_id}/messages', data)
+        result: SendMessageResponse = response.get('data', response)
+        return result
+
+    async def stream(
+        self,
+        conversation_id: str,
+        data: SendMessageRequest,
+        on_chunk: Callable[[StreamChunk], Any],
+        on_complete: Optional[Callable[[dict], Any]] = None
+    ) -> None:
+        complete_message = await self._client._http.stream(
+            f'/conversations/{conversation_id}/messages/stream',
+            data,
+            on_chunk
+        )
+
+        if on_complete and complete_message:
+            result = on_complete(complete_message)
+            if inspect.isawaitable(result):
+                await result
+
+    async def list(self, conversation_id: str, branch_id: Optional[str] = None) -> List[Message]:
+        params = {}
+        if branch_id:
+            params['branchId'] = branch_id
+
+        response = await self._client._http.get(
+            f'/conversations/{conversation_id}/messages',
+            params=params
+        )
+        messages: List[Message] = response.get('data', {}).get(
+            'messages',
+            response.get('messages', [])
+        )
+        return messages
+
+    async def update(self, message_id: str, content: str) -> Message:
+        response = await self._client._http.patch(f'/messages/{message_id}', {'content': content})
+        message: Message = response.get('data', {}).get('message', response)
+        return message
+
+    async def delete(self, message_id: str) -> None:
+        await self._client._http.delete(f'/messages/{message_id}')
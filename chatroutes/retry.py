@@ -0,0 +1,118 @@
+import random
+import threading
+import time
+import uuid
+from typing import Iterable, Optional
+
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+NON_IDEMPOTENT_METHODS = frozenset(['POST', 'PATCH'])
+
+
+def new_idempotency_key() -> str:
+    return str(uuid.uuid4())
+
+
+class RetryBudget:
+    """Caps retries to a fraction of recent traffic so outages can't snowball.
+
+    Every request deposits ``ratio`` tokens and every retry withdraws one. A small
+    ``min_per_second`` allowance keeps low-traffic clients able to retry.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_per_second: float = 1.0, max_tokens: float = 100.0):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+
+        self._lock = threading.Lock()
+        self._tokens = max_tokens
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._tokens = min(self.max_tokens, self._tokens + elapsed * self.min_per_second)
+        self._updated = now
+
+    def record_request(self) -> None:
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    @property
+    def available(self) -> float:
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
+
+
+DEFAULT_RETRY_BUDGET = RetryBudget()
+
+
+class RetryPolicy:
+    """Decides whether and when a failed request is retried.
+
+    Methods in ``retry_methods`` are always retryable. Other methods (POST, PATCH)
+    are retried only when they carry an idempotency key, which the client adds
+    automatically when ``idempotency_keys`` is enabled.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff_base: float = 1.0,
+        backoff_max: float = 30.0,
+        jitter: bool = True,
+        retry_methods: Iterable[str] = ('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'),
+        retry_statuses: Iterable[int] = (500, 502, 503, 504),
+        idempotency_keys: bool = True,
+        budget: Optional[RetryBudget] = None
+    ):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.retry_methods = frozenset(m.upper() for m in retry_methods)
+        self.retry_statuses = frozenset(retry_statuses)
+        self.idempotency_keys = idempotency_keys
+        self.budget = budget if budget is not None else DEFAULT_RETRY_BUDGET
+
+    def needs_idempotency_key(self, method: str) -> bool:
+        method = method.upper()
+        return (
+            self.idempotency_keys
+            and method in NON_IDEMPOTENT_METHODS
+            and method not in self.retry_methods
+        )
+
+    def is_retryable(self, method: str, has_idempotency_key: bool) -> bool:
+        return method.upper() in self.retry_methods or has_idempotency_key
+
+    def should_retry(
+        self,
+        method: str,
+        attempt: int,
+        has_idempotency_key: bool = False,
+        status_code: Optional[int] = None
+    ) -> bool:
+        if attempt >= self.max_retries:
+            return False
+        if status_code is not None and status_code not in self.retry_statuses:
+            return False
+        if not self.is_retryable(method, has_idempotency_key):
+            return False
+        return self.budget.try_acquire()
+
+    def backoff(self, attempt: int) -> float:
+        delay = min(self.backoff_max, self.backoff_base * (2.0 ** attempt))
+        if self.jitter:
+            return random.uniform(0, delay)
+        return delay
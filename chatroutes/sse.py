@@ -0,0 +1,128 @@
+from typing import Iterator, List, Optional, Union
+
+Data = Union[bytes, memoryview]
+
+
+class ServerSentEvent:
+    """One dispatched SSE event.
+
+    ``data`` is bytes-like: single-line events are a zero-copy ``memoryview`` into the
+    received chunk, multi-line events are joined with ``\\n`` as the spec requires.
+    ``id`` is the last event id in effect; ``explicit_id`` is true only when this
+    event's own block carried an ``id:`` field.
+    """
+
+    __slots__ = ('event', 'data', 'id', 'retry', 'explicit_id')
+
+    def __init__(
+        self,
+        event: str = 'message',
+        data: Data = b'',
+        id: Optional[str] = None,
+        retry: Optional[int] = None,
+        explicit_id: bool = False
+    ):
+        self.event = event
+        self.data = data
+        self.id = id
+        self.retry = retry
+        self.explicit_id = explicit_id
+
+    @property
+    def text(self) -> str:
+        return bytes(self.data).decode('utf-8')
+
+    def __repr__(self) -> str:
+        return f"ServerSentEvent(event={self.event!r}, data={bytes(self.data)!r}, id={self.id!r})"
+
+
+class SSEParser:
+    """Incremental ``text/event-stream`` parser that works on raw byte chunks.
+
+    Chunks may split lines and events at any byte; incomplete input is buffered until
+    the next ``feed()``. Handles ``data``, ``event``, ``id`` and ``retry`` fields, all
+    three line terminators and ``:`` comment lines (counted in ``comments``).
+    ``last_event_id`` and ``retry`` keep the most recent values seen, per the spec.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = b''
+        self._pending_cr = False
+        self._event = 'message'
+        self._data: List[Data] = []
+        self._retry: Optional[int] = None
+        self._explicit_id = False
+        self.last_event_id: Optional[str] = None
+        self.retry: Optional[int] = None
+        self.comments = 0
+
+    def feed(self, chunk: bytes) -> Iterator[ServerSentEvent]:
+        if self._pending_cr:
+            self._pending_cr = False
+            if chunk.startswith(b'\n'):
+                chunk = chunk[1:]
+        if b'\r' in chunk:
+            self._pending_cr = chunk.endswith(b'\r')
+            chunk = chunk.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+
+        if self._buffer:
+            chunk = self._buffer + chunk
+        lines = chunk.split(b'\n')
+        self._buffer = lines.pop()
+
+        for line in lines:
+            if not line:
+                event = self._dispatch()
+                if event is not None:
+                    yield event
+            else:
+                self._process_line(line)
+
+    def _process_line(self, line: bytes) -> None:
+        if line[0] == 0x3A:
+            self.comments += 1
+            return
+
+        colon = line.find(b':')
+        if colon == -1:
+            field, value = line, memoryview(b'')
+        else:
+            field = line[:colon]
+            start = colon + 2 if line[colon + 1:colon + 2] == b' ' else colon + 1
+            value = memoryview(line)[start:]
+
+        if field == b'data':
+            self._data.append(value)
+        elif field == b'event':
+            self._event = bytes(value).decode('utf-8', 'replace')
+        elif field == b'id':
+            raw = bytes(value)
+            if b'\0' not in raw:
+                self.last_event_id = raw.decode('utf-8', 'replace')
+                self._explicit_id = True
+        elif field == b'retry':
+            raw = bytes(value)
+            if raw.isdigit():
+                self.retry = self._retry = int(raw)
+
+    def _dispatch(self) -> Optional[ServerSentEvent]:
+        if not self._data:
+            self._reset()
+            return None
+
+        data = self._data[0] if len(self._data) == 1 else b'\n'.join(self._data)
+        event = ServerSentEvent(
+            self._event,
+            data,
+            self.last_event_id,
+            self._retry,
+            self._explicit_id
+        )
+        self._reset()
+        return event
+
+    def _reset(self) -> None:
+        self._event = 'message'
+        self._data = []
+        self._retry = None
+        self._explicit_id = False
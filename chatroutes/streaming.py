@@ -0,0 +1,330 @@
+import io
+import time
+from types import TracebackType
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Type
+)
+from .codec import JSONCodec
+from .deadline import Deadline
+from .exceptions import NetworkError, StreamStalledError
+from .metrics import StreamStats, get_metrics_hook
+from .sse import ServerSentEvent, SSEParser
+from .transport import TransportError, TransportResponse
+from .types import StreamChunk, StreamToResult
+
+ParseErrorHook = Callable[[Exception, ServerSentEvent], Any]
+Reconnect = Callable[[str, int, Optional[int]], TransportResponse]
+
+DONE = b'[DONE]'
+
+
+def decode_event(event: ServerSentEvent, codec: JSONCodec) -> StreamChunk:
+    """Decode one SSE event into a chunk; raises ValueError for malformed payloads."""
+    chunk: StreamChunk = codec.loads(event.data)
+    if not isinstance(chunk, dict):
+        raise ValueError(f"Expected a JSON object in SSE data, got {type(chunk).__name__}")
+    if event.event != 'message':
+        chunk.setdefault('type', event.event)
+    return chunk
+
+
+class MessageStream:
+    """Iterator over the chunks of one streamed response.
+
+    Use it as a context manager (or call ``close()``) so the HTTP connection is
+    released as soon as the consumer stops, even when iteration ends early.
+    ``complete_message`` holds the final message once the ``complete`` event arrives.
+    Events whose data is not a JSON object are counted in ``parse_errors`` and passed
+    to ``on_parse_error`` instead of being yielded.
+
+    If the connection drops after the server has sent an event ``id``, ``reconnect``
+    is called with the last id (up to ``max_resumes`` times) and iteration continues
+    on the new response. If the first event after a resume replays the one we resumed
+    from (its own ``id:`` field equals that id) it is skipped, so consumers never see
+    a chunk twice.
+
+    When ``stats`` is given it is filled in while reading, finished on ``close()`` and
+    passed to the global metrics hook.
+
+    ``idle_timeout`` bounds the time spent waiting for the next event (keep-alive
+    comments are counted in ``keep_alives`` but do not reset it) and ``stream_deadline``
+    bounds the whole stream. Either raises ``StreamStalledError`` carrying the content
+    received so far (unless ``keep_content`` is False, for consumers that already keep
+    it elsewhere); time the consumer spends between chunks is not counted as idle.
+    """
+
+    def __init__(
+        self,
+        response: TransportResponse,
+        codec: JSONCodec,
+        on_parse_error: Optional[ParseErrorHook] = None,
+        reconnect: Optional[Reconnect] = None,
+        max_resumes: int = 0,
+        stats: Optional[StreamStats] = None,
+        idle_timeout: Optional[float] = None,
+        stream_deadline: Optional[Deadline] = None,
+        keep_content: bool = True
+    ):
+        self._response = response
+        self._codec = codec
+        self._on_parse_error = on_parse_error
+        self._reconnect = reconnect
+        self._resume_id: Optional[str] = None
+        self._parser = SSEParser()
+        self._chunks = self._iter_chunks()
+        self._closed = False
+        self.complete_message: Optional[Dict[str, Any]] = None
+        self.parse_errors = 0
+        self.chunks = 0
+        self.last_event_id: Optional[str] = None
+        self.max_resumes = max_resumes
+        self.resumes = 0
+        self.stats = stats
+        self.cancelled = False
+        self.idle_timeout = idle_timeout
+        self.stream_deadline = stream_deadline
+        self._keep_alives = 0
+        self._watching = idle_timeout is not None or stream_deadline is not None
+        self._keep_content = keep_content and self._watching
+        self._content: List[str] = []
+        self._waiting_since = time.monotonic()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    @property
+    def keep_alives(self) -> int:
+        return self._keep_alives + self._parser.comments
+
+    @property
+    def partial_content(self) -> str:
+        return ''.join(self._content)
+
+    def _iter_chunks(self) -> Generator[StreamChunk, None, None]:
+        codec = self._codec
+        stats = self.stats
+        watching = self._watching
+        keep_content = self._keep_content
+
+        while True:
+            try:
+                for raw in self._response.iter_bytes():
+                    if self.cancelled:
+                        return
+                    if stats is not None:
+                        stats.record_bytes(len(raw))
+
+                    dispatched = False
+                    for event in self._parser.feed(raw):
+                        dispatched = True
+                        if self._resume_id is not None:
+                            if event.explicit_id and event.id == self._resume_id:
+                                continue
+                            self._resume_id = None
+                        if event.id is not None:
+                            self.last_event_id = event.id
+
+                        if event.data == DONE:
+                            return
+
+                        try:
+                            chunk = decode_event(event, codec)
+                        except ValueError as e:
+                            self._parse_error(e, event)
+                            continue
+
+                        if stats is not None:
+                            stats.record_chunk(chunk)
+                        self.chunks += 1
+                        if keep_content:
+                            content = chunk.get('content')
+                            if content:
+                                self._content.append(content)
+                        yield chunk
+                        self._waiting_since = time.monotonic()
+
+                    if watching:
+                        self._check_stall(idle=not dispatched)
+                return
+            except TransportError as e:
+                if self.cancelled:
+                    return
+                if watching:
+                    self._check_stall()
+                self._resume(e)
+            except Exception:
+                if self.cancelled:
+                    return
+                raise
+
+    def _check_stall(self, idle: bool = True) -> None:
+        if self.stream_deadline is not None and self.stream_deadline.expired:
+            self._stalled('deadline', self.stream_deadline.timeout)
+        if idle and self.idle_timeout is not None and time.monotonic() - self._waiting_since >= self.idle_timeout:
+            self._stalled('idle', self.idle_timeout)
+
+    def _stalled(self, reason: str, timeout: float) -> None:
+        raise StreamStalledError(
+            reason,
+            timeout,
+            self.partial_content,
+            self.chunks,
+            {'lastEventId': self.last_event_id, 'keepAlives': self.keep_alives}
+        )
+
+    def _resume(self, error: TransportError) -> None:
+        self._response.close()
+
+        while self._reconnect is not None and self.last_event_id is not None and self.resumes < self.max_resumes:
+            self.resumes += 1
+            try:
+                self._response = self._reconnect(self.last_event_id, self.resumes, self._parser.retry)
+            except TransportError as e:
+                error = e
+                continue
+
+            parser = SSEParser()
+            parser.retry = self._parser.retry
+            self._keep_alives += self._parser.comments
+            self._parser = parser
+            self._resume_id = self.last_event_id
+            return
+
+        raise NetworkError(f"Stream request failed: {str(error)}", {'error': str(error)})
+
+    def _parse_error(self, error: Exception, event: ServerSentEvent) -> None:
+        self.parse_errors += 1
+        if self._on_parse_error is not None:
+            self._on_parse_error(error, event)
+
+    def __iter__(self) -> 'MessageStream':
+        return self
+
+    def __next__(self) -> StreamChunk:
+        if self._closed:
+            raise StopIteration
+
+        try:
+            chunk = next(self._chunks)
+        except BaseException:
+            self.close()
+            raise
+
+        if chunk.get('type') == 'complete':
+            self.complete_message = chunk.get('message')
+        return chunk
+
+    def cancel(self) -> None:
+        """Abort the stream from any thread; a blocked reader stops without raising."""
+        self.cancelled = True
+        self._response.close()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._chunks.close()
+        self._response.close()
+
+        if self.stats is not None:
+            self.stats.resumes = self.resumes
+            self.stats.parse_errors = self.parse_errors
+            self.stats.keep_alives = self.keep_alives
+            self.stats.finish()
+            hook = get_metrics_hook()
+            if hook is not None:
+                hook(self.stats)
+
+    def until_done(self) -> Optional[Dict[str, Any]]:
+        for _ in self:
+            pass
+        return self.complete_message
+
+    def __enter__(self) -> 'MessageStream':
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType]
+    ) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        if hasattr(self, '_chunks'):
+            self.close()
+
+
+def write_stream(
+    stream: Iterable[StreamChunk],
+    sink: IO,
+    buffer_size: int = 8192,
+    encoding: str = 'utf-8'
+) -> StreamToResult:
+    """Write the content chunks of ``stream`` to ``sink`` without accumulating them.
+
+    Content is buffered up to ``buffer_size`` characters between writes, so memory
+    stays constant however long the output is. Text sinks (``io.TextIOBase``) receive
+    ``str``; anything else receives bytes in ``encoding``. The sink is flushed at the
+    end but not closed. Returns only the final metadata of the message, with
+    ``written`` counted in the sink's own units (characters or bytes).
+    """
+    binary = not isinstance(sink, io.TextIOBase)
+    pending: List[str] = []
+    pending_size = 0
+    chunks = 0
+    characters = 0
+    written = 0
+    complete: Mapping[str, Any] = {}
+
+    def write_pending() -> None:
+        nonlocal pending, pending_size, written
+        if not pending:
+            return
+        text = ''.join(pending)
+        data = text.encode(encoding) if binary else text
+        sink.write(data)
+        written += len(data)
+        pending = []
+        pending_size = 0
+
+    for chunk in stream:
+        chunks += 1
+        if chunk.get('type') == 'complete':
+            complete = chunk
+            continue
+
+        content = chunk.get('content')
+        if content:
+            pending.append(content)
+            pending_size += len(content)
+            characters += len(content)
+            if pending_size >= buffer_size:
+                write_pending()
+
+    write_pending()
+    flush = getattr(sink, 'flush', None)
+    if flush is not None:
+        flush()
+
+    message = complete.get('message') or {}
+    return {
+        'messageId': message.get('id'),
+        'model': message.get('model') or complete.get('model'),
+        'usage': complete.get('usage') or message.get('usage'),
+        'chunks': chunks,
+        'characters': characters,
+        'written': written
+    }
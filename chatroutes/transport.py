@@ -0,0 +1,267 @@
+from abc import ABC, abstractmethod
+from types import TracebackType
+from typing import Any, Dict, Iterator, Mapping, Optional, Tuple, Type, Union
+import requests
+from .pool import ConnectionPool
+from .compression import DEFAULT_ENCODINGS, httpx_encodings, requests_encodings
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - exercised only without the extra installed
+    httpx = None  # type: ignore[assignment]
+
+
+Timeout = Union[float, Tuple[float, float]]
+
+
+class TransportError(Exception):
+    pass
+
+
+class TransportResponse(ABC):
+    status_code: int
+    headers: Mapping[str, str]
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status_code < 400
+
+    @abstractmethod
+    def read(self) -> bytes:
+        ...
+
+    @abstractmethod
+    def iter_bytes(self) -> Iterator[bytes]:
+        ...
+
+    def iter_lines(self) -> Iterator[bytes]:
+        pending = b''
+        for chunk in self.iter_bytes():
+            lines = (pending + chunk).splitlines(keepends=True)
+            pending = lines.pop() if lines and not lines[-1].endswith((b'\n', b'\r')) else b''
+            for line in lines:
+                yield line.rstrip(b'\r\n')
+        if pending:
+            yield pending
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> 'TransportResponse':
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType]
+    ) -> None:
+        self.close()
+
+
+class Transport(ABC):
+    @abstractmethod
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        content: Optional[bytes] = None,
+        params: Optional[Mapping[str, Any]] = None,
+        timeout: Optional[Timeout] = None,
+        stream: bool = False
+    ) -> TransportResponse:
+        ...
+
+    def accepted_encodings(self) -> str:
+        """Content codings this transport decodes, for the ``Accept-Encoding`` header."""
+        return DEFAULT_ENCODINGS
+
+    def close(self) -> None:
+        pass
+
+
+class RequestsResponse(TransportResponse):
+    def __init__(self, response: requests.Response):
+        self._response = response
+        self.status_code = response.status_code
+        self.headers = response.headers
+
+    def read(self) -> bytes:
+        try:
+            return self._response.content
+        except requests.exceptions.RequestException as e:
+            raise TransportError(str(e)) from e
+
+    def iter_bytes(self) -> Iterator[bytes]:
+        try:
+            for chunk in self._response.iter_content(chunk_size=None):
+                if chunk:
+                    yield chunk
+        except requests.exceptions.RequestException as e:
+            raise TransportError(str(e)) from e
+
+    def iter_lines(self) -> Iterator[bytes]:
+        try:
+            yield from self._response.iter_lines()
+        except requests.exceptions.RequestException as e:
+            raise TransportError(str(e)) from e
+
+    def close(self) -> None:
+        self._response.close()
+
+
+class RequestsTransport(Transport):
+    def __init__(self, pool: Optional[ConnectionPool] = None, **pool_options: Any):
+        self._owns_pool = pool is None
+        self.pool = pool or ConnectionPool(**pool_options)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        content: Optional[bytes] = None,
+        params: Optional[Mapping[str, Any]] = None,
+        timeout: Optional[Timeout] = None,
+        stream: bool = False
+    ) -> TransportResponse:
+        try:
+            response = self.pool.acquire().request(
+                method=method,
+                url=url,
+                data=content,
+                params=params,
+                headers=headers,
+                timeout=timeout,
+                stream=stream
+            )
+        except requests.exceptions.RequestException as e:
+            raise TransportError(str(e)) from e
+
+        return RequestsResponse(response)
+
+    def accepted_encodings(self) -> str:
+        return requests_encodings()
+
+    def close(self) -> None:
+        if self._owns_pool:
+            self.pool.close()
+
+
+class HttpxResponse(TransportResponse):
+    def __init__(self, response: 'httpx.Response'):
+        self._response = response
+        self.status_code = response.status_code
+        self.headers = response.headers
+
+    def read(self) -> bytes:
+        try:
+            return self._response.read()
+        except httpx.HTTPError as e:
+            raise TransportError(str(e)) from e
+
+    def iter_bytes(self) -> Iterator[bytes]:
+        try:
+            yield from self._response.iter_bytes()
+        except httpx.HTTPError as e:
+            raise TransportError(str(e)) from e
+
+    def iter_lines(self) -> Iterator[bytes]:
+        try:
+            for line in self._response.iter_lines():
+                yield line.encode('utf-8')
+        except httpx.HTTPError as e:
+            raise TransportError(str(e)) from e
+
+    def close(self) -> None:
+        self._response.close()
+
+
+class HTTP2Transport(Transport):
+    """HTTP/2 transport built on ``httpx``.
+
+    Concurrent requests from any number of threads are multiplexed as streams over
+    a small number of connections, including long-lived SSE responses.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 10,
+        idle_timeout: Optional[float] = 5.0,
+        client: Optional['httpx.Client'] = None
+    ):
+        if httpx is None:
+            raise ImportError(
+                "HTTP2Transport requires httpx with HTTP/2 support. "
+                "Install it with: pip install chatroutes[http2]"
+            )
+
+        self._owns_client = client is None
+        self.client = client or httpx.Client(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=idle_timeout
+            )
+        )
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        content: Optional[bytes] = None,
+        params: Optional[Mapping[str, Any]] = None,
+        timeout: Optional[Timeout] = None,
+        stream: bool = False
+    ) -> TransportResponse:
+        if isinstance(timeout, tuple):
+            connect_timeout, read_timeout = timeout
+            httpx_timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        else:
+            httpx_timeout = httpx.Timeout(timeout)
+
+        try:
+            request = self.client.build_request(
+                method,
+                url,
+                content=content,
+                params=params,
+                headers=headers,
+                timeout=httpx_timeout
+            )
+            response = self.client.send(request, stream=stream)
+        except httpx.HTTPError as e:
+            raise TransportError(str(e)) from e
+
+        return HttpxResponse(response)
+
+    def accepted_encodings(self) -> str:
+        return httpx_encodings()
+
+    def close(self) -> None:
+        if self._owns_client:
+            self.client.close()
+
+
+def create_transport(
+    transport: Union[str, Transport, None] = None,
+    **pool_options: Any
+) -> Transport:
+    if isinstance(transport, Transport):
+        return transport
+    if transport in (None, 'requests'):
+        return RequestsTransport(**pool_options)
+    if transport == 'http2':
+        if pool_options.get('pool') is not None:
+            raise ValueError("pool= only applies to the requests transport, not 'http2'")
+        if pool_options.get('pool_block'):
+            raise ValueError("pool_block is not supported by the 'http2' transport")
+        idle_timeout = pool_options.get('idle_timeout')
+        return HTTP2Transport(
+            max_connections=pool_options.get('pool_maxsize', 10),
+            idle_timeout=5.0 if idle_timeout is None else idle_timeout
+        )
+    raise ValueError(f"Unknown transport: {transport!r}. Use 'requests', 'http2' or a Transport instance")
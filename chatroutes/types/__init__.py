@@ -11,7 +11,9 @@ from .conversation import (
     TreeNode,
     ListConversationsParams,
     PaginatedResponse,
-    StreamChunk
+    StreamChunk,
+    StreamToResult,
+    BranchFanOutResult
 )
 from .checkpoint import (
     Checkpoint,
@@ -41,6 +43,8 @@ __all__ = [
     'ListConversationsParams',
     'PaginatedResponse',
     'StreamChunk',
+    'StreamToResult',
+    'BranchFanOutResult',
     'Checkpoint',
     'CheckpointCreateRequest',
     'CheckpointListResponse',
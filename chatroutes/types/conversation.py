@@ -116,6 +116,24 @@ class PaginatedResponse(TypedDict):
     hasNext: Optional[bool]
 
 
+class StreamToResult(TypedDict):
+    messageId: Optional[str]
+    model: Optional[str]
+    usage: Optional[dict]
+    chunks: int
+    characters: int
+    written: int
+
+
+class BranchFanOutResult(TypedDict):
+    index: int
+    prompt: str
+    branch: Optional[Branch]
+    response: Optional[dict]
+    error: Optional[Exception]
+    latency: float
+
+
 class StreamChunk(TypedDict, total=False):
     type: str
     content: Optional[str]
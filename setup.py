@@ -36,6 +36,15 @@ setup(
         "typing-extensions>=4.0.0",
     ],
     extras_require={
+        "async": [
+            "httpx>=0.24.0",
+        ],
+        "http2": [
+            "httpx[http2]>=0.24.0",
+        ],
+        "speedups": [
+            "orjson>=3.8.0",
+        ],
         "dev": [
             "pytest>=7.0.0",
             "pytest-cov>=4.0.0",
@@ -0,0 +1,142 @@
+"""
+Tests for the asyncio client (AsyncChatRoutes)
+"""
+
+import asyncio
+import json
+
+import pytest
+
+httpx = pytest.importorskip('httpx')
+
+from chatroutes import AsyncChatRoutes, NotFoundError, RateLimitError, ServerError
+
+
+def make_client(handler, **kwargs):
+    client = AsyncChatRoutes(api_key='test_api_key', retry_delay=0, **kwargs)
+    client._http.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class TestAsyncChatRoutes:
+    """Test suite for AsyncChatRoutes and its resources"""
+
+    def test_resources_are_attached(self):
+        """Test that every resource has an async counterpart"""
+        client = AsyncChatRoutes(api_key='test_api_key')
+        for name in ('conversations', 'messages', 'branches', 'checkpoints', 'autobranch'):
+            assert hasattr(client, name)
+        run(client.aclose())
+
+    def test_get_conversation(self):
+        """Test a simple GET through the async transport"""
+        seen = {}
+
+        def handler(request):
+            seen['url'] = str(request.url)
+            seen['auth'] = request.headers['Authorization']
+            return httpx.Response(200, json={'data': {'conversation': {'id': 'conv-1'}}})
+
+        async def scenario():
+            async with make_client(handler) as client:
+                return await client.conversations.get('conv-1')
+
+        assert run(scenario()) == {'id': 'conv-1'}
+        assert seen['url'].endswith('/conversations/conv-1')
+        assert seen['auth'] == 'ApiKey test_api_key'
+
+    def test_send_message_posts_json(self):
+        """Test that request bodies are sent as JSON"""
+        def handler(request):
+            body = json.loads(request.content)
+            return httpx.Response(200, json={'data': {'message': {'content': body['content']}}})
+
+        async def scenario():
+            async with make_client(handler) as client:
+                return await client.messages.send('conv-1', {'content': 'Hello'})
+
+        assert run(scenario())['message']['content'] == 'Hello'
+
+    def test_error_mapping_matches_sync_client(self):
+        """Test that 4xx responses map to the same exceptions as HttpClient"""
+        def handler(request):
+            if request.url.path.endswith('/missing'):
+                return httpx.Response(404, json={'message': 'gone'})
+            return httpx.Response(429, json={'message': 'slow down', 'retryAfter': 7})
+
+        async def scenario():
+            async with make_client(handler) as client:
+                with pytest.raises(NotFoundError):
+                    await client.conversations.get('missing')
+                with pytest.raises(RateLimitError) as exc_info:
+                    await client.branches.list('conv-1')
+                return exc_info.value
+
+        assert run(scenario()).retry_after == 7
+
+    def test_server_errors_are_retried(self):
+        """Test that 5xx responses are retried before raising"""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(503, json={'message': 'unavailable'})
+
+        async def scenario():
+            async with make_client(handler, retry_attempts=2) as client:
+                with pytest.raises(ServerError):
+                    await client.checkpoints.list('conv-1')
+
+        run(scenario())
+        assert len(calls) == 3
+
+    def test_stream_supports_async_callbacks(self):
+        """Test SSE streaming with coroutine callbacks"""
+        body = (
+            'data: {"type": "content", "content": "Hel"}\n\n'
+            'data: {"type": "content", "content": "lo"}\n\n'
+            'data: {"type": "complete", "message": {"id": "msg-1"}}\n\n'
+            'data: [DONE]\n\n'
+        )
+
+        def handler(request):
+            assert request.headers['Accept'] == 'text/event-stream'
+            return httpx.Response(200, content=body.encode('utf-8'))
+
+        chunks = []
+        completed = []
+
+        async def on_chunk(chunk):
+            chunks.append(chunk)
+
+        async def scenario():
+            async with make_client(handler) as client:
+                await client.messages.stream(
+                    'conv-1',
+                    {'content': 'Hi'},
+                    on_chunk=on_chunk,
+                    on_complete=completed.append
+                )
+
+        run(scenario())
+        assert ''.join(c.get('content', '') for c in chunks if c['type'] == 'content') == 'Hello'
+        assert completed == [{'id': 'msg-1'}]
+
+    def test_concurrent_requests_share_one_loop(self):
+        """Test that many calls can be awaited concurrently"""
+        def handler(request):
+            conversation_id = request.url.path.rsplit('/', 1)[-1]
+            return httpx.Response(200, json={'data': {'conversation': {'id': conversation_id}}})
+
+        async def scenario():
+            async with make_client(handler) as client:
+                return await asyncio.gather(
+                    *(client.conversations.get(f'conv-{i}') for i in range(50))
+                )
+
+        results = run(scenario())
+        assert [r['id'] for r in results] == [f'conv-{i}' for i in range(50)]
@@ -0,0 +1,812 @@
+"""
+Tests for bulk operations:
+- Auto-paginating iteration with background prefetch
+- Parallel page fan-out
+- JSONL export with resume cursors
+- Concurrent import with id remapping and journals
+- Batch sends
+- Bulk deletes
+- Branch fan-out
+"""
+
+import gzip
+import json
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from chatroutes import (
+    BatchResult,
+    ChatRoutes,
+    NotFoundError,
+    RetryPolicy,
+    ServerError,
+    Transport,
+    TransportResponse,
+    ValidationError,
+    read_records
+)
+
+
+class JSONResponse(TransportResponse):
+    def __init__(self, payload=None, status_code=200):
+        self.status_code = status_code
+        self.headers = {}
+        self._body = json.dumps(payload if payload is not None else {}).encode('utf-8')
+
+    def read(self):
+        return self._body
+
+    def iter_bytes(self):
+        yield self._body
+
+
+class RouteTransport(Transport):
+    """Answers each request with ``handler(call)``; ``call`` holds method, url, params and body."""
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def request(self, method, url, headers, content=None, params=None, timeout=None, stream=False):
+        call = {
+            'method': method,
+            'url': url,
+            'params': params or {},
+            'body': json.loads(content) if content else None
+        }
+        with self.lock:
+            self.calls.append(call)
+        return self.handler(call)
+
+
+def conversation_pages(total, delay=0.0, has_next=True):
+    """Handler serving ``total`` conversations for GET /conversations."""
+
+    def handler(call):
+        time.sleep(delay)
+        page = int(call['params'].get('page', 1))
+        limit = int(call['params'].get('limit', 10))
+        start = (page - 1) * limit
+        items = [{'id': f'conv-{i}'} for i in range(start, min(start + limit, total))]
+        return JSONResponse({
+            'conversations': items,
+            'total': total,
+            'page': page,
+            'limit': limit,
+            'hasNext': has_next and start + limit < total
+        })
+
+    return handler
+
+
+def make_client(handler, **kwargs):
+    transport = RouteTransport(handler)
+    return ChatRoutes(api_key='key', transport=transport, **kwargs), transport
+
+
+class TestIterAll:
+    """Test suite for conversations.iter_all()"""
+
+    def test_yields_every_conversation_across_pages(self):
+        """Test that iteration walks all pages in order and stops on hasNext"""
+        client, transport = make_client(conversation_pages(23))
+
+        with client.conversations.iter_all(filter='owned', page_size=10) as conversations:
+            ids = [conversation['id'] for conversation in conversations]
+
+        assert ids == [f'conv-{i}' for i in range(23)]
+        assert [call['params']['page'] for call in transport.calls] == [1, 2, 3]
+        assert all(call['params']['filter'] == 'owned' for call in transport.calls)
+        assert conversations.total == 23
+
+    def test_falls_back_to_total_without_has_next(self):
+        """Test that total and limit decide the last page when hasNext is absent"""
+        client, transport = make_client(conversation_pages(20, has_next=False))
+
+        ids = [c['id'] for c in client.conversations.iter_all(page_size=10, prefetch=0)]
+
+        assert len(ids) == 20
+        assert len(transport.calls) == 2
+
+    def test_prefetch_overlaps_fetching_with_processing(self):
+        """Test that the next page is fetched while the current one is processed"""
+        client, _ = make_client(conversation_pages(40, delay=0.05))
+
+        started = time.monotonic()
+        for conversation in client.conversations.iter_all(page_size=10, prefetch=2):
+            if conversation['id'].endswith('9'):
+                time.sleep(0.05)
+        prefetched = time.monotonic() - started
+
+        started = time.monotonic()
+        for conversation in client.conversations.iter_all(page_size=10, prefetch=0):
+            if conversation['id'].endswith('9'):
+                time.sleep(0.05)
+        inline = time.monotonic() - started
+
+        assert prefetched < inline - 0.1
+
+    def test_prefetch_depth_bounds_read_ahead(self):
+        """Test that the background reader stays at most prefetch pages ahead"""
+        client, transport = make_client(conversation_pages(100))
+
+        conversations = client.conversations.iter_all(page_size=10, prefetch=2)
+        next(conversations)
+        time.sleep(0.1)
+
+        assert len(transport.calls) <= 4
+        conversations.close()
+
+    def test_abandoned_iteration_stops_the_reader(self):
+        """Test that breaking out of a plain for loop does not leak prefetch threads"""
+        client, _ = make_client(conversation_pages(100))
+
+        def readers():
+            return [t for t in threading.enumerate() if t.name == 'chatroutes-page-prefetch']
+
+        for _ in range(5):
+            for conversation in client.conversations.iter_all(page_size=10, prefetch=2):
+                break
+
+        deadline = time.monotonic() + 2.0
+        while readers() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert readers() == []
+
+    def test_errors_surface_after_earlier_pages(self):
+        """Test that a failing page is raised once the pages before it are consumed"""
+        pages = conversation_pages(30)
+
+        def handler(call):
+            if call['params']['page'] == 2:
+                return JSONResponse({'message': 'boom'}, status_code=500)
+            return pages(call)
+
+        client, _ = make_client(handler, retry_attempts=0)
+        received = []
+
+        with pytest.raises(ServerError):
+            for conversation in client.conversations.iter_all(page_size=10):
+                received.append(conversation['id'])
+
+        assert len(received) == 10
+
+
+class TestIterAllParallel:
+    """Test suite for conversations.iter_all_parallel()"""
+
+    def test_merges_concurrent_pages_in_order(self):
+        """Test that pages fetched concurrently are yielded in page order"""
+        pages = conversation_pages(95)
+
+        def handler(call):
+            page = call['params']['page']
+            time.sleep(0.05 if page % 2 == 0 else 0.01)
+            return pages(call)
+
+        client, transport = make_client(handler)
+        started = time.monotonic()
+
+        ids = [c['id'] for c in client.conversations.iter_all_parallel(page_size=10, concurrency=5)]
+
+        assert ids == [f'conv-{i}' for i in range(95)]
+        assert sorted(call['params']['page'] for call in transport.calls) == list(range(1, 11))
+        assert time.monotonic() - started < 0.4
+
+    def test_bounded_worker_count(self):
+        """Test that no more than concurrency pages are in flight at once"""
+        pages = conversation_pages(200)
+        state = {'active': 0, 'peak': 0}
+        lock = threading.Lock()
+
+        def handler(call):
+            with lock:
+                state['active'] += 1
+                state['peak'] = max(state['peak'], state['active'])
+            time.sleep(0.01)
+            with lock:
+                state['active'] -= 1
+            return pages(call)
+
+        client, _ = make_client(handler)
+
+        assert len(list(client.conversations.iter_all_parallel(page_size=10, concurrency=3))) == 200
+        assert state['peak'] <= 3
+
+    def test_failed_pages_are_retried(self):
+        """Test that a page failing once is fetched again without failing the scan"""
+        pages = conversation_pages(50)
+        failures = {3: 1}
+
+        def handler(call):
+            page = call['params']['page']
+            if failures.get(page):
+                failures[page] -= 1
+                return JSONResponse({'message': 'boom'}, status_code=502)
+            return pages(call)
+
+        client, transport = make_client(handler, retry_attempts=0)
+
+        ids = [c['id'] for c in client.conversations.iter_all_parallel(page_size=10, page_retries=1)]
+
+        assert len(ids) == 50
+        assert [call['params']['page'] for call in transport.calls].count(3) == 2
+
+    def test_page_retries_do_not_stack_on_client_retries(self):
+        """Test that errors the client already retried are not retried again per page"""
+        pages = conversation_pages(50)
+
+        def handler(call):
+            if call['params']['page'] == 3:
+                return JSONResponse({'message': 'boom'}, status_code=502)
+            return pages(call)
+
+        client, transport = make_client(handler, retry_policy=RetryPolicy(max_retries=3, backoff_base=0))
+
+        with pytest.raises(ServerError):
+            list(client.conversations.iter_all_parallel(page_size=10, page_retries=2))
+
+        assert [call['params']['page'] for call in transport.calls].count(3) == 4
+
+    def test_rate_limited_pages_wait_for_retry_after(self):
+        """Test that a rate-limited page is retried after the server's retry_after"""
+        pages = conversation_pages(30)
+        limited = {2: 1}
+
+        def handler(call):
+            page = call['params']['page']
+            if limited.get(page):
+                limited[page] -= 1
+                return JSONResponse({'message': 'slow down', 'retryAfter': 7}, status_code=429)
+            return pages(call)
+
+        client, _ = make_client(handler)
+
+        with patch('chatroutes.pagination.time.sleep') as sleep:
+            ids = [c['id'] for c in client.conversations.iter_all_parallel(page_size=10)]
+
+        assert len(ids) == 30
+        assert 7 in [args[0] for args, _ in sleep.call_args_list]
+
+    def test_reports_progress(self):
+        """Test that progress is reported once per page against the page total"""
+        client, _ = make_client(conversation_pages(35))
+        progress = []
+
+        list(client.conversations.iter_all_parallel(
+            page_size=10,
+            on_progress=lambda done, total: progress.append((done, total))
+        ))
+
+        assert progress == [(1, 4), (2, 4), (3, 4), (4, 4)]
+
+    def test_single_page_needs_no_workers(self):
+        """Test that a listing that fits in one page makes a single request"""
+        client, transport = make_client(conversation_pages(7))
+
+        assert len(list(client.conversations.iter_all_parallel(page_size=10))) == 7
+        assert len(transport.calls) == 1
+
+
+def account(conversations=3, branches=2, messages=2, delay=0.0, fail=None):
+    """Handler serving a small account; ``fail`` names a url path answered with 404."""
+    api = '/api/v1'
+
+    def handler(call):
+        time.sleep(delay)
+        path = call['url'].split(api, 1)[1]
+        if fail is not None and path == fail:
+            return JSONResponse({'message': 'gone'}, status_code=404)
+        parts = path.strip('/').split('/')
+
+        if parts == ['conversations']:
+            return conversation_pages(conversations)(call)
+        conversation_id = parts[1]
+        if parts[2:] == ['branches']:
+            return JSONResponse({'data': {'branches': [
+                {'id': f'{conversation_id}-b{b}', 'isMain': b == 0} for b in range(branches)
+            ]}})
+        if parts[2] == 'branches' and parts[4:] == ['messages']:
+            return JSONResponse({'data': {'messages': [
+                {'id': f'{parts[3]}-m{m}', 'content': f'message {m}'} for m in range(messages)
+            ]}})
+        if parts[2:] == ['checkpoints']:
+            return JSONResponse({'data': {'checkpoints': [{'id': f'{conversation_id}-cp'}]}})
+        raise AssertionError(f'unexpected request {path}')
+
+    return handler
+
+
+class TestExport:
+    """Test suite for conversations.export()"""
+
+    def test_writes_records_in_listing_order(self, tmp_path):
+        """Test that each conversation is followed by its branches, messages and checkpoints"""
+        client, _ = make_client(account(conversations=3, branches=2, messages=2))
+        path = str(tmp_path / 'export.jsonl')
+
+        summary = client.conversations.export(path)
+
+        records = list(read_records(path))
+        assert summary == {'conversations': 3, 'records': 24, 'resumedAfter': None}
+        assert len(records) == 24
+        assert [r['type'] for r in records[:8]] == [
+            'conversation', 'branch', 'message', 'message', 'branch', 'message', 'message', 'checkpoint'
+        ]
+        assert [r['conversation']['id'] for r in records if r['type'] == 'conversation'] == [
+            'conv-0', 'conv-1', 'conv-2'
+        ]
+        assert records[2] == {
+            'type': 'message',
+            'conversationId': 'conv-0',
+            'branchId': 'conv-0-b0',
+            'message': {'id': 'conv-0-b0-m0', 'content': 'message 0'}
+        }
+
+    def test_gzip_output(self, tmp_path):
+        """Test that a .gz path is compressed and reads back the same records"""
+        client, _ = make_client(account())
+        plain, packed = str(tmp_path / 'export.jsonl'), str(tmp_path / 'export.jsonl.gz')
+
+        client.conversations.export(plain)
+        client.conversations.export(packed)
+
+        with gzip.open(packed, 'rb') as f:
+            assert f.readline().startswith(b'{')
+        assert list(read_records(packed)) == list(read_records(plain))
+
+    def test_fetches_sub_resources_concurrently(self, tmp_path):
+        """Test that branch messages and checkpoints are fetched in parallel"""
+        client, transport = make_client(account(conversations=4, branches=3, delay=0.02))
+
+        started = time.monotonic()
+        client.conversations.export(str(tmp_path / 'export.jsonl'), concurrency=4)
+        elapsed = time.monotonic() - started
+
+        assert len(transport.calls) == 1 + 4 * (1 + 3 + 1)
+        assert elapsed < len(transport.calls) * 0.02 / 2
+
+    def test_resumes_from_cursor(self, tmp_path):
+        """Test that a failed export continues after the last written conversation"""
+        path = str(tmp_path / 'export.jsonl.gz')
+        cursor = str(tmp_path / 'export.cursor')
+        client, _ = make_client(account(conversations=5, fail='/conversations/conv-3/branches'))
+
+        with pytest.raises(NotFoundError):
+            client.conversations.export(path, cursor_path=cursor, concurrency=1)
+
+        with open(cursor) as f:
+            assert json.load(f)['conversationId'] == 'conv-2'
+        with open(path, 'ab') as f:
+            f.write(b'half-written member')
+
+        client, transport = make_client(account(conversations=5))
+        summary = client.conversations.export(path, cursor_path=cursor, concurrency=1)
+
+        assert summary['resumedAfter'] == 'conv-2'
+        assert summary['conversations'] == 2
+        assert not any('conv-0' in call['url'] for call in transport.calls)
+
+        reference = str(tmp_path / 'reference.jsonl')
+        make_client(account(conversations=5))[0].conversations.export(reference)
+        assert list(read_records(path)) == list(read_records(reference))
+
+
+class Workspace:
+    """In-memory server for replaying imports: conversations, branches and messages."""
+
+    def __init__(self, delay=0.0, fail_send=None):
+        self.delay = delay
+        self.fail_send = fail_send
+        self.lock = threading.Lock()
+        self.counter = 0
+        self.conversations = {}
+        self.branches = {}
+        self.messages = {}
+        self.sent = []
+        self.active = 0
+        self.peak = 0
+
+    def new_id(self, prefix):
+        self.counter += 1
+        return f'{prefix}-{self.counter}'
+
+    def add_branch(self, conversation_id, **fields):
+        branch = {'id': self.new_id('nb'), 'conversationId': conversation_id, **fields}
+        self.branches.setdefault(conversation_id, []).append(branch)
+        self.messages[branch['id']] = []
+        return branch
+
+    def __call__(self, call):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(self.delay)
+            with self.lock:
+                return self.route(call)
+        finally:
+            with self.lock:
+                self.active -= 1
+
+    def route(self, call):
+        parts = call['url'].split('/api/v1/', 1)[1].split('/')
+        method, body = call['method'], call['body']
+
+        if method == 'POST' and parts == ['conversations']:
+            conversation = {'id': self.new_id('nc'), 'title': body['title']}
+            self.conversations[conversation['id']] = conversation
+            self.add_branch(conversation['id'], isMain=True, title='Main')
+            return JSONResponse({'data': {'conversation': conversation}})
+        if method == 'DELETE':
+            self.conversations.pop(parts[1])
+            return JSONResponse({})
+
+        conversation_id = parts[1]
+        if parts[2:] == ['branches'] and method == 'GET':
+            return JSONResponse({'data': {'branches': self.branches[conversation_id]}})
+        if parts[2:] in (['branches'], ['fork']):
+            branch = self.add_branch(conversation_id, title=body['title'], forkPoint=body.get('forkPointMessageId'))
+            return JSONResponse({'data': {'branch': branch}})
+        if parts[2:] == ['messages'] and method == 'POST':
+            if body['content'] == self.fail_send:
+                return JSONResponse({'message': 'bad'}, status_code=400)
+            self.sent.append((self.conversations[conversation_id]['title'], body['content'], body.get('model')))
+            branch = self.messages[body['branchId']]
+            branch.append({'id': self.new_id('nm'), 'role': 'user', 'content': body['content']})
+            reply = {'id': self.new_id('nm'), 'role': 'assistant', 'content': 'ok'}
+            branch.append(reply)
+            return JSONResponse({'data': {'message': reply}})
+        if parts[2] == 'branches' and parts[4:] == ['messages']:
+            return JSONResponse({'data': {'messages': self.messages[parts[3]]}})
+        raise AssertionError(f'unexpected request {method} {parts}')
+
+
+def export_file(tmp_path, conversations=2, name='export.jsonl'):
+    """Write an export with a main branch of two turns and a fork at the second question."""
+    records = []
+    for c in range(conversations):
+        cid = f'c{c}'
+        records.append({'type': 'conversation', 'conversation': {'id': cid, 'title': f'Conversation {c}'}})
+        records.append({'type': 'branch', 'conversationId': cid, 'branch': {'id': f'{cid}-main', 'isMain': True}})
+        for m, role in enumerate(['user', 'assistant', 'user', 'assistant']):
+            message = {'id': f'{cid}-m{m}', 'role': role, 'content': f'{cid} turn {m}'}
+            if role == 'assistant':
+                message['metadata'] = {'model': 'gpt-5'}
+            records.append({'type': 'message', 'conversationId': cid, 'branchId': f'{cid}-main', 'message': message})
+        records.append({
+            'type': 'branch',
+            'conversationId': cid,
+            'branch': {'id': f'{cid}-fork', 'forkPointMessageId': f'{cid}-m2', 'title': 'Alt', 'contextMode': 'FULL'}
+        })
+        for m, role in enumerate(['user', 'assistant']):
+            message = {'id': f'{cid}-f{m}', 'role': role, 'content': f'{cid} fork {m}'}
+            records.append({'type': 'message', 'conversationId': cid, 'branchId': f'{cid}-fork', 'message': message})
+
+    path = tmp_path / name
+    path.write_text(''.join(json.dumps(record) + '\n' for record in records))
+    return str(path)
+
+
+class TestImport:
+    """Test suite for conversations.import_file()"""
+
+    def test_replays_conversations_and_maps_ids(self, tmp_path):
+        """Test that messages are replayed in order and every old id is remapped"""
+        workspace = Workspace()
+        client, _ = make_client(workspace)
+
+        summary = client.conversations.import_file(export_file(tmp_path, conversations=1))
+
+        assert summary['conversations'] == 1
+        assert summary['failed'] == {}
+        assert workspace.sent == [
+            ('Conversation 0', 'c0 turn 0', 'gpt-5'),
+            ('Conversation 0', 'c0 turn 2', 'gpt-5'),
+            ('Conversation 0', 'c0 fork 0', None)
+        ]
+        ids = summary['ids']
+        assert set(ids) == {'c0', 'c0-main', 'c0-fork', 'c0-m0', 'c0-m1', 'c0-m2', 'c0-m3', 'c0-f0', 'c0-f1'}
+        fork = workspace.branches[ids['c0']][1]
+        assert fork['id'] == ids['c0-fork']
+        assert fork['forkPoint'] == ids['c0-m2']
+        assert [m['id'] for m in workspace.messages[ids['c0-fork']]] == [ids['c0-f0'], ids['c0-f1']]
+
+    def test_conversations_run_concurrently(self, tmp_path):
+        """Test that independent conversations are replayed in parallel"""
+        workspace = Workspace(delay=0.01)
+        client, _ = make_client(workspace)
+
+        summary = client.conversations.import_file(export_file(tmp_path, conversations=6), concurrency=3)
+
+        assert summary['conversations'] == 6
+        assert workspace.peak > 1
+        for c in range(6):
+            sent = [content for title, content, _ in workspace.sent if title == f'Conversation {c}']
+            assert sent == [f'c{c} turn 0', f'c{c} turn 2', f'c{c} fork 0']
+
+    def test_failures_are_reported_per_conversation(self, tmp_path):
+        """Test that one failing conversation does not stop the others"""
+        workspace = Workspace(fail_send='c1 turn 2')
+        client, _ = make_client(workspace)
+
+        summary = client.conversations.import_file(export_file(tmp_path, conversations=3))
+
+        assert summary['conversations'] == 2
+        assert list(summary['failed']) == ['c1']
+        assert 'c2-f1' in summary['ids']
+
+    def test_journal_resumes_and_replaces_interrupted_conversations(self, tmp_path):
+        """Test that a rerun skips finished conversations and redoes interrupted ones"""
+        path = export_file(tmp_path, conversations=3)
+        journal = str(tmp_path / 'import.journal')
+        workspace = Workspace(fail_send='c1 turn 2')
+        client, _ = make_client(workspace)
+
+        first = client.conversations.import_file(path, journal_path=journal, concurrency=1)
+        interrupted = [cid for cid, c in workspace.conversations.items() if c['title'] == 'Conversation 1']
+
+        workspace.fail_send = None
+        second = client.conversations.import_file(path, journal_path=journal, concurrency=1)
+
+        assert first['conversations'] == 2
+        assert second['conversations'] == 1
+        assert second['skipped'] == 2
+        assert interrupted[0] not in workspace.conversations
+        assert sorted(c['title'] for c in workspace.conversations.values()) == [
+            'Conversation 0', 'Conversation 1', 'Conversation 2'
+        ]
+        assert second['ids']['c0'] == first['ids']['c0']
+        assert 'c1-f1' in second['ids']
+
+    def test_journal_survives_a_torn_last_line(self, tmp_path):
+        """Test that entries on either side of a line torn by a crash are still read"""
+        path = export_file(tmp_path, conversations=3)
+        journal = tmp_path / 'import.journal'
+        workspace = Workspace(fail_send='c1 turn 2')
+        client, _ = make_client(workspace)
+
+        client.conversations.import_file(path, journal_path=str(journal), concurrency=1)
+        with open(journal, 'a', encoding='utf-8') as f:
+            f.write('{"conversationId": "c1", "newConvers')
+
+        workspace.fail_send = None
+        second = client.conversations.import_file(path, journal_path=str(journal), concurrency=1)
+        third = client.conversations.import_file(path, journal_path=str(journal), concurrency=1)
+
+        assert (second['conversations'], second['skipped']) == (1, 2)
+        assert (third['conversations'], third['skipped']) == (0, 3)
+        assert 'c1-f1' in third['ids']
+
+
+def echo(delays=None, reject=()):
+    """Handler answering each sent message with its own content, after ``delays[content]``."""
+    state = {'active': 0, 'peak': 0}
+    lock = threading.Lock()
+
+    def handler(call):
+        content = call['body']['content']
+        with lock:
+            state['active'] += 1
+            state['peak'] = max(state['peak'], state['active'])
+        time.sleep((delays or {}).get(content, 0.01))
+        with lock:
+            state['active'] -= 1
+        if content in reject:
+            return JSONResponse({'message': 'rejected'}, status_code=400)
+        return JSONResponse({'data': {'message': {'role': 'assistant', 'content': content}}})
+
+    return handler, state
+
+
+class TestSendMany:
+    """Test suite for messages.send_many() and send_many_iter()"""
+
+    def test_results_in_input_order_with_errors_captured(self):
+        """Test that results keep input order and a failing item does not abort the batch"""
+        handler, _ = echo(delays={'p0': 0.05}, reject={'p2'})
+        client, _ = make_client(handler)
+        items = [(f'conv-{i}', {'content': f'p{i}'}) for i in range(5)]
+
+        results = client.messages.send_many(items, concurrency=5)
+
+        assert [r.index for r in results] == [0, 1, 2, 3, 4]
+        assert all(isinstance(r, BatchResult) for r in results)
+        assert [r.ok for r in results] == [True, True, False, True, True]
+        assert results[0].value['message']['content'] == 'p0'
+        assert results[3].item == ('conv-3', {'content': 'p3'})
+        assert isinstance(results[2].error, ValidationError)
+        with pytest.raises(ValidationError):
+            results[2].result()
+
+    def test_iter_yields_as_completed(self):
+        """Test that the iterator variant yields the fastest items first"""
+        handler, _ = echo(delays={'slow': 0.1})
+        client, _ = make_client(handler)
+        items = [('conv-1', {'content': 'slow'}), ('conv-2', {'content': 'fast'})]
+
+        order = [r.value['message']['content'] for r in client.messages.send_many_iter(items, concurrency=2)]
+
+        assert order == ['fast', 'slow']
+
+    def test_concurrency_is_bounded(self):
+        """Test that no more than ``concurrency`` sends are in flight"""
+        handler, state = echo()
+        client, transport = make_client(handler)
+
+        results = client.messages.send_many(
+            ((f'conv-{i}', {'content': f'p{i}'}) for i in range(20)),
+            concurrency=3
+        )
+
+        assert len(results) == 20
+        assert state['peak'] == 3
+        assert all(call['url'].endswith('/messages') for call in transport.calls)
+
+
+class TestDeleteMany:
+    """Test suite for the bulk delete helpers"""
+
+    def test_missing_ids_count_as_deleted_and_failures_are_summarised(self):
+        """Test that 404s succeed, other errors are collected and progress is reported"""
+
+        def handler(call):
+            message_id = call['url'].rsplit('/', 1)[1]
+            if message_id == 'gone':
+                return JSONResponse({'message': 'missing'}, status_code=404)
+            if message_id == 'locked':
+                return JSONResponse({'message': 'locked'}, status_code=400)
+            return JSONResponse({})
+
+        client, transport = make_client(handler)
+        progress = []
+
+        summary = client.messages.delete_many(
+            ['m1', 'gone', 'locked', 'm2'],
+            on_progress=lambda done, total: progress.append((done, total))
+        )
+
+        assert summary['deleted'] == 3
+        assert summary['notFound'] == 1
+        assert list(summary['failed']) == ['locked']
+        assert isinstance(summary['failed']['locked'], ValidationError)
+        assert progress == [(1, 4), (2, 4), (3, 4), (4, 4)]
+        assert all(call['method'] == 'DELETE' for call in transport.calls)
+
+    def test_conversations_matching_a_predicate(self):
+        """Test that a predicate selects conversations from the full listing before deleting"""
+        listing = conversation_pages(25)
+        deleted = []
+
+        def handler(call):
+            if call['method'] == 'DELETE':
+                deleted.append(call['url'].rsplit('/', 1)[1])
+                return JSONResponse({})
+            return listing(call)
+
+        client, _ = make_client(handler)
+
+        summary = client.conversations.delete_many(
+            where=lambda c: c['id'].endswith('3'),
+            concurrency=2
+        )
+
+        assert summary['deleted'] == 3
+        assert sorted(deleted) == ['conv-13', 'conv-23', 'conv-3']
+
+    def test_branch_and_checkpoint_deletes_run_concurrently(self):
+        """Test that deletes overlap up to the concurrency limit"""
+        peak = {'active': 0, 'max': 0}
+        lock = threading.Lock()
+
+        def handler(call):
+            with lock:
+                peak['active'] += 1
+                peak['max'] = max(peak['max'], peak['active'])
+            time.sleep(0.02)
+            with lock:
+                peak['active'] -= 1
+            return JSONResponse({})
+
+        client, transport = make_client(handler)
+
+        branches = client.branches.delete_many('conv-1', [f'b{i}' for i in range(6)], concurrency=3)
+        checkpoints = client.checkpoints.delete_many([f'cp{i}' for i in range(6)], concurrency=3)
+
+        assert branches['deleted'] == checkpoints['deleted'] == 6
+        assert peak['max'] == 3
+        assert any(call['url'].endswith('/conversations/conv-1/branches/b0') for call in transport.calls)
+
+
+def explorer(delay=0.05, fail_prompt=None):
+    """Handler creating branches and answering branch messages after ``delay``."""
+    counter = {'branches': 0}
+    lock = threading.Lock()
+
+    def handler(call):
+        time.sleep(delay)
+        if call['url'].endswith('/branches'):
+            with lock:
+                counter['branches'] += 1
+                branch_id = f"branch-{counter['branches']}"
+            return JSONResponse({'data': {'branch': {'id': branch_id, **call['body']}}})
+        if call['body']['content'] == fail_prompt:
+            return JSONResponse({'message': 'busy'}, status_code=400)
+        return JSONResponse({'data': {'message': {'content': call['body']['content'].upper()}}})
+
+    return handler
+
+
+class TestBranchFanOut:
+    """Test suite for branches.fan_out()"""
+
+    def test_creates_and_sends_concurrently(self):
+        """Test that N branches cost about one create and one send round trip"""
+        client, transport = make_client(explorer(delay=0.05))
+        prompts = [f'idea {i}' for i in range(5)]
+        started = time.monotonic()
+
+        results = client.branches.fan_out('conv-1', 'node-7', prompts, context_mode='PARTIAL', concurrency=5)
+
+        assert time.monotonic() - started < 0.3
+        assert [r['prompt'] for r in results] == prompts
+        assert [r['response']['message']['content'] for r in results] == [p.upper() for p in prompts]
+        assert all(r['error'] is None and r['latency'] >= 0.1 for r in results)
+        created = [call['body'] for call in transport.calls if call['url'].endswith('/branches')]
+        assert {body['baseNodeId'] for body in created} == {'node-7'}
+        assert {body['contextMode'] for body in created} == {'PARTIAL'}
+        sends = {call['url'].split('/branches/')[1] for call in transport.calls if call['url'].endswith('/messages')}
+        assert sends == {r['branch']['id'] + '/messages' for r in results}
+
+    def test_default_concurrency_is_bounded(self):
+        """Test that a long prompt list does not start a thread per prompt"""
+        answer = explorer(delay=0.01)
+        state = {'active': 0, 'peak': 0}
+        lock = threading.Lock()
+
+        def handler(call):
+            with lock:
+                state['active'] += 1
+                state['peak'] = max(state['peak'], state['active'])
+            try:
+                return answer(call)
+            finally:
+                with lock:
+                    state['active'] -= 1
+
+        client, _ = make_client(handler)
+
+        results = client.branches.fan_out('conv-1', 'node-1', [f'idea {i}' for i in range(20)])
+
+        assert len(results) == 20
+        assert state['peak'] <= 4
+
+    def test_failed_send_keeps_the_created_branch(self):
+        """Test that an error is reported with the branch it happened on"""
+        client, _ = make_client(explorer(delay=0, fail_prompt='b'))
+
+        results = client.branches.fan_out('conv-1', 'node-1', ['a', 'b'], titles=['First', 'Second'])
+
+        assert results[0]['error'] is None
+        assert isinstance(results[1]['error'], ValidationError)
+        assert results[1]['branch']['title'] == 'Second'
+        assert results[1]['response'] is None
+
+    def test_iter_yields_as_completed(self):
+        """Test that fan_out_iter yields each exploration as it finishes"""
+        answer = explorer(delay=0)
+
+        def handler(call):
+            if call['url'].endswith('/messages') and call['body']['content'] == 'slow':
+                time.sleep(0.1)
+            return answer(call)
+
+        client, _ = make_client(handler)
+
+        order = [r['prompt'] for r in client.branches.fan_out_iter('conv-1', 'node-1', ['slow', 'fast'])]
+
+        assert order == ['fast', 'slow']
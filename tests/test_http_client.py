@@ -0,0 +1,1087 @@
+"""
+Tests for HttpClient transport behaviour:
+- Connection pooling and pool sharing
+- Pluggable transports
+- Client-side rate limiting
+- Retry policy, retry budget and idempotency keys
+- Connect/read timeouts and end-to-end deadlines
+- JSON codecs
+- Request/response compression
+- Per-endpoint circuit breakers
+- Hedged reads
+"""
+
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, patch
+
+import pytest
+
+from chatroutes import (
+    ChatRoutes,
+    CircuitBreaker,
+    CircuitBreakerRegistry,
+    CircuitOpenError,
+    ConnectionPool,
+    DeadlineExceededError,
+    HedgingPolicy,
+    HTTP2Transport,
+    JSONCodec,
+    StdlibJSONCodec,
+    NetworkError,
+    NotFoundError,
+    RateLimiter,
+    RateLimitError,
+    RequestsTransport,
+    RetryBudget,
+    RetryPolicy,
+    ServerError,
+    Transport,
+    TransportError,
+    TransportResponse,
+    deadline
+)
+from chatroutes.circuit_breaker import endpoint_group
+from chatroutes.compression import httpx_encodings
+
+
+def json_response(payload, status_code=200):
+    response = Mock()
+    response.status_code = status_code
+    response.headers = {}
+    response.content = json.dumps(payload).encode('utf-8')
+    return response
+
+
+class FakeResponse(TransportResponse):
+    def __init__(self, status_code=200, payload=None, body=None, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        if body is None:
+            body = json.dumps(payload if payload is not None else {}).encode('utf-8')
+        self._body = body
+
+    def read(self):
+        return self._body
+
+    def iter_bytes(self):
+        yield self._body
+
+    def iter_lines(self):
+        yield from self._body.splitlines()
+
+
+class FakeTransport(Transport):
+    def __init__(self, handler):
+        self.handler = handler
+        self.calls = []
+
+    def request(self, method, url, headers, content=None, params=None, timeout=None, stream=False):
+        call = {
+            'method': method,
+            'url': url,
+            'headers': headers,
+            'content': content,
+            'params': params,
+            'timeout': timeout,
+            'stream': stream
+        }
+        self.calls.append(call)
+        return self.handler(call)
+
+
+class CookieHandler(BaseHTTPRequestHandler):
+    """Sets a session cookie on every response and records the Cookie header of each request."""
+
+    cookies = []
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        CookieHandler.cookies.append((self.headers['Authorization'], self.headers.get('Cookie')))
+        body = json.dumps({'data': {'conversation': {'id': 'conv-1'}}}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Set-Cookie', 'session=key-1-session; Path=/')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class TestConnectionPool:
+    """Test suite for ConnectionPool configuration and sharing"""
+
+    def test_adapter_uses_configured_sizes(self):
+        """Test that pool size settings reach the mounted adapter"""
+        client = ChatRoutes(api_key='key', pool_connections=4, pool_maxsize=64, pool_block=True)
+        adapter = client._http.session.get_adapter('https://api.chatroutes.com')
+
+        assert adapter._pool_connections == 4
+        assert adapter._pool_maxsize == 64
+        assert adapter._pool_block is True
+        assert adapter.max_retries.total == 0
+
+    def test_keep_alive_disabled_sends_connection_close(self):
+        """Test that keep_alive=False asks the server to close connections"""
+        pool = ConnectionPool(keep_alive=False)
+        assert pool.session.headers['Connection'] == 'close'
+
+    def test_shared_pool_keeps_api_keys_separate(self):
+        """Test that clients sharing a pool send their own credentials"""
+        pool = ConnectionPool(pool_maxsize=32)
+        first = ChatRoutes(api_key='key-1', pool=pool)
+        second = ChatRoutes(api_key='key-2', pool=pool)
+
+        assert first.pool is second.pool
+        assert 'Authorization' not in pool.session.headers
+
+        with patch.object(pool.session, 'request', return_value=json_response({})) as mock_request:
+            first.conversations.get('conv-1')
+            second.conversations.get('conv-1')
+
+        sent = [call[1]['headers']['Authorization'] for call in mock_request.call_args_list]
+        assert sent == ['ApiKey key-1', 'ApiKey key-2']
+
+    def test_shared_pool_keeps_cookies_separate(self):
+        """Test that a cookie set for one client is never sent by another on the same pool"""
+        CookieHandler.cookies = []
+        server = ThreadingHTTPServer(('127.0.0.1', 0), CookieHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        base_url = f'http://127.0.0.1:{server.server_address[1]}'
+
+        try:
+            pool = ConnectionPool()
+            first = ChatRoutes(api_key='key-1', base_url=base_url, pool=pool)
+            second = ChatRoutes(api_key='key-2', base_url=base_url, pool=pool)
+            first.conversations.get('conv-1')
+            second.conversations.get('conv-1')
+            first.conversations.get('conv-1')
+            pool.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert CookieHandler.cookies == [
+            ('ApiKey key-1', None), ('ApiKey key-2', None), ('ApiKey key-1', None)
+        ]
+        assert len(pool.session.cookies) == 0
+
+    def test_closing_client_leaves_shared_pool_open(self):
+        """Test that only the owner of a pool closes it"""
+        pool = ConnectionPool()
+        with ChatRoutes(api_key='key', pool=pool):
+            pass
+
+        assert pool.acquire() is pool.session
+
+        pool.close()
+        with pytest.raises(RuntimeError):
+            pool.acquire()
+
+    def test_idle_timeout_clears_stale_connections(self):
+        """Test that connections are dropped after the pool sits idle"""
+        pool = ConnectionPool(idle_timeout=5)
+        adapter = pool.session.get_adapter('https://api.chatroutes.com')
+
+        with patch('chatroutes.pool.time.monotonic', side_effect=[2.0, 10.0]), \
+                patch.object(adapter.poolmanager, 'clear') as mock_clear:
+            pool._last_used = 1.0
+            pool.acquire()
+            mock_clear.assert_not_called()
+            pool.acquire()
+            mock_clear.assert_called_once()
+
+    def test_client_is_safe_to_share_across_threads(self):
+        """Test concurrent requests from many threads through one client"""
+        client = ChatRoutes(api_key='key', pool_maxsize=64)
+        lock = threading.Lock()
+        seen = []
+
+        def fake_request(method, url, **kwargs):
+            with lock:
+                seen.append(url)
+            return json_response({'data': {'conversation': {'id': url.rsplit('/', 1)[-1]}}})
+
+        with patch.object(client.pool.session, 'request', side_effect=fake_request):
+            with ThreadPoolExecutor(max_workers=64) as executor:
+                results = list(executor.map(
+                    lambda i: client.conversations.get(f'conv-{i}'), range(256)
+                ))
+
+        assert [r['id'] for r in results] == [f'conv-{i}' for i in range(256)]
+        assert len(seen) == 256
+
+
+class TestTransports:
+    """Test suite for the pluggable transport layer"""
+
+    def test_default_transport_is_requests(self):
+        """Test that requests remains the default backend"""
+        client = ChatRoutes(api_key='key')
+        assert isinstance(client._http.transport, RequestsTransport)
+
+    def test_incomplete_transports_fail_when_built(self):
+        """Test that a transport or response missing required methods cannot be instantiated"""
+        class NoRequest(Transport):
+            pass
+
+        class NoBody(TransportResponse):
+            def read(self):
+                return b''
+
+        with pytest.raises(TypeError):
+            NoRequest()
+        with pytest.raises(TypeError):
+            NoBody()
+
+    def test_default_iter_lines_splits_body_chunks(self):
+        """Test that iter_lines is derived from iter_bytes when not overridden"""
+        class Chunked(TransportResponse):
+            def read(self):
+                return b''
+
+            def iter_bytes(self):
+                yield from (b'data: a\r\nda', b'ta: b\n', b'\nlast')
+
+        assert list(Chunked().iter_lines()) == [b'data: a', b'data: b', b'', b'last']
+
+    def test_custom_transport_receives_encoded_requests(self):
+        """Test that HttpClient delegates every call to the transport"""
+        transport = FakeTransport(
+            lambda call: FakeResponse(payload={'data': {'branch': {'id': 'branch-1'}}})
+        )
+        client = ChatRoutes(api_key='key', transport=transport)
+
+        branch = client.branches.create('conv-1', {'title': 'Alt'})
+
+        assert branch == {'id': 'branch-1'}
+        call = transport.calls[0]
+        assert call['method'] == 'POST'
+        assert call['url'].endswith('/conversations/conv-1/branches')
+        assert json.loads(call['content']) == {'title': 'Alt'}
+        assert call['headers']['Authorization'] == 'ApiKey key'
+        assert client.pool is None
+
+    def test_transport_errors_become_network_errors(self):
+        """Test that transport failures are retried and surfaced as NetworkError"""
+        def handler(call):
+            raise TransportError('connection reset')
+
+        transport = FakeTransport(handler)
+        client = ChatRoutes(api_key='key', transport=transport, retry_attempts=2, retry_delay=0)
+
+        with pytest.raises(NetworkError):
+            client.conversations.get('conv-1')
+        assert len(transport.calls) == 3
+
+    def test_error_responses_are_mapped(self):
+        """Test error mapping through a custom transport"""
+        transport = FakeTransport(lambda call: FakeResponse(404, {'message': 'nope'}))
+        client = ChatRoutes(api_key='key', transport=transport)
+
+        with pytest.raises(NotFoundError):
+            client.messages.list('conv-1')
+
+    def test_stream_uses_transport(self):
+        """Test that SSE streams are requested through the transport"""
+        body = (
+            b'data: {"type": "content", "content": "Hi"}\n\n'
+            b'data: {"type": "complete", "message": {"id": "msg-1"}}\n\n'
+            b'data: [DONE]\n\n'
+        )
+        transport = FakeTransport(lambda call: FakeResponse(body=body))
+        client = ChatRoutes(api_key='key', transport=transport)
+        chunks = []
+        completed = []
+
+        client.messages.stream('conv-1', {'content': 'Hi'}, chunks.append, completed.append)
+
+        assert transport.calls[0]['stream'] is True
+        assert transport.calls[0]['headers']['Accept'] == 'text/event-stream'
+        assert [c['type'] for c in chunks] == ['content', 'complete']
+        assert completed == [{'id': 'msg-1'}]
+
+    def test_unknown_transport_name(self):
+        """Test that unknown transport names are rejected"""
+        with pytest.raises(ValueError):
+            ChatRoutes(api_key='key', transport='carrier-pigeon')
+
+    def test_http2_transport(self):
+        """Test the httpx-based HTTP/2 transport"""
+        httpx = pytest.importorskip('httpx')
+        pytest.importorskip('h2')
+
+        def handler(request):
+            return httpx.Response(200, json={'data': {'conversation': {'id': 'conv-1'}}})
+
+        with ChatRoutes(api_key='key', transport='http2') as client:
+            assert isinstance(client._http.transport, HTTP2Transport)
+
+        transport = HTTP2Transport(client=httpx.Client(transport=httpx.MockTransport(handler)))
+        client = ChatRoutes(api_key='key', transport=transport)
+
+        assert client.conversations.get('conv-1') == {'id': 'conv-1'}
+
+    def test_http2_rejects_requests_only_pool_options(self):
+        """Test that pool options HTTP/2 cannot honour fail loudly and idle_timeout=0 is kept"""
+        with pytest.raises(ValueError):
+            ChatRoutes(api_key='key', transport='http2', pool=ConnectionPool())
+        with pytest.raises(ValueError):
+            ChatRoutes(api_key='key', transport='http2', pool_block=True)
+
+        with patch('chatroutes.transport.HTTP2Transport') as http2:
+            ChatRoutes(api_key='key', transport='http2', idle_timeout=0)
+        http2.assert_called_once_with(max_connections=10, idle_timeout=0)
+
+
+class TestRateLimiter:
+    """Test suite for the token-bucket rate limiter"""
+
+    def test_paces_requests_at_configured_rate(self):
+        """Test that reservations beyond the burst are spaced by 1/rate"""
+        limiter = RateLimiter(rate=10, burst=1)
+        with patch('chatroutes.rate_limit.time.monotonic', return_value=100.0):
+            limiter._updated = 100.0
+            delays = [limiter.reserve() for _ in range(3)]
+
+        assert delays == pytest.approx([0.0, 0.1, 0.2])
+
+    def test_refuses_to_wait_longer_than_max_wait(self):
+        """Test that excessive client-side waits raise RateLimitError"""
+        limiter = RateLimiter(max_wait=1.0)
+        limiter.on_rate_limited(30)
+
+        with pytest.raises(RateLimitError) as exc_info:
+            limiter.acquire()
+        assert exc_info.value.retry_after == 30
+
+    def test_learns_pace_from_headers(self):
+        """Test that remaining/reset headers set the sending rate when opted in"""
+        limiter = RateLimiter(learn_from_headers=True)
+        limiter.update_from_headers({'X-RateLimit-Remaining': '50', 'X-RateLimit-Reset': '10'})
+        assert limiter.current_rate == pytest.approx(5.0)
+
+        limiter.update_from_headers({'RateLimit-Remaining': '0', 'RateLimit-Reset': '4'})
+        assert limiter.reserve() == pytest.approx(4.0, abs=0.1)
+
+    def test_default_limiter_does_not_throttle_on_large_quota(self):
+        """Test that an unconfigured limiter ignores the pace but still honours exhaustion"""
+        limiter = RateLimiter()
+        limiter.update_from_headers({'X-RateLimit-Remaining': '999', 'X-RateLimit-Reset': '3600'})
+
+        assert limiter.current_rate is None
+        assert [limiter.reserve() for _ in range(20)] == [0.0] * 20
+
+        limiter.update_from_headers({'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': '2'})
+        assert limiter.reserve() == pytest.approx(2.0, abs=0.1)
+
+    def test_learned_pace_allows_bursting_the_remaining_quota(self):
+        """Test that a learned pace lets callers spend the reported remaining requests at once"""
+        limiter = RateLimiter(learn_from_headers=True)
+        with patch('chatroutes.rate_limit.time.monotonic', return_value=100.0):
+            limiter._updated = 100.0
+            limiter.update_from_headers({'X-RateLimit-Remaining': '999', 'X-RateLimit-Reset': '3600'})
+            delays = [limiter.reserve() for _ in range(999)]
+
+        assert max(delays) == 0.0
+
+    def test_429_halves_rate_and_recovers(self):
+        """Test multiplicative decrease on 429 and gradual recovery"""
+        limiter = RateLimiter(rate=20)
+        limiter.on_rate_limited(0)
+        assert limiter.current_rate == 10
+
+        for _ in range(50):
+            limiter.record_success()
+        assert limiter.current_rate == 20
+
+    def test_client_waits_out_retry_after(self):
+        """Test that wait_on_rate_limit sleeps for retry_after and retries"""
+        responses = [
+            FakeResponse(429, {'message': 'slow down', 'retryAfter': 2}),
+            FakeResponse(200, {'data': {'conversation': {'id': 'conv-1'}}})
+        ]
+        transport = FakeTransport(lambda call: responses.pop(0))
+        client = ChatRoutes(api_key='key', transport=transport, wait_on_rate_limit=True)
+
+        with patch('chatroutes.rate_limit.time.sleep') as mock_sleep:
+            assert client.conversations.get('conv-1') == {'id': 'conv-1'}
+
+        assert len(transport.calls) == 2
+        assert mock_sleep.call_args[0][0] == pytest.approx(2.0, abs=0.1)
+
+    def test_client_raises_with_retry_after_header(self):
+        """Test that 429 raises immediately by default, using the Retry-After header"""
+        transport = FakeTransport(
+            lambda call: FakeResponse(429, {'message': 'slow down'}, headers={'Retry-After': '3'})
+        )
+        client = ChatRoutes(api_key='key', transport=transport)
+
+        with pytest.raises(RateLimitError) as exc_info:
+            client.branches.list('conv-1')
+
+        assert exc_info.value.retry_after == 3
+        assert len(transport.calls) == 1
+        assert client.rate_limiter.reserve() == pytest.approx(3.0, abs=0.1)
+
+
+class TestRetryPolicy:
+    """Test suite for retries, idempotency keys and the retry budget"""
+
+    def test_post_retries_reuse_one_idempotency_key(self):
+        """Test that every retry of a POST carries the same generated key"""
+        responses = [
+            FakeResponse(503, {'message': 'busy'}),
+            FakeResponse(200, {'data': {'message': {'id': 'msg-1'}}})
+        ]
+        transport = FakeTransport(lambda call: responses.pop(0))
+        client = ChatRoutes(api_key='key', transport=transport, retry_delay=0)
+
+        client.messages.send('conv-1', {'content': 'Hi'})
+
+        keys = [call['headers']['Idempotency-Key'] for call in transport.calls]
+        assert len(keys) == 2
+        assert keys[0] == keys[1]
+
+    def test_each_logical_post_gets_a_new_key(self):
+        """Test that separate calls do not share idempotency keys"""
+        transport = FakeTransport(lambda call: FakeResponse(200, {}))
+        client = ChatRoutes(api_key='key', transport=transport)
+
+        client.messages.send('conv-1', {'content': 'a'})
+        client.messages.send('conv-1', {'content': 'b'})
+
+        keys = {call['headers']['Idempotency-Key'] for call in transport.calls}
+        assert len(keys) == 2
+
+    def test_get_requests_do_not_send_keys(self):
+        """Test that naturally idempotent methods are left untouched"""
+        transport = FakeTransport(lambda call: FakeResponse(200, {}))
+        ChatRoutes(api_key='key', transport=transport).conversations.get('conv-1')
+
+        assert 'Idempotency-Key' not in transport.calls[0]['headers']
+
+    def test_post_without_key_is_not_retried(self):
+        """Test that POSTs are not replayed when idempotency keys are disabled"""
+        def handler(call):
+            raise TransportError('read timed out')
+
+        transport = FakeTransport(handler)
+        policy = RetryPolicy(backoff_base=0, idempotency_keys=False, budget=RetryBudget())
+        client = ChatRoutes(api_key='key', transport=transport, retry_policy=policy)
+
+        with pytest.raises(NetworkError):
+            client.branches.fork('conv-1', {'forkPointMessageId': 'msg-1'})
+        assert len(transport.calls) == 1
+
+    def test_per_method_rules(self):
+        """Test that retry_methods controls which methods are retried"""
+        transport = FakeTransport(lambda call: FakeResponse(500, {'message': 'boom'}))
+        policy = RetryPolicy(max_retries=2, backoff_base=0, retry_methods=['PATCH'], budget=RetryBudget())
+        client = ChatRoutes(api_key='key', transport=transport, retry_policy=policy)
+
+        with pytest.raises(ServerError):
+            client.conversations.get('conv-1')
+        assert len(transport.calls) == 1
+
+        with pytest.raises(ServerError):
+            client.messages.update('msg-1', 'edited')
+        assert len(transport.calls) == 4
+
+    def test_budget_stops_retry_storms(self):
+        """Test that an exhausted budget fails fast instead of retrying"""
+        transport = FakeTransport(lambda call: FakeResponse(503, {'message': 'down'}))
+        budget = RetryBudget(ratio=0.0, min_per_second=0.0, max_tokens=2)
+        policy = RetryPolicy(max_retries=5, backoff_base=0, budget=budget)
+        client = ChatRoutes(api_key='key', transport=transport, retry_policy=policy)
+
+        for _ in range(3):
+            with pytest.raises(ServerError):
+                client.conversations.get('conv-1')
+
+        assert len(transport.calls) == 5
+
+    def test_backoff_jitter_is_bounded(self):
+        """Test that jittered backoff stays within the exponential envelope"""
+        policy = RetryPolicy(backoff_base=1.0, backoff_max=5.0)
+        for attempt in range(6):
+            assert 0 <= policy.backoff(attempt) <= min(5.0, 2 ** attempt)
+
+        assert RetryPolicy(backoff_base=1.0, jitter=False).backoff(2) == 4.0
+
+
+class TestDeadlines:
+    """Test suite for split timeouts and per-call deadlines"""
+
+    def test_connect_and_read_timeouts_are_separate(self):
+        """Test that transports receive a (connect, read) timeout pair"""
+        transport = FakeTransport(lambda call: FakeResponse(200, {}))
+        client = ChatRoutes(api_key='key', transport=transport, connect_timeout=2, read_timeout=10)
+
+        client.conversations.get('conv-1')
+
+        assert transport.calls[0]['timeout'] == (2, 10)
+
+    def test_deadline_clamps_attempt_timeouts(self):
+        """Test that no attempt may outlive the remaining deadline"""
+        transport = FakeTransport(lambda call: FakeResponse(200, {}))
+        client = ChatRoutes(api_key='key', transport=transport, timeout=30)
+
+        with client.deadline(1.5):
+            client.conversations.get('conv-1')
+
+        connect, read = transport.calls[0]['timeout']
+        assert 0 < connect <= 1.5
+        assert 0 < read <= 1.5
+
+    def test_retries_stop_when_budget_cannot_fit_another_attempt(self):
+        """Test that backoff longer than the remaining budget ends the retry loop"""
+        transport = FakeTransport(lambda call: FakeResponse(503, {'message': 'busy'}))
+        policy = RetryPolicy(max_retries=5, backoff_base=1.0, jitter=False, budget=RetryBudget())
+        client = ChatRoutes(api_key='key', transport=transport, retry_policy=policy, total_timeout=0.5)
+
+        with patch('chatroutes.http_client.time.sleep') as mock_sleep:
+            with pytest.raises(ServerError):
+                client.conversations.get('conv-1')
+
+        assert len(transport.calls) == 1
+        mock_sleep.assert_not_called()
+
+    def test_expired_deadline_raises_deadline_error(self):
+        """Test that a call which runs out of time raises DeadlineExceededError"""
+        def handler(call):
+            time.sleep(0.06)
+            raise TransportError('read timed out')
+
+        client = ChatRoutes(api_key='key', transport=FakeTransport(handler))
+
+        with pytest.raises(DeadlineExceededError) as exc_info:
+            with deadline(0.05):
+                client.conversations.get('conv-1')
+
+        assert isinstance(exc_info.value, NetworkError)
+        assert exc_info.value.code == 'DEADLINE_EXCEEDED'
+
+    def test_nested_deadlines_only_tighten(self):
+        """Test that an inner block cannot extend an outer deadline"""
+        with deadline(1.0) as outer:
+            with deadline(60.0) as inner:
+                assert inner is outer
+            with deadline(0.5) as tighter:
+                assert tighter.remaining() <= 0.5
+
+
+class RecordingCodec(StdlibJSONCodec):
+    def __init__(self):
+        self.encoded = []
+        self.decoded = []
+
+    def dumps(self, obj):
+        self.encoded.append(obj)
+        return super().dumps(obj)
+
+    def loads(self, data):
+        self.decoded.append(data)
+        return super().loads(data)
+
+
+class TestJSONCodec:
+    """Test suite for pluggable JSON encoding and decoding"""
+
+    def test_default_prefers_orjson(self):
+        """Test that the optimized codec is picked when installed"""
+        pytest.importorskip('orjson')
+        client = ChatRoutes(api_key='key')
+        assert client._http.codec.name == 'orjson'
+
+    def test_incomplete_codec_fails_when_built(self):
+        """Test that a codec without loads cannot be instantiated"""
+        class EncodeOnly(JSONCodec):
+            def dumps(self, obj):
+                return b'{}'
+
+        with pytest.raises(TypeError):
+            EncodeOnly()
+
+    def test_stdlib_fallback(self):
+        """Test that the stdlib codec is used when orjson is missing"""
+        with patch('chatroutes.codec.orjson', None):
+            client = ChatRoutes(api_key='key')
+        assert isinstance(client._http.codec, StdlibJSONCodec)
+
+    def test_codecs_round_trip_bytes(self):
+        """Test that every codec encodes to bytes and decodes bytes"""
+        codecs = [StdlibJSONCodec()]
+        try:
+            from chatroutes import OrjsonCodec
+            codecs.append(OrjsonCodec())
+        except ImportError:
+            pass
+
+        payload = {'content': 'héllo 🎉', 'n': [1, 2.5, None, True]}
+        for codec in codecs:
+            encoded = codec.dumps(payload)
+            assert isinstance(encoded, bytes)
+            assert codec.loads(encoded) == payload
+
+    def test_client_uses_codec_for_bodies_and_sse(self):
+        """Test that requests, responses and SSE events all go through the codec"""
+        codec = RecordingCodec()
+        body = b'data: {"type": "content", "content": "Hi"}\n\ndata: [DONE]\n\n'
+        responses = [FakeResponse(200, {'data': {'message': {}}}), FakeResponse(body=body)]
+        transport = FakeTransport(lambda call: responses.pop(0))
+        client = ChatRoutes(api_key='key', transport=transport, json_codec=codec)
+
+        client.messages.send('conv-1', {'content': 'Hi'})
+        client.messages.stream('conv-1', {'content': 'Hi'}, lambda chunk: None)
+
+        assert codec.encoded == [{'content': 'Hi'}, {'content': 'Hi'}]
+        assert all(isinstance(data, (bytes, memoryview)) for data in codec.decoded)
+        assert len(codec.decoded) == 2
+
+    def test_unknown_codec_name(self):
+        """Test that unknown codec names are rejected"""
+        with pytest.raises(ValueError):
+            ChatRoutes(api_key='key', json_codec='yaml')
+
+
+class GzipSSEHandler(BaseHTTPRequestHandler):
+    received = []
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        if self.headers.get('Content-Encoding') == 'gzip':
+            body = gzip.decompress(body)
+        GzipSSEHandler.received.append((dict(self.headers), json.loads(body)))
+
+        events = b''.join(
+            b'data: ' + json.dumps({'type': 'content', 'content': str(i)}).encode() + b'\n\n'
+            for i in range(200)
+        ) + b'data: [DONE]\n\n'
+        compressed = gzip.compress(events)
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(compressed)))
+        self.end_headers()
+        self.wfile.write(compressed)
+
+
+class TestCompression:
+    """Test suite for request compression and response encoding negotiation"""
+
+    def test_large_bodies_are_gzipped(self):
+        """Test that bodies above the threshold are compressed"""
+        transport = FakeTransport(lambda call: FakeResponse(200, {}))
+        client = ChatRoutes(
+            api_key='key',
+            transport=transport,
+            compress_requests=True,
+            compression_threshold=100
+        )
+        long_text = 'branching ' * 500
+
+        client.autobranch.suggest_branches(text=long_text)
+        client.messages.send('conv-1', {'content': 'short'})
+
+        large, small = transport.calls
+        assert large['headers']['Content-Encoding'] == 'gzip'
+        assert json.loads(gzip.decompress(large['content']))['text'] == long_text
+        assert len(large['content']) < len(long_text)
+        assert 'Content-Encoding' not in small['headers']
+        assert json.loads(small['content']) == {'content': 'short'}
+
+    def test_compression_is_opt_in(self):
+        """Test that bodies are sent uncompressed by default"""
+        transport = FakeTransport(lambda call: FakeResponse(200, {}))
+        ChatRoutes(api_key='key', transport=transport).messages.send('conv-1', {'content': 'x' * 5000})
+
+        assert 'Content-Encoding' not in transport.calls[0]['headers']
+
+    def test_response_encoding_is_negotiated(self):
+        """Test that clients advertise compressed response support"""
+        transport = FakeTransport(lambda call: FakeResponse(200, {}))
+        ChatRoutes(api_key='key', transport=transport).conversations.get_tree('conv-1')
+        assert 'gzip' in transport.calls[0]['headers']['Accept-Encoding']
+
+        transport = FakeTransport(lambda call: FakeResponse(200, {}))
+        ChatRoutes(api_key='key', transport=transport, accept_compressed=False).conversations.get_tree('conv-1')
+        assert 'Accept-Encoding' not in transport.calls[0]['headers']
+
+    def test_accept_encoding_matches_transport_decoders(self):
+        """Test that only encodings the transport can decode are advertised"""
+        with patch('urllib3.util.request.ACCEPT_ENCODING', 'gzip,deflate'):
+            client = ChatRoutes(api_key='key')
+            assert client._http.headers['Accept-Encoding'] == 'gzip, deflate'
+
+        with patch('urllib3.util.request.ACCEPT_ENCODING', 'gzip,deflate,br,zstd'):
+            assert RequestsTransport().accepted_encodings() == 'gzip, deflate, br, zstd'
+
+        transport = FakeTransport(lambda call: FakeResponse(200, {}))
+        ChatRoutes(api_key='key', transport=transport).conversations.get_tree('conv-1')
+        assert transport.calls[0]['headers']['Accept-Encoding'] == 'gzip, deflate'
+
+    def test_httpx_encodings_follow_installed_decoders(self):
+        """Test that br and zstd are advertised for httpx only when their packages import"""
+        with patch('chatroutes.compression._importable', return_value=False):
+            assert httpx_encodings() == 'gzip, deflate'
+        with patch('chatroutes.compression._importable', side_effect=lambda name: name == 'brotlicffi'):
+            assert httpx_encodings() == 'gzip, deflate, br'
+        with patch('chatroutes.compression._importable', return_value=True):
+            assert httpx_encodings() == 'gzip, deflate, br, zstd'
+
+    def test_streaming_decompression_end_to_end(self):
+        """Test gzip request bodies and gzip SSE responses against a local server"""
+        server = ThreadingHTTPServer(('127.0.0.1', 0), GzipSSEHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        GzipSSEHandler.received = []
+
+        try:
+            with ChatRoutes(
+                api_key='key',
+                base_url=f'http://127.0.0.1:{server.server_port}',
+                compress_requests=True,
+                compression_threshold=10
+            ) as client:
+                chunks = []
+                client.messages.stream('conv-1', {'content': 'y' * 1000}, chunks.append)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        headers, body = GzipSSEHandler.received[0]
+        assert headers['Content-Encoding'] == 'gzip'
+        assert body == {'content': 'y' * 1000}
+        assert [c['content'] for c in chunks] == [str(i) for i in range(200)]
+
+
+class TestCircuitBreaker:
+    """Test suite for per-endpoint circuit breakers"""
+
+    def test_paths_map_to_endpoint_groups(self):
+        """Test the endpoint grouping used to pick a breaker"""
+        assert endpoint_group('/conversations') == 'conversations'
+        assert endpoint_group('/conversations/c1/tree') == 'conversations'
+        assert endpoint_group('/conversations/c1/messages/stream') == 'messages'
+        assert endpoint_group('/messages/m1') == 'messages'
+        assert endpoint_group('/conversations/c1/branches/b1/messages') == 'branches'
+        assert endpoint_group('/conversations/c1/fork') == 'branches'
+        assert endpoint_group('/checkpoints/cp1/recreate') == 'checkpoints'
+        assert endpoint_group('/autobranch/health') == 'autobranch'
+
+    def test_opens_after_error_rate_and_recovers_through_probes(self):
+        """Test closed -> open -> half-open -> closed transitions"""
+        breaker = CircuitBreaker(
+            'messages',
+            failure_threshold=0.5,
+            minimum_requests=4,
+            recovery_timeout=10,
+            half_open_max_calls=2
+        )
+        clock = [100.0]
+
+        with patch('chatroutes.circuit_breaker.time.monotonic', side_effect=lambda: clock[0]):
+            for ok in (True, False, True, False):
+                breaker.before_call()
+                breaker.record_success() if ok else breaker.record_failure()
+            assert breaker.state == 'open'
+
+            with pytest.raises(CircuitOpenError) as exc_info:
+                breaker.before_call()
+            assert exc_info.value.endpoint == 'messages'
+            assert exc_info.value.retry_after == pytest.approx(10)
+
+            clock[0] += 10
+            assert breaker.state == 'half_open'
+            breaker.before_call()
+            breaker.before_call()
+            with pytest.raises(CircuitOpenError):
+                breaker.before_call()
+
+            breaker.record_success()
+            breaker.record_success()
+            assert breaker.state == 'closed'
+
+    def test_failed_probe_reopens(self):
+        """Test that any failure while half-open opens the circuit again"""
+        breaker = CircuitBreaker('branches', minimum_requests=1, recovery_timeout=0)
+        breaker.record_failure()
+        assert breaker.state == 'half_open'
+
+        breaker.before_call()
+        breaker.record_failure()
+        assert breaker.times_opened == 2
+
+    def test_client_fails_fast_per_endpoint(self):
+        """Test that an open breaker short-circuits only its endpoint group"""
+        def handler(call):
+            if '/messages' in call['url']:
+                return FakeResponse(503, {'message': 'down'})
+            return FakeResponse(200, {'data': {'conversation': {'id': 'conv-1'}}})
+
+        transport = FakeTransport(handler)
+        registry = CircuitBreakerRegistry(minimum_requests=3, recovery_timeout=60)
+        policy = RetryPolicy(max_retries=5, backoff_base=0, budget=RetryBudget())
+        client = ChatRoutes(
+            api_key='key',
+            transport=transport,
+            retry_policy=policy,
+            circuit_breaker=registry
+        )
+
+        with pytest.raises(CircuitOpenError):
+            client.messages.list('conv-1')
+        assert len(transport.calls) == 3
+
+        with pytest.raises(CircuitOpenError):
+            client.messages.send('conv-1', {'content': 'Hi'})
+        assert len(transport.calls) == 3
+
+        assert client.conversations.get('conv-1') == {'id': 'conv-1'}
+        assert client.circuit_breakers.states()['messages'] == 'open'
+        assert client.circuit_breakers.snapshot()['messages']['rejected'] == 2
+
+    def test_client_errors_do_not_trip_the_breaker(self):
+        """Test that 4xx responses are not counted as upstream failures"""
+        transport = FakeTransport(lambda call: FakeResponse(404, {'message': 'nope'}))
+        client = ChatRoutes(
+            api_key='key',
+            transport=transport,
+            circuit_breaker=CircuitBreakerRegistry(minimum_requests=1)
+        )
+
+        for _ in range(5):
+            with pytest.raises(NotFoundError):
+                client.conversations.get('missing')
+
+        assert client.circuit_breakers.states()['conversations'] == 'closed'
+
+    def test_probe_slot_is_returned_when_attempt_never_completes(self):
+        """Test that a half-open probe refused by the rate limiter does not wedge the breaker"""
+        statuses = [500]
+        transport = FakeTransport(
+            lambda call: FakeResponse(statuses.pop(0) if statuses else 200, {'data': {'conversation': {}}})
+        )
+        limiter = RateLimiter(max_wait=0.5)
+        client = ChatRoutes(
+            api_key='key',
+            transport=transport,
+            rate_limit=limiter,
+            retry_policy=RetryPolicy(max_retries=0),
+            circuit_breaker=CircuitBreakerRegistry(
+                minimum_requests=1, recovery_timeout=0.05, half_open_max_calls=1
+            )
+        )
+
+        with pytest.raises(ServerError):
+            client.conversations.get('conv-1')
+        time.sleep(0.06)
+        assert client.circuit_breakers.states()['conversations'] == 'half_open'
+
+        limiter.on_rate_limited(5)
+        with pytest.raises(RateLimitError):
+            client.conversations.get('conv-1')
+        assert len(transport.calls) == 1
+
+        limiter._paused_until = 0.0
+        for _ in range(3):
+            client.conversations.get('conv-1')
+        assert client.circuit_breakers.states()['conversations'] == 'closed'
+
+    def test_probe_slot_is_returned_when_reading_the_body_fails(self):
+        """Test that an exception while reading a response releases the probe slot"""
+        class BrokenBody(FakeResponse):
+            def read(self):
+                raise KeyboardInterrupt
+
+        responses = [FakeResponse(500, {}), BrokenBody(200), FakeResponse(200, {})]
+        transport = FakeTransport(lambda call: responses.pop(0))
+        client = ChatRoutes(
+            api_key='key',
+            transport=transport,
+            retry_policy=RetryPolicy(max_retries=0),
+            circuit_breaker=CircuitBreakerRegistry(
+                minimum_requests=1, recovery_timeout=0, half_open_max_calls=1
+            )
+        )
+
+        with pytest.raises(ServerError):
+            client.conversations.get('conv-1')
+        with pytest.raises(KeyboardInterrupt):
+            client.conversations.get('conv-1')
+
+        client.conversations.get('conv-1')
+        assert client.circuit_breakers.states()['conversations'] == 'closed'
+
+    def test_breakers_are_disabled_by_default(self):
+        """Test that circuit breaking is opt-in"""
+        assert ChatRoutes(api_key='key').circuit_breakers is None
+
+
+def slow_first_call_transport(slow_seconds=0.5):
+    lock = threading.Lock()
+    release = threading.Event()
+
+    def handler(call):
+        with lock:
+            index = len(transport.calls) - 1
+        if index == 0:
+            release.wait(slow_seconds)
+            return FakeResponse(200, {'data': {'conversation': {'id': 'slow'}}})
+        return FakeResponse(200, {'data': {'conversation': {'id': 'fast'}}})
+
+    transport = FakeTransport(handler)
+    transport.release = release
+    return transport
+
+
+class TestHedging:
+    """Test suite for hedged GET requests"""
+
+    def test_slow_primary_is_hedged_and_hedge_wins(self):
+        """Test that a second request is sent after the delay and the faster one wins"""
+        transport = slow_first_call_transport()
+        client = ChatRoutes(api_key='key', transport=transport, hedging=HedgingPolicy(delay=0.02))
+
+        try:
+            assert client.conversations.get('conv-1') == {'id': 'fast'}
+        finally:
+            transport.release.set()
+            client.close()
+
+        assert len(transport.calls) == 2
+        stats = client.hedging.stats()
+        assert stats['hedged'] == 1
+        assert stats['hedgeWins'] == 1
+
+    def test_body_failing_mid_read_is_retried(self):
+        """Test that a hedged response whose body drops is a retried network failure"""
+        class TruncatedBody(FakeResponse):
+            def read(self):
+                raise TransportError('connection broken: IncompleteRead')
+
+        responses = [TruncatedBody(200), FakeResponse(200, {'data': {'conversation': {'id': 'conv-1'}}})]
+        transport = FakeTransport(lambda call: responses.pop(0))
+        registry = CircuitBreakerRegistry(minimum_requests=100)
+        client = ChatRoutes(
+            api_key='key',
+            transport=transport,
+            retry_policy=RetryPolicy(backoff_base=0),
+            circuit_breaker=registry,
+            hedging=HedgingPolicy(delay=5.0)
+        )
+
+        try:
+            assert client.conversations.get('conv-1') == {'id': 'conv-1'}
+        finally:
+            client.close()
+
+        assert len(transport.calls) == 2
+        assert transport.calls[0]['stream'] is True
+        assert registry.get('conversations')._failures == 1
+
+    def test_losing_primary_is_closed(self):
+        """Test that the hedge's win closes the primary's response mid-body"""
+        class SlowBody(FakeResponse):
+            def __init__(self):
+                super().__init__(200, {'data': {'conversation': {'id': 'slow'}}})
+                self.closed = threading.Event()
+
+            def read(self):
+                if self.closed.wait(2.0):
+                    raise TransportError('closed')
+                return super().read()
+
+            def close(self):
+                self.closed.set()
+
+        slow = SlowBody()
+        responses = [slow, FakeResponse(200, {'data': {'conversation': {'id': 'fast'}}})]
+        transport = FakeTransport(lambda call: responses.pop(0))
+        client = ChatRoutes(api_key='key', transport=transport, hedging=HedgingPolicy(delay=0.02))
+
+        started = time.monotonic()
+        try:
+            assert client.conversations.get('conv-1') == {'id': 'fast'}
+        finally:
+            client.close()
+
+        assert time.monotonic() - started < 1.0
+        assert slow.closed.is_set()
+        assert client.hedging.stats()['hedgeWins'] == 1
+
+    def test_primaries_are_not_limited_by_hedge_workers(self):
+        """Test that primary requests run on the caller's thread, outside the hedge pool"""
+        def handler(call):
+            time.sleep(0.1)
+            return FakeResponse(200, {'data': {'conversation': {'id': 'conv-1'}}})
+
+        transport = FakeTransport(handler)
+        client = ChatRoutes(
+            api_key='key',
+            transport=transport,
+            hedging=HedgingPolicy(delay=5.0, max_workers=1)
+        )
+
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda i: client.conversations.get('conv-1'), range(8)))
+        elapsed = time.monotonic() - started
+        client.close()
+
+        assert elapsed < 0.5
+        assert client.hedging.stats()['hedged'] == 0
+        assert max(client.hedging._latencies) < 0.3
+
+    def test_fast_primary_is_not_hedged(self):
+        """Test that responses within the delay never trigger a hedge"""
+        transport = FakeTransport(lambda call: FakeResponse(200, {'data': {'branches': []}}))
+        client = ChatRoutes(api_key='key', transport=transport, hedging=HedgingPolicy(delay=1.0))
+
+        for _ in range(5):
+            client.branches.list('conv-1')
+
+        assert len(transport.calls) == 5
+        assert client.hedging.stats()['hedged'] == 0
+
+    def test_extra_load_is_capped(self):
+        """Test that max_extra_load limits how many requests are hedged"""
+        policy = HedgingPolicy(delay=0.0, max_extra_load=0.25)
+        policy._hedge_tokens = 0.0
+
+        fired = 0
+        for _ in range(8):
+            policy.record_request()
+            fired += policy.try_acquire_hedge()
+
+        assert fired == 2
+
+    def test_percentile_delay_needs_samples(self):
+        """Test that the adaptive delay uses observed latency percentiles"""
+        policy = HedgingPolicy(percentile=0.9, min_samples=10)
+        assert policy.hedge_delay() is None
+
+        for latency in range(1, 101):
+            policy.record_latency(latency / 100)
+        assert policy.hedge_delay() == pytest.approx(0.91)
+
+    def test_mutations_are_never_hedged(self):
+        """Test that only GET requests are hedged"""
+        transport = slow_first_call_transport(slow_seconds=0.1)
+        client = ChatRoutes(api_key='key', transport=transport, hedging=HedgingPolicy(delay=0.01))
+
+        client.messages.send('conv-1', {'content': 'Hi'})
+
+        assert len(transport.calls) == 1
+        assert client.hedging.stats()['requests'] == 0
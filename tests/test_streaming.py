@@ -0,0 +1,857 @@
+"""
+Tests for streamed message responses:
+- Iterator-based streaming (MessageStream)
+- Incremental SSE parsing
+- Resuming dropped streams with Last-Event-ID
+- Stream timing statistics and the metrics hook
+- Multi-model / multi-branch stream fan-out
+- Bounded reader buffers and overflow modes
+- Idle timeouts, stream deadlines and keep-alive comments
+- Writing streamed content to sinks
+"""
+
+import functools
+import io
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+from chatroutes import (
+    BufferedStream,
+    ChatRoutes,
+    DeadlineExceededError,
+    MessageStream,
+    NetworkError,
+    RetryPolicy,
+    ServerError,
+    SSEParser,
+    StreamFanOut,
+    StreamStalledError,
+    StreamStats,
+    Transport,
+    TransportError,
+    TransportResponse,
+    first_complete,
+    set_metrics_hook
+)
+from chatroutes.streaming import write_stream
+
+
+def sse_body(*events, done=True, ids=None):
+    lines = []
+    for index, event in enumerate(events):
+        if ids is not None:
+            lines.append(f'id: {ids[index]}\n'.encode('utf-8'))
+        lines.append(b'data: ' + json.dumps(event).encode('utf-8') + b'\n\n')
+    if done:
+        lines.append(b'data: [DONE]\n\n')
+    return b''.join(lines)
+
+
+class StreamResponse(TransportResponse):
+    def __init__(self, body=b'', status_code=200, headers=None, fail_after=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self._body = body
+        self.fail_after = fail_after
+        self.lines_read = 0
+        self.closed = False
+
+    def read(self):
+        return self._body
+
+    def iter_bytes(self):
+        for line in self._body.splitlines(keepends=True):
+            if self.fail_after is not None and self.lines_read >= self.fail_after:
+                raise TransportError('connection reset')
+            self.lines_read += 1
+            yield line
+
+    def close(self):
+        self.closed = True
+
+
+class StreamTransport(Transport):
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def request(self, method, url, headers, content=None, params=None, timeout=None, stream=False):
+        self.calls.append({
+            'method': method,
+            'url': url,
+            'headers': headers,
+            'content': content,
+            'timeout': timeout,
+            'stream': stream
+        })
+        return self.responses.pop(0)
+
+
+STORY = (
+    {'type': 'content', 'content': 'Once'},
+    {'type': 'content', 'content': ' upon'},
+    {'type': 'content', 'content': ' a time'},
+    {'type': 'complete', 'message': {'id': 'msg-1', 'content': 'Once upon a time'}}
+)
+
+
+class TestMessageStream:
+    """Test suite for iterator-based streaming"""
+
+    def test_stream_iter_yields_chunks_and_complete_message(self):
+        """Test that the iterator yields every chunk and exposes the final message"""
+        response = StreamResponse(sse_body(*STORY))
+        client = ChatRoutes(api_key='key', transport=StreamTransport(response))
+
+        with client.messages.stream_iter('conv-1', {'content': 'Tell me a story'}) as stream:
+            assert isinstance(stream, MessageStream)
+            contents = [chunk['content'] for chunk in stream if chunk['type'] == 'content']
+
+        assert contents == ['Once', ' upon', ' a time']
+        assert stream.complete_message == {'id': 'msg-1', 'content': 'Once upon a time'}
+        assert response.closed
+
+    def test_breaking_early_closes_connection(self):
+        """Test that leaving the with block stops reading and releases the connection"""
+        response = StreamResponse(sse_body(*STORY))
+        client = ChatRoutes(api_key='key', transport=StreamTransport(response))
+
+        with client.messages.stream_iter('conv-1', {'content': 'Hi'}) as stream:
+            first = next(stream)
+
+        assert first['content'] == 'Once'
+        assert response.closed
+        assert response.lines_read == 2
+        assert stream.complete_message is None
+        assert list(stream) == []
+
+    def test_branch_stream_sends_branch_id(self):
+        """Test that branch streaming targets the branch through the stream endpoint"""
+        transport = StreamTransport(StreamResponse(sse_body(*STORY)))
+        client = ChatRoutes(api_key='key', transport=transport)
+
+        with client.branches.send_message_iter('conv-1', 'branch-2', {'content': 'Hi'}) as stream:
+            assert stream.until_done() == {'id': 'msg-1', 'content': 'Once upon a time'}
+
+        call = transport.calls[0]
+        assert call['url'].endswith('/conversations/conv-1/messages/stream')
+        assert call['stream'] is True
+        assert json.loads(call['content'])['branchId'] == 'branch-2'
+
+    def test_callback_stream_uses_iterator(self):
+        """Test that the callback API still delivers chunks and the complete message"""
+        response = StreamResponse(sse_body(*STORY))
+        client = ChatRoutes(api_key='key', transport=StreamTransport(response))
+        chunks, completed = [], []
+
+        client.messages.stream('conv-1', {'content': 'Hi'}, chunks.append, completed.append)
+
+        assert len(chunks) == 4
+        assert completed == [{'id': 'msg-1', 'content': 'Once upon a time'}]
+        assert response.closed
+
+    def test_error_status_raises_before_iteration(self):
+        """Test that HTTP errors are raised when the stream is opened"""
+        response = StreamResponse(json.dumps({'message': 'boom'}).encode('utf-8'), status_code=500)
+        client = ChatRoutes(api_key='key', transport=StreamTransport(response))
+
+        with pytest.raises(ServerError):
+            client.messages.stream_iter('conv-1', {'content': 'Hi'})
+        assert response.closed
+
+    def test_transport_error_mid_stream_is_network_error(self):
+        """Test that a dropped connection surfaces as NetworkError and closes the stream"""
+        response = StreamResponse(sse_body(*STORY), fail_after=3)
+        client = ChatRoutes(api_key='key', transport=StreamTransport(response))
+        stream = client.messages.stream_iter('conv-1', {'content': 'Hi'})
+
+        assert next(stream)['content'] == 'Once'
+        with pytest.raises(NetworkError):
+            list(stream)
+        assert stream.closed
+        assert response.closed
+
+
+def parse_all(parser, *chunks):
+    return [event for chunk in chunks for event in parser.feed(chunk)]
+
+
+class TestSSEParser:
+    """Test suite for the incremental SSE parser"""
+
+    def test_events_split_at_every_byte(self):
+        """Test that events are reassembled however the bytes are chunked"""
+        body = sse_body(*STORY)
+        whole = parse_all(SSEParser(), body)
+        byte_by_byte = parse_all(SSEParser(), *[body[i:i + 1] for i in range(len(body))])
+
+        assert len(whole) == 5
+        assert [bytes(event.data) for event in byte_by_byte] == [bytes(event.data) for event in whole]
+
+    def test_fields_comments_and_multiline_data(self):
+        """Test event/id/retry fields, comment heartbeats and multi-line data"""
+        parser = SSEParser()
+        events = parse_all(
+            parser,
+            b': keep-alive\n\n',
+            b'event: delta\nid: 7\nretry: 1500\ndata: {"content":\ndata: "Hi"}\n\n',
+            b'data:no-space\n\n'
+        )
+
+        assert parser.comments == 1
+        assert len(events) == 2
+        assert events[0].event == 'delta'
+        assert events[0].id == '7'
+        assert events[0].retry == 1500
+        assert events[0].text == '{"content":\n"Hi"}'
+        assert events[1].event == 'message'
+        assert events[1].id == '7'
+        assert events[1].text == 'no-space'
+        assert parser.last_event_id == '7'
+        assert parser.retry == 1500
+
+    def test_crlf_split_across_chunks(self):
+        """Test that CRLF and lone CR terminators work across chunk boundaries"""
+        events = parse_all(SSEParser(), b'data: a\r', b'\n\r', b'\ndata: b\r\r')
+
+        assert [event.text for event in events] == ['a', 'b']
+
+    def test_malformed_events_are_reported(self):
+        """Test that malformed payloads go to the parse error hook and counter"""
+        errors = []
+        body = b'data: {not json\n\ndata: [1, 2]\n\n' + sse_body(*STORY)
+        client = ChatRoutes(
+            api_key='key',
+            transport=StreamTransport(StreamResponse(body)),
+            on_parse_error=lambda error, event: errors.append(event.text)
+        )
+
+        with client.messages.stream_iter('conv-1', {'content': 'Hi'}) as stream:
+            chunks = list(stream)
+
+        assert len(chunks) == 4
+        assert stream.parse_errors == 2
+        assert errors == ['{not json', '[1, 2]']
+
+    def test_event_name_becomes_chunk_type(self):
+        """Test that a named event without a type field is typed by its event name"""
+        body = b'event: content\ndata: {"content": "Hi"}\n\ndata: [DONE]\n\n'
+        client = ChatRoutes(api_key='key', transport=StreamTransport(StreamResponse(body)))
+
+        with client.messages.stream_iter('conv-1', {'content': 'Hi'}) as stream:
+            assert list(stream) == [{'type': 'content', 'content': 'Hi'}]
+
+
+TOKENS = [{'type': 'content', 'content': f'token-{i} '} for i in range(6)]
+FINAL = {'type': 'complete', 'message': {'id': 'msg-1'}}
+EVENTS = TOKENS + [FINAL]
+
+
+class DroppingSSEHandler(BaseHTTPRequestHandler):
+    """Sends three events, then drops the connection mid-event on the first request."""
+
+    protocol_version = 'HTTP/1.1'
+    requests = []
+
+    def log_message(self, format, *args):
+        pass
+
+    def write_chunk(self, data, declared=None):
+        self.wfile.write(b'%x\r\n' % (declared or len(data)) + data)
+        if declared is None:
+            self.wfile.write(b'\r\n')
+        self.wfile.flush()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        last_event_id = self.headers.get('Last-Event-ID')
+        DroppingSSEHandler.requests.append(dict(self.headers))
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        self.close_connection = True
+
+        if last_event_id is None:
+            for index, event in enumerate(EVENTS[:3]):
+                self.write_chunk(sse_body(event, ids=[index], done=False))
+            self.write_chunk(b'id: 3\ndata: {"type": "con', declared=100)
+            return
+
+        start = int(last_event_id)
+        self.write_chunk(sse_body(*EVENTS[start:], ids=range(start, len(EVENTS))))
+        self.write_chunk(b'')
+
+
+class TestStreamResume:
+    """Test suite for resuming dropped streams"""
+
+    def test_resumes_against_local_server_without_duplicates(self):
+        """Test that a dropped stream reconnects with Last-Event-ID and loses nothing"""
+        DroppingSSEHandler.requests = []
+        server = ThreadingHTTPServer(('127.0.0.1', 0), DroppingSSEHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+
+        try:
+            client = ChatRoutes(
+                api_key='key',
+                base_url=f'http://127.0.0.1:{server.server_address[1]}',
+                retry_policy=RetryPolicy(backoff_base=0.01)
+            )
+            with client.messages.stream_iter('conv-1', {'content': 'Hi'}) as stream:
+                chunks = list(stream)
+            client.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert chunks == EVENTS
+        assert stream.complete_message == {'id': 'msg-1'}
+        assert stream.resumes == 1
+        first, resumed = DroppingSSEHandler.requests
+        assert 'Last-Event-ID' not in first
+        assert resumed['Last-Event-ID'] == '2'
+        assert resumed['Idempotency-Key'] == first['Idempotency-Key']
+
+    def test_streams_without_ids_are_not_resumed(self):
+        """Test that a drop before any event id still raises NetworkError"""
+        transport = StreamTransport(StreamResponse(sse_body(*STORY), fail_after=3))
+        client = ChatRoutes(api_key='key', transport=transport)
+
+        with pytest.raises(NetworkError):
+            with client.messages.stream_iter('conv-1', {'content': 'Hi'}) as stream:
+                list(stream)
+
+        assert stream.resumes == 0
+        assert len(transport.calls) == 1
+
+    def test_gives_up_after_max_resumes(self):
+        """Test that resumption stops after stream_resumes reconnects"""
+        body = sse_body(*EVENTS, ids=range(len(EVENTS)))
+        transport = StreamTransport(*[StreamResponse(body, fail_after=3) for _ in range(3)])
+        client = ChatRoutes(
+            api_key='key',
+            transport=transport,
+            stream_resumes=2,
+            retry_policy=RetryPolicy(backoff_base=0.0)
+        )
+
+        with pytest.raises(NetworkError):
+            with client.messages.stream_iter('conv-1', {'content': 'Hi'}) as stream:
+                list(stream)
+
+        assert stream.resumes == 2
+        assert [call['headers'].get('Last-Event-ID') for call in transport.calls] == [None, '0', '0']
+
+    def test_replayed_event_is_skipped_but_id_less_events_are_not(self):
+        """Test that only the replayed event is dropped when later events carry no id"""
+        first = sse_body(EVENTS[0], ids=['a'], done=False) + sse_body(*EVENTS[1:])
+        resumed = sse_body(EVENTS[0], ids=['a'], done=False) + sse_body(*EVENTS[1:])
+        transport = StreamTransport(StreamResponse(first, fail_after=3), StreamResponse(resumed))
+        client = ChatRoutes(api_key='key', transport=transport, retry_policy=RetryPolicy(backoff_base=0.0))
+
+        with client.messages.stream_iter('conv-1', {'content': 'Hi'}) as stream:
+            chunks = list(stream)
+
+        assert stream.resumes == 1
+        assert transport.calls[1]['headers']['Last-Event-ID'] == 'a'
+        assert chunks == EVENTS
+        assert stream.complete_message == {'id': 'msg-1'}
+
+    def test_resumes_inside_a_deadline(self):
+        """Test that a dropped stream reconnects while a call deadline is active"""
+        body = sse_body(*EVENTS, ids=range(len(EVENTS)))
+        transport = StreamTransport(
+            StreamResponse(body, fail_after=3),
+            StreamResponse(sse_body(*EVENTS[1:], ids=range(1, len(EVENTS))))
+        )
+        client = ChatRoutes(api_key='key', transport=transport, retry_policy=RetryPolicy(backoff_base=0.0))
+
+        with client.deadline(5.0):
+            with client.messages.stream_iter('conv-1', {'content': 'Hi'}) as stream:
+                chunks = list(stream)
+
+        assert chunks == EVENTS
+        assert stream.resumes == 1
+        assert transport.calls[1]['headers']['Last-Event-ID'] == '0'
+
+    def test_resume_stops_at_the_deadline(self):
+        """Test that no reconnect is attempted once the call deadline has run out"""
+        body = sse_body(*EVENTS, ids=range(len(EVENTS)))
+        transport = StreamTransport(StreamResponse(body, fail_after=3))
+        client = ChatRoutes(api_key='key', transport=transport, retry_policy=RetryPolicy(backoff_base=0.0))
+
+        with pytest.raises(DeadlineExceededError):
+            with client.deadline(0.05):
+                with client.messages.stream_iter('conv-1', {'content': 'Hi'}) as stream:
+                    for _ in stream:
+                        time.sleep(0.1)
+
+        assert len(transport.calls) == 1
+
+
+class SlowStartResponse(StreamResponse):
+    def __init__(self, body, first_byte_delay):
+        super().__init__(body)
+        self.first_byte_delay = first_byte_delay
+
+    def iter_bytes(self):
+        time.sleep(self.first_byte_delay)
+        yield from super().iter_bytes()
+
+
+class TestStreamStats:
+    """Test suite for stream timing statistics"""
+
+    def teardown_method(self):
+        set_metrics_hook(None)
+
+    def test_stats_are_returned_with_complete_message(self):
+        """Test that the callback API returns stats for the finished stream"""
+        response = SlowStartResponse(sse_body(*STORY), first_byte_delay=0.02)
+        client = ChatRoutes(api_key='key', transport=StreamTransport(response), stream_stats=True)
+        completed = []
+
+        stats = client.messages.stream(
+            'conv-1',
+            {'content': 'Hi', 'model': 'gpt-5'},
+            lambda chunk: None,
+            completed.append
+        )
+
+        assert isinstance(stats, StreamStats)
+        assert completed == [STORY[-1]['message']]
+        assert stats.model == 'gpt-5'
+        assert stats.completed
+        assert stats.chunks == 4
+        assert stats.characters == len('Once upon a time')
+        assert stats.bytes_received == len(sse_body(*STORY))
+        assert stats.connect_time <= stats.time_to_first_byte <= stats.time_to_first_token <= stats.duration
+        assert stats.time_to_first_byte >= 0.02
+        assert sum(stats.gap_histogram.values()) == 3
+        assert stats.characters_per_second > 0
+
+    def test_stats_are_off_by_default(self):
+        """Test that no stats are collected unless enabled or a hook is installed"""
+        client = ChatRoutes(api_key='key', transport=StreamTransport(StreamResponse(sse_body(*STORY))))
+
+        with client.messages.stream_iter('conv-1', {'content': 'Hi'}) as stream:
+            list(stream)
+
+        assert stream.stats is None
+
+    def test_metrics_hook_receives_finished_streams(self):
+        """Test that the global hook is called once per stream, even when stopped early"""
+        reported = []
+        set_metrics_hook(reported.append)
+        transport = StreamTransport(StreamResponse(sse_body(*STORY)), StreamResponse(sse_body(*STORY)))
+        client = ChatRoutes(api_key='key', transport=transport)
+
+        with client.messages.stream_iter('conv-1', {'content': 'Hi'}) as stream:
+            list(stream)
+        with client.messages.stream_iter('conv-1', {'content': 'Hi'}) as early:
+            next(early)
+        early.close()
+
+        assert [stats.completed for stats in reported] == [True, False]
+        assert reported[1].chunks == 1
+        assert reported[0].to_dict()['chunks'] == 4
+
+
+class PacedResponse(StreamResponse):
+    """Yields one event every ``interval`` seconds; closing it aborts the read."""
+
+    def __init__(self, events, interval):
+        super().__init__(sse_body(*events))
+        self.events = events
+        self.interval = interval
+
+    def iter_bytes(self):
+        for event in self.events:
+            time.sleep(self.interval)
+            if self.closed:
+                raise TransportError('connection aborted')
+            self.lines_read += 1
+            yield sse_body(event, done=False)
+        yield b'data: [DONE]\n\n'
+
+
+class RoutingTransport(Transport):
+    def __init__(self, responses):
+        self.responses = responses
+
+    def request(self, method, url, headers, content=None, params=None, timeout=None, stream=False):
+        body = json.loads(content)
+        response = self.responses[body.get('model') or body.get('branchId')]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def answer(name, words):
+    return [{'type': 'content', 'content': word} for word in words] + [
+        {'type': 'complete', 'message': {'id': f'{name}-msg', 'content': ''.join(words)}}
+    ]
+
+
+class TestStreamFanOut:
+    """Test suite for concurrent stream fan-out"""
+
+    def test_interleaves_tagged_chunks_from_all_models(self):
+        """Test that every model's chunks arrive tagged with their source"""
+        responses = {
+            'gpt-5': PacedResponse(answer('gpt-5', ['a', 'b', 'c']), 0.01),
+            'claude': PacedResponse(answer('claude', ['x', 'y']), 0.015)
+        }
+        client = ChatRoutes(api_key='key', transport=RoutingTransport(responses))
+
+        with client.messages.stream_models('conv-1', {'content': 'Hi'}, ['gpt-5', 'claude']) as fan_out:
+            assert isinstance(fan_out, StreamFanOut)
+            received = list(fan_out)
+
+        by_source = {}
+        for source, chunk in received:
+            by_source.setdefault(source, []).append(chunk.get('content'))
+        assert by_source == {'gpt-5': ['a', 'b', 'c', None], 'claude': ['x', 'y', None]}
+        assert fan_out.complete_messages['claude']['content'] == 'xy'
+        assert fan_out.winner is None
+        assert fan_out.errors == {}
+
+    def test_first_complete_cancels_the_rest(self):
+        """Test that picking a winner stops and closes the slower streams"""
+        fast = PacedResponse(answer('branch-1', ['quick']), 0.01)
+        slow = PacedResponse(answer('branch-2', ['s', 'l', 'o', 'w'] * 10), 0.05)
+        client = ChatRoutes(api_key='key', transport=RoutingTransport({'branch-1': fast, 'branch-2': slow}))
+        started = time.monotonic()
+
+        with client.branches.stream_branches(
+            'conv-1', ['branch-1', 'branch-2'], {'content': 'Hi'}, pick_winner=first_complete
+        ) as fan_out:
+            received = list(fan_out)
+
+        assert time.monotonic() - started < 1.0
+        assert fan_out.winner == 'branch-1'
+        assert received[-1] == ('branch-1', answer('branch-1', ['quick'])[-1])
+        assert slow.closed
+        assert slow.lines_read < 40
+        assert 'branch-2' not in fan_out.complete_messages
+        assert fan_out.errors == {}
+
+    def test_buffered_sources_can_be_cancelled(self):
+        """Test that a fan-out over buffered streams cancels the losers too"""
+        fast = PacedResponse(answer('branch-1', ['quick']), 0.01)
+        slow = PacedResponse(answer('branch-2', ['s', 'l', 'o', 'w'] * 10), 0.05)
+        client = ChatRoutes(api_key='key', transport=RoutingTransport({'branch-1': fast, 'branch-2': slow}))
+        openers = {
+            branch_id: functools.partial(
+                client.branches.send_message_iter, 'conv-1', branch_id, {'content': 'Hi'}, buffer_size=4
+            )
+            for branch_id in ('branch-1', 'branch-2')
+        }
+
+        with StreamFanOut(openers, pick_winner=first_complete) as fan_out:
+            list(fan_out)
+
+        assert fan_out.winner == 'branch-1'
+        assert slow.closed
+        assert slow.lines_read < 40
+        assert 'branch-2' not in fan_out.complete_messages
+
+    def test_failing_source_does_not_stop_others(self):
+        """Test that a stream that fails to open is reported without affecting the others"""
+        responses = {
+            'gpt-5': TransportError('connection refused'),
+            'claude': StreamResponse(sse_body(*answer('claude', ['ok'])))
+        }
+        client = ChatRoutes(api_key='key', transport=RoutingTransport(responses))
+
+        with client.messages.stream_models('conv-1', {'content': 'Hi'}, ['gpt-5', 'claude']) as fan_out:
+            received = list(fan_out)
+
+        assert [source for source, _ in received] == ['claude', 'claude']
+        assert isinstance(fan_out.errors['gpt-5'], NetworkError)
+        assert fan_out.complete_messages == {'claude': {'id': 'claude-msg', 'content': 'ok'}}
+
+
+WORDS = [f'w{i} ' for i in range(20)]
+
+
+def wait_for_reader(stream, timeout=1.0):
+    """Wait until the background reader is parked on the final, non-droppable chunk."""
+    deadline = time.monotonic() + timeout
+    while not stream.stream._response.lines_read and time.monotonic() < deadline:
+        time.sleep(0.005)
+    time.sleep(0.05)
+
+
+class TestBufferedStream:
+    """Test suite for reading streams through a bounded buffer"""
+
+    def make_client(self, *words):
+        response = StreamResponse(sse_body(*answer('m', list(words or WORDS))))
+        transport = StreamTransport(response)
+        return ChatRoutes(api_key='key', transport=transport), response, transport
+
+    def test_block_delivers_everything_in_order(self):
+        """Test that block mode keeps every chunk and never exceeds the buffer size"""
+        client, response, _ = self.make_client()
+
+        with client.messages.stream_iter('conv-1', {'content': 'Hi'}, buffer_size=3) as stream:
+            assert isinstance(stream, BufferedStream)
+            wait_for_reader(stream)
+            contents = [chunk['content'] for chunk in stream if chunk['type'] == 'content']
+
+        assert contents == WORDS
+        assert stream.buffer.high_water <= 3
+        assert stream.complete_message['content'] == ''.join(WORDS)
+        assert response.closed
+
+    def test_coalesce_merges_content_for_slow_consumers(self):
+        """Test that coalesce mode merges content chunks without losing text"""
+        client, _, _ = self.make_client()
+
+        with client.messages.stream_iter('conv-1', {'content': 'Hi'}, buffer_size=2, overflow='coalesce') as stream:
+            wait_for_reader(stream)
+            chunks = list(stream)
+
+        assert stream.coalesced > 0
+        assert len(chunks) == len(WORDS) + 1 - stream.coalesced
+        assert ''.join(chunk['content'] for chunk in chunks[:-1]) == ''.join(WORDS)
+        assert chunks[-1]['type'] == 'complete'
+
+    def test_drop_discards_and_counts_content(self):
+        """Test that drop mode counts dropped chunks but always delivers completion"""
+        client, _, _ = self.make_client()
+
+        with client.messages.stream_iter('conv-1', {'content': 'Hi'}, buffer_size=2, overflow='drop') as stream:
+            wait_for_reader(stream)
+            chunks = list(stream)
+
+        assert stream.dropped > 0
+        assert len(chunks) + stream.dropped == len(WORDS) + 1
+        assert chunks[-1]['type'] == 'complete'
+        assert stream.complete_message['content'] == ''.join(WORDS)
+
+    def test_callback_stream_with_buffer(self):
+        """Test that the callback API can read through a buffer"""
+        client, response, _ = self.make_client()
+        received = []
+
+        client.messages.stream('conv-1', {'content': 'Hi'}, received.append, buffer_size=4)
+
+        assert len(received) == len(WORDS) + 1
+        assert response.closed
+
+    def test_closing_early_cancels_the_reader(self):
+        """Test that closing a buffered stream stops the background reader"""
+        response = PacedResponse(answer('m', WORDS), 0.01)
+        client = ChatRoutes(api_key='key', transport=StreamTransport(response))
+
+        with client.messages.stream_iter('conv-1', {'content': 'Hi'}, buffer_size=2) as stream:
+            next(stream)
+
+        stream._reader.join(1.0)
+        assert not stream._reader.is_alive()
+        assert response.closed
+        assert response.lines_read < len(WORDS)
+
+    def test_unknown_overflow_mode_is_rejected_before_sending(self):
+        """Test that a bad overflow mode fails without opening a connection"""
+        client, _, transport = self.make_client()
+
+        with pytest.raises(ValueError):
+            client.messages.stream_iter('conv-1', {'content': 'Hi'}, buffer_size=2, overflow='spill')
+        assert transport.calls == []
+
+
+class ScriptedResponse(StreamResponse):
+    """Plays back (delay, bytes) steps; an exception instance is raised instead of yielded."""
+
+    def __init__(self, steps):
+        super().__init__()
+        self.steps = steps
+
+    def iter_bytes(self):
+        for delay, data in self.steps:
+            time.sleep(delay)
+            if self.closed:
+                return
+            if isinstance(data, Exception):
+                raise data
+            yield data
+
+
+def content_event(text, event_id=None):
+    prefix = f'id: {event_id}\n'.encode('utf-8') if event_id is not None else b''
+    return prefix + sse_body({'type': 'content', 'content': text}, done=False)
+
+
+class TestStreamStalls:
+    """Test suite for stream idle timeouts and deadlines"""
+
+    def test_keep_alives_do_not_hide_a_stall(self):
+        """Test that a stream sending only heartbeats is reported as stalled"""
+        steps = [(0, content_event('Hello')), (0, content_event(' wor'))]
+        steps += [(0.02, b': keep-alive\n\n')] * 50
+        client = ChatRoutes(
+            api_key='key',
+            transport=StreamTransport(ScriptedResponse(steps)),
+            stream_idle_timeout=0.1
+        )
+
+        with pytest.raises(StreamStalledError) as excinfo:
+            with client.messages.stream_iter('conv-1', {'content': 'Hi'}) as stream:
+                list(stream)
+
+        error = excinfo.value
+        assert error.reason == 'idle'
+        assert error.code == 'STREAM_STALLED'
+        assert error.partial_content == 'Hello wor'
+        assert error.chunks == 2
+        assert error.details['keepAlives'] >= 3
+        assert stream.keep_alives >= 3
+
+    def test_read_timeout_is_a_stall_not_a_resume(self):
+        """Test that a socket read timeout after the idle window raises the stall error"""
+        steps = [(0, content_event('partial', event_id=1)), (0.06, TransportError('read timed out'))]
+        transport = StreamTransport(ScriptedResponse(steps))
+        client = ChatRoutes(api_key='key', transport=transport, stream_idle_timeout=0.05, read_timeout=30)
+
+        with pytest.raises(StreamStalledError) as excinfo:
+            with client.messages.stream_iter('conv-1', {'content': 'Hi'}) as stream:
+                list(stream)
+
+        assert excinfo.value.partial_content == 'partial'
+        assert len(transport.calls) == 1
+        assert transport.calls[0]['timeout'][1] == 0.05
+
+    def test_stream_deadline_bounds_slow_generations(self):
+        """Test that the overall stream deadline stops a stream that keeps trickling"""
+        steps = [(0.03, content_event(f'{i} ')) for i in range(50)]
+        client = ChatRoutes(
+            api_key='key',
+            transport=StreamTransport(ScriptedResponse(steps)),
+            stream_timeout=0.2,
+            total_timeout=5
+        )
+        started = time.monotonic()
+
+        with pytest.raises(StreamStalledError) as excinfo:
+            with client.messages.stream_iter('conv-1', {'content': 'Hi'}) as stream:
+                list(stream)
+
+        assert excinfo.value.reason == 'deadline'
+        assert excinfo.value.partial_content.startswith('0 1 ')
+        assert time.monotonic() - started < 1.0
+
+    def test_slow_consumer_is_not_idle(self):
+        """Test that time spent by the consumer between chunks does not count as idle"""
+        steps = [(0, content_event(word)) for word in ('a', 'b', 'c')] + [(0, b'data: [DONE]\n\n')]
+        client = ChatRoutes(
+            api_key='key',
+            transport=StreamTransport(ScriptedResponse(steps)),
+            stream_idle_timeout=0.05
+        )
+
+        with client.messages.stream_iter('conv-1', {'content': 'Hi'}) as stream:
+            received = []
+            for chunk in stream:
+                time.sleep(0.08)
+                received.append(chunk['content'])
+
+        assert received == ['a', 'b', 'c']
+
+
+class CountingSink(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+        self.flushes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+    def flush(self):
+        self.flushes += 1
+        super().flush()
+
+
+class TestStreamTo:
+    """Test suite for writing streamed content to sinks"""
+
+    def story_client(self, *events):
+        transport = StreamTransport(StreamResponse(sse_body(*events)))
+        return ChatRoutes(api_key='key', transport=transport)
+
+    def test_text_sink_receives_content_and_metadata_is_returned(self):
+        """Test that content goes to a text sink and only metadata comes back"""
+        complete = {
+            'type': 'complete',
+            'message': {'id': 'msg-1', 'model': 'gpt-5', 'content': 'Once upon a time'},
+            'usage': {'totalTokens': 12}
+        }
+        client = self.story_client(*STORY[:3], complete)
+        sink = io.StringIO()
+
+        result = client.messages.stream_to('conv-1', {'content': 'Hi'}, sink)
+
+        assert sink.getvalue() == 'Once upon a time'
+        assert result == {
+            'messageId': 'msg-1',
+            'model': 'gpt-5',
+            'usage': {'totalTokens': 12},
+            'chunks': 4,
+            'characters': 16,
+            'written': 16
+        }
+
+    def test_binary_sink_receives_encoded_bytes(self):
+        """Test that binary sinks get UTF-8 bytes"""
+        events = ({'type': 'content', 'content': 'caf\u00e9 '}, {'type': 'content', 'content': '\u2615'})
+        client = self.story_client(*events, STORY[3])
+        sink = io.BytesIO()
+
+        result = client.messages.stream_to('conv-1', {'content': 'Hi'}, sink)
+
+        assert sink.getvalue() == 'caf\u00e9 \u2615'.encode('utf-8')
+        assert result['characters'] == 6
+        assert result['written'] == 9
+        assert result['messageId'] == 'msg-1'
+
+    def test_writes_are_buffered_and_flushed_once(self):
+        """Test that small chunks are batched into buffer-sized writes"""
+        events = [{'type': 'content', 'content': 'x' * 10} for _ in range(100)]
+        client = self.story_client(*events, STORY[3])
+        sink = CountingSink()
+
+        result = client.messages.stream_to('conv-1', {'content': 'Hi'}, sink, buffer_size=256)
+
+        assert len(sink.getvalue()) == 1000
+        assert result['written'] == 1000
+        assert sink.writes == 4
+        assert sink.flushes == 1
+
+    def test_content_is_not_retained_with_stall_limits(self):
+        """Test that stall tracking keeps no copy of content already written to the sink"""
+        events = [{'type': 'content', 'content': 'x' * 1000} for _ in range(100)]
+        transport = StreamTransport(StreamResponse(sse_body(*events, STORY[3])))
+        client = ChatRoutes(api_key='key', transport=transport, stream_idle_timeout=30, stream_timeout=60)
+        streams = []
+
+        def capture(stream, *args):
+            streams.append(stream)
+            return write_stream(stream, *args)
+
+        with patch('chatroutes.resources.messages.write_stream', side_effect=capture):
+            result = client.messages.stream_to('conv-1', {'content': 'Hi'}, io.StringIO())
+
+        assert result['characters'] == 100000
+        assert streams[0].partial_content == ''